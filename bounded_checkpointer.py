@@ -0,0 +1,244 @@
+import os
+import time
+import zlib
+import pickle
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from langgraph.checkpoint.memory import InMemorySaver
+
+logger = logging.getLogger(__name__)
+
+SPILL_PATH = os.getenv("CHECKPOINT_SPILL_PATH", "checkpoints_spill.db")
+MAX_MEMORY_BYTES = int(os.getenv("CHECKPOINT_MEMORY_MB", "64")) * 1024 * 1024
+# Spilled threads are dropped once they are this old, or oldest first once the file holds this much
+SPILL_TTL_SECONDS = float(os.getenv("CHECKPOINT_SPILL_TTL_HOURS", "24")) * 3600
+MAX_SPILL_BYTES = int(os.getenv("CHECKPOINT_SPILL_MB", "256")) * 1024 * 1024
+
+
+def _entry_bytes(entry) -> int:
+    """Size of a serialized (type, bytes) pair as stored by InMemorySaver"""
+    return len(entry[1]) if entry and isinstance(entry[1], (bytes, bytearray)) else 0
+
+
+class BoundedMemorySaver(InMemorySaver):
+    """
+    InMemorySaver with a memory cap.
+
+    Every thread's checkpoints, blobs and pending writes are counted as they
+    are saved. When the total goes over max_bytes, the least recently used
+    threads are pickled, zlib-compressed and moved to a SQLite file, and
+    their memory is released. The next read or write on a spilled thread
+    loads it back transparently, so the saver can be used anywhere a
+    MemorySaver is. Listing checkpoints without a thread id only covers the
+    threads currently in memory.
+
+    The spill file is pruned whenever a thread is spilled: threads spilled
+    more than spill_ttl_seconds ago are dropped, then the oldest ones until
+    the file holds at most max_spill_bytes. A dropped thread starts over
+    empty if it is used again.
+    """
+
+    def __init__(self, max_bytes: int = MAX_MEMORY_BYTES, spill_path: str = SPILL_PATH,
+                 spill_ttl_seconds: float = SPILL_TTL_SECONDS, max_spill_bytes: int = MAX_SPILL_BYTES, **kwargs):
+        super().__init__(**kwargs)
+        self.max_bytes = max_bytes
+        self.spill_ttl_seconds = spill_ttl_seconds
+        self.max_spill_bytes = max_spill_bytes
+        self._lock = threading.RLock()
+        self._sizes = OrderedDict()  # thread_id -> bytes held in memory, least recently used first
+        self._conn = sqlite3.connect(spill_path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS threads (
+                thread_id TEXT PRIMARY KEY,
+                data BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                spilled_at REAL NOT NULL DEFAULT 0
+            )"""
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(threads)")}
+        if "spilled_at" not in columns:
+            # Files from before pruning existed; their threads count as expired
+            self._conn.execute("ALTER TABLE threads ADD COLUMN spilled_at REAL NOT NULL DEFAULT 0")
+        # Threads on disk, so lookups of threads never seen skip SQLite
+        self._spilled = set()
+        self._prune()
+        self._spilled = {row[0] for row in self._conn.execute("SELECT thread_id FROM threads")}
+
+    # Bookkeeping
+
+    def _touch(self, thread_id: str):
+        """Mark a thread as most recently used, loading it back from disk if it was spilled"""
+        if thread_id in self._sizes:
+            self._sizes.move_to_end(thread_id)
+            return
+        if thread_id not in self._spilled:
+            # Never saved, or dropped by pruning; put() registers it once it holds data
+            return
+        self._spilled.discard(thread_id)
+        row = self._conn.execute("SELECT data FROM threads WHERE thread_id = ?", (thread_id,)).fetchone()
+        if row is None:
+            return
+        storage, writes, blobs = pickle.loads(zlib.decompress(row[0]))
+        for checkpoint_ns, checkpoints in storage.items():
+            self.storage[thread_id][checkpoint_ns].update(checkpoints)
+        for key, value in writes.items():
+            self.writes[key] = value
+        self.blobs.update(blobs)
+        self._conn.execute("DELETE FROM threads WHERE thread_id = ?", (thread_id,))
+        self._conn.commit()
+        self._sizes[thread_id] = self._measure(thread_id)
+        logger.info(f"Loaded checkpoint thread {thread_id} back from disk")
+
+    def _thread_items(self, thread_id: str):
+        storage = {ns: dict(checkpoints) for ns, checkpoints in self.storage.get(thread_id, {}).items()}
+        writes = {key: dict(value) for key, value in self.writes.items() if key[0] == thread_id}
+        blobs = {key: value for key, value in self.blobs.items() if key[0] == thread_id}
+        return storage, writes, blobs
+
+    def _measure(self, thread_id: str) -> int:
+        storage, writes, blobs = self._thread_items(thread_id)
+        size = sum(
+            _entry_bytes(checkpoint) + _entry_bytes(metadata)
+            for checkpoints in storage.values()
+            for checkpoint, metadata, _ in checkpoints.values()
+        )
+        size += sum(len(serialized[1]) for value in writes.values() for _, _, serialized, _ in value.values())
+        size += sum(_entry_bytes(blob) for blob in blobs.values())
+        return size
+
+    def _spill(self, thread_id: str):
+        data = zlib.compress(pickle.dumps(self._thread_items(thread_id), protocol=pickle.HIGHEST_PROTOCOL))
+        self._conn.execute(
+            "INSERT OR REPLACE INTO threads (thread_id, data, size, spilled_at) VALUES (?, ?, ?, ?)",
+            (thread_id, data, self._sizes[thread_id], time.time()),
+        )
+        self._spilled.add(thread_id)
+        self._prune()
+        super().delete_thread(thread_id)
+        size = self._sizes.pop(thread_id)
+        logger.info(f"Spilled checkpoint thread {thread_id} to disk ({size} bytes in memory, {len(data)} on disk)")
+
+    def _prune(self):
+        """Drop expired spilled threads, then the oldest ones while the file is over max_spill_bytes"""
+        cutoff = time.time() - self.spill_ttl_seconds
+        dropped = [row[0] for row in self._conn.execute("SELECT thread_id FROM threads WHERE spilled_at < ?", (cutoff,))]
+        self._conn.execute("DELETE FROM threads WHERE spilled_at < ?", (cutoff,))
+        total = self._conn.execute("SELECT COALESCE(SUM(LENGTH(data)), 0) FROM threads").fetchone()[0]
+        if total > self.max_spill_bytes:
+            for thread_id, stored in self._conn.execute(
+                "SELECT thread_id, LENGTH(data) FROM threads ORDER BY spilled_at"
+            ).fetchall():
+                if total <= self.max_spill_bytes:
+                    break
+                self._conn.execute("DELETE FROM threads WHERE thread_id = ?", (thread_id,))
+                dropped.append(thread_id)
+                total -= stored
+        self._conn.commit()
+        if dropped:
+            self._spilled.difference_update(dropped)
+            logger.info(f"Dropped {len(dropped)} spilled checkpoint threads from disk")
+
+    def _evict(self):
+        """Spill cold threads until under the cap, always keeping the most recent one in memory"""
+        while len(self._sizes) > 1 and sum(self._sizes.values()) > self.max_bytes:
+            self._spill(next(iter(self._sizes)))
+
+    # Reporting
+
+    def memory_usage(self) -> dict:
+        """Bytes held in memory per thread, least recently used first"""
+        with self._lock:
+            return dict(self._sizes)
+
+    def spilled_threads(self) -> dict:
+        """Threads currently on disk, with the bytes they held in memory when spilled"""
+        with self._lock:
+            return dict(self._conn.execute("SELECT thread_id, size FROM threads").fetchall())
+
+    # BaseCheckpointSaver interface
+
+    def get_tuple(self, config):
+        with self._lock:
+            self._touch(config["configurable"]["thread_id"])
+            return super().get_tuple(config)
+
+    def list(self, config, *, filter=None, before=None, limit=None):
+        with self._lock:
+            if config:
+                self._touch(config["configurable"]["thread_id"])
+            # Materialize so the lock is not held by a suspended generator
+            items = list(super().list(config, filter=filter, before=before, limit=limit))
+        yield from items
+
+    def get_delta_channel_history(self, *, config, channels):
+        with self._lock:
+            self._touch(config["configurable"]["thread_id"])
+            return super().get_delta_channel_history(config=config, channels=channels)
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        with self._lock:
+            self._touch(thread_id)
+            result = super().put(config, checkpoint, metadata, new_versions)
+            checkpoint_data, metadata_data, _ = self.storage[thread_id][checkpoint_ns][checkpoint["id"]]
+            added = _entry_bytes(checkpoint_data) + _entry_bytes(metadata_data)
+            added += sum(_entry_bytes(self.blobs.get((thread_id, checkpoint_ns, k, v))) for k, v in new_versions.items())
+            self._sizes[thread_id] = self._sizes.get(thread_id, 0) + added
+            self._evict()
+            return result
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        thread_id = config["configurable"]["thread_id"]
+        key = (thread_id, config["configurable"].get("checkpoint_ns", ""), config["configurable"]["checkpoint_id"])
+        with self._lock:
+            self._touch(thread_id)
+            before = sum(len(w[2][1]) for w in self.writes.get(key, {}).values())
+            super().put_writes(config, writes, task_id, task_path)
+            after = sum(len(w[2][1]) for w in self.writes.get(key, {}).values())
+            self._sizes[thread_id] = self._sizes.get(thread_id, 0) + after - before
+            self._evict()
+
+    def delete_thread(self, thread_id):
+        with self._lock:
+            super().delete_thread(thread_id)
+            self._sizes.pop(thread_id, None)
+            if thread_id in self._spilled:
+                self._spilled.discard(thread_id)
+                self._conn.execute("DELETE FROM threads WHERE thread_id = ?", (thread_id,))
+                self._conn.commit()
+
+    # Async interface, routed through the methods above so spilled threads are loaded back.
+    # InMemorySaver's own async versions are not relied on to do this in every langgraph release.
+
+    async def aget_tuple(self, config):
+        return self.get_tuple(config)
+
+    async def alist(self, config, *, filter=None, before=None, limit=None):
+        for item in self.list(config, filter=filter, before=before, limit=limit):
+            yield item
+
+    async def aget_delta_channel_history(self, *, config, channels):
+        return self.get_delta_channel_history(config=config, channels=channels)
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        return self.put(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes, task_id, task_path=""):
+        return self.put_writes(config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id):
+        return self.delete_thread(thread_id)
+
+
+_checkpointer = None
+
+
+def get_checkpointer() -> BoundedMemorySaver:
+    """Process-wide saver, so the memory cap covers every Sidekick session together"""
+    global _checkpointer
+    if _checkpointer is None:
+        _checkpointer = BoundedMemorySaver()
+    return _checkpointer
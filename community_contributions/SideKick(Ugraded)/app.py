@@ -1,4 +1,8 @@
 import os
+import sys
+from pathlib import Path
+# push_notifier and bounded_checkpointer live at the repository root and are shared by every Sidekick
+sys.path.append(str(Path(__file__).resolve().parents[2]))
 from dotenv import load_dotenv
 load_dotenv(override=True)
 
@@ -13,9 +13,10 @@ from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from langgraph.graph import StateGraph, START, END
 from langgraph.prebuilt import ToolNode
 from langgraph.graph.message import add_messages
-from langgraph.checkpoint.memory import MemorySaver
+from bounded_checkpointer import get_checkpointer
 
 from sidekick_tools import playwright_tools, other_tools, calendar_tools
+from push_notifier import current_session
 
 class State(TypedDict):
     messages: Annotated[List[Any], add_messages]
@@ -39,7 +40,7 @@ class Sidekick:
         self.code = None
         self.evaluator_llm_with_output = None
         self.graph = None
-        self.memory = MemorySaver()
+        self.memory = get_checkpointer()
         self.browser = None
         self.playwright = None
         self.sidekick_id = str(uuid.uuid4())
@@ -195,6 +196,8 @@ class Sidekick:
 
     async def run_superstep(self, message, success_criteria, history):
         config = {"configurable": {"thread_id": self.sidekick_id}}
+        # Push notifications sent during this turn are merged per session
+        current_session.set(self.sidekick_id)
 
         state = {
             "messages": message,
@@ -210,6 +213,8 @@ class Sidekick:
         return history + [user, reply, feedback]
     
     def cleanup(self):
+        # The thread ends with this session, so its checkpoints can go
+        self.memory.delete_thread(self.sidekick_id)
         if self.browser:
             try:
                 loop = asyncio.get_running_loop()
@@ -1,10 +1,14 @@
 import os
-import requests
-from datetime import datetime
+import json
+import time
+import threading
+from push_notifier import get_notifier
+from datetime import datetime, timedelta, timezone
 from dotenv import load_dotenv
 load_dotenv(override=True)
 
 from playwright.async_api import async_playwright
+from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
 from langchain.agents import Tool
@@ -28,8 +32,8 @@ async def playwright_tools():
 
 
 def push(text: str) -> str:
-    """Send a push notification via Pushover"""
-    requests.post(pushover_url, data={"token": pushover_token, "user": pushover_user, "message": text})
+    """Queue a push notification via Pushover; it is delivered in the background"""
+    get_notifier(pushover_token, pushover_user, pushover_url).enqueue(text)
     return "success"
 
 
@@ -38,6 +42,8 @@ def get_file_tools():
     return toolkit.get_tools()
 
 async def other_tools() -> list[Tool]:
+    # Deliver notifications still queued from a previous run without waiting for a new push
+    get_notifier(pushover_token, pushover_user, pushover_url)
     push_tool = Tool(
         name="send_push_notification",
         func=push,
@@ -56,43 +62,190 @@ async def other_tools() -> list[Tool]:
 
 # --- Google Calendar integration ---
 
+CALENDAR_SCOPES = ["https://www.googleapis.com/auth/calendar"]
+# The batch endpoint accepts more, but Google recommends at most 50 calls per batch
+CALENDAR_BATCH_SIZE = 50
+
+
+def _event_time(value: dict) -> datetime:
+    """Parse an event start/end into an aware datetime; all-day events start at midnight UTC"""
+    if "dateTime" in value:
+        return datetime.fromisoformat(value["dateTime"].replace("Z", "+00:00"))
+    return datetime.fromisoformat(value["date"]).replace(tzinfo=timezone.utc)
+
+
+class CalendarClient:
+    """
+    Long-lived Google Calendar client.
+
+    The credentials are loaded once and shared; expired credentials are
+    refreshed and written back to token.json. The discovery-built service sits
+    on an httplib2 connection, which is not thread-safe, so each thread that
+    runs a tool builds and keeps its own. Events
+    from lookback_days ago to horizon_days ahead are mirrored locally per
+    calendar, so listing upcoming events is answered from memory, with at most
+    one list request every sync_interval seconds.
+
+    Recurring events are expanded into instances (singleEvents), which needs a
+    bounded timeMin/timeMax window. The Calendar API does not accept sync
+    tokens for time-bounded lists, so each sync re-lists the window and
+    replaces the mirror instead of applying incremental changes.
+    """
+
+    def __init__(self, token_path: str = None, sync_interval: float = 60.0, lookback_days: int = 7,
+                 horizon_days: int = 90):
+        self.token_path = token_path or os.getenv("GOOGLE_TOKEN_PATH", "token.json")
+        self.sync_interval = sync_interval
+        self.lookback_days = lookback_days
+        self.horizon_days = horizon_days
+        self._creds = None
+        self._local = threading.local()
+        self._lock = threading.RLock()
+        self._events = {}
+        self._last_sync = {}
+
+    def _credentials(self) -> Credentials:
+        if self._creds is None:
+            self._creds = Credentials.from_authorized_user_file(self.token_path, scopes=CALENDAR_SCOPES)
+        if not self._creds.valid and self._creds.refresh_token:
+            self._creds.refresh(Request())
+            with open(self.token_path, "w") as token:
+                token.write(self._creds.to_json())
+        return self._creds
+
+    @property
+    def service(self):
+        """The calling thread's Calendar service"""
+        with self._lock:
+            creds = self._credentials()
+        service = getattr(self._local, "service", None)
+        if service is None:
+            service = self._local.service = build("calendar", "v3", credentials=creds, cache_discovery=False)
+        return service
+
+    def create_events(self, events: list, calendar_id: str) -> list:
+        """Insert events using the batch endpoint; returns the created events or the error for each one"""
+        service = self.service
+        results = [None] * len(events)
+
+        def on_response(request_id, response, exception):
+            results[int(request_id)] = exception if exception is not None else response
+
+        for offset in range(0, len(events), CALENDAR_BATCH_SIZE):
+            batch = service.new_batch_http_request(callback=on_response)
+            for i, event in enumerate(events[offset:offset + CALENDAR_BATCH_SIZE], offset):
+                batch.add(service.events().insert(calendarId=calendar_id, body=event), request_id=str(i))
+            batch.execute()
+
+        with self._lock:
+            if calendar_id in self._events:
+                for created in results:
+                    if isinstance(created, dict):
+                        self._events[calendar_id][created["id"]] = created
+        return results
+
+    def sync(self, calendar_id: str, force: bool = False):
+        """Re-list the mirrored window of a calendar, unless it was synced less than sync_interval ago"""
+        with self._lock:
+            if not force and time.time() - self._last_sync.get(calendar_id, 0) < self.sync_interval:
+                return
+            now = datetime.now(timezone.utc)
+            params = {
+                "calendarId": calendar_id,
+                "singleEvents": True,
+                "maxResults": 250,
+                "timeMin": (now - timedelta(days=self.lookback_days)).isoformat(),
+                # Bounds the expansion of open-ended recurring events
+                "timeMax": (now + timedelta(days=self.horizon_days)).isoformat(),
+            }
+            events = {}
+            page_token = None
+            while True:
+                response = self.service.events().list(pageToken=page_token, **params).execute()
+                for item in response.get("items", []):
+                    if item.get("status") != "cancelled":
+                        events[item["id"]] = item
+                page_token = response.get("nextPageToken")
+                if not page_token:
+                    break
+            # Replaced only once every page has arrived, so a failed sync keeps the previous mirror
+            self._events[calendar_id] = events
+            self._last_sync[calendar_id] = time.time()
+
+    def upcoming_events(self, calendar_id: str, max_results: int = 5) -> list:
+        self.sync(calendar_id)
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            events = [evt for evt in self._events.get(calendar_id, {}).values() if _event_time(evt["end"]) > now]
+        events.sort(key=lambda evt: _event_time(evt["start"]))
+        return events[:max_results]
+
+
+_calendar_client = None
+
+
+def get_calendar_client() -> CalendarClient:
+    global _calendar_client
+    if _calendar_client is None:
+        _calendar_client = CalendarClient()
+    return _calendar_client
+
+
 def _get_calendar_service():
-    creds = Credentials.from_authorized_user_file(
-        os.getenv("GOOGLE_TOKEN_PATH", "token.json"),
-        scopes=["https://www.googleapis.com/auth/calendar"]
-    )
-    return build("calendar", "v3", credentials=creds)
+    return get_calendar_client().service
 
 
 def create_calendar_event(summary: str, start_iso: str, end_iso: str, description: str = "", calendar_id: str = None) -> str:
     cal_id = calendar_id or os.getenv("GOOGLE_CALENDAR_ID", "primary")
-    service = _get_calendar_service()
     event = {
         "summary": summary,
         "description": description,
         "start": {"dateTime": start_iso},
         "end":   {"dateTime": end_iso},
     }
-    created = service.events().insert(calendarId=cal_id, body=event).execute()
+    created = get_calendar_client().create_events([event], cal_id)[0]
+    if isinstance(created, Exception):
+        return f"Error creating event: {created}"
     return f"Event created: {created.get('htmlLink')}"
 
 
+def create_calendar_events(events_json: str, calendar_id: str = None) -> str:
+    """Create several events in one round trip. Input is a JSON list of {summary, start_iso, end_iso, [description]}"""
+    cal_id = calendar_id or os.getenv("GOOGLE_CALENDAR_ID", "primary")
+    try:
+        items = json.loads(events_json)
+    except json.JSONDecodeError as e:
+        return f"Invalid JSON input: {str(e)}"
+    if not isinstance(items, list):
+        return "Invalid input: expected a JSON list of events"
+    events = []
+    for i, item in enumerate(items):
+        if not isinstance(item, dict) or not all(isinstance(item.get(key), str) for key in ("summary", "start_iso", "end_iso")):
+            return f"Invalid event at index {i}: summary, start_iso and end_iso are required strings"
+        events.append({
+            "summary": item["summary"],
+            "description": item.get("description") or "",
+            "start": {"dateTime": item["start_iso"]},
+            "end":   {"dateTime": item["end_iso"]},
+        })
+    lines = []
+    for event, created in zip(events, get_calendar_client().create_events(events, cal_id)):
+        if isinstance(created, Exception):
+            lines.append(f"Error creating '{event['summary']}': {created}")
+        else:
+            lines.append(f"Event created: {created.get('htmlLink')}")
+    return "\n".join(lines)
+
+
 def list_upcoming_events(calendar_id: str = None, max_results: int = 5) -> str:
     cal_id = calendar_id or os.getenv("GOOGLE_CALENDAR_ID", "primary")
-    service = _get_calendar_service()
-    now = datetime.utcnow().isoformat() + "Z"
-    events_result = (
-        service.events()
-        .list(calendarId=cal_id, timeMin=now, maxResults=max_results, singleEvents=True, orderBy="startTime")
-        .execute()
-    )
-    events = events_result.get("items", [])
+    events = get_calendar_client().upcoming_events(cal_id, max_results)
     if not events:
         return "No upcoming events found."
     lines = []
     for evt in events:
         start = evt["start"].get("dateTime", evt["start"].get("date"))
-        lines.append(f"{start} — {evt['summary']}")
+        lines.append(f"{start} — {evt.get('summary', '(no title)')}")
     return "\n".join(lines)
 
 
@@ -103,9 +256,14 @@ def calendar_tools() -> list[Tool]:
             func=create_calendar_event,
             description="Schedule an event: summary, start_iso (RFC3339), end_iso (RFC3339), [description], [calendar_id]"
         ),
+        Tool(
+            name="create_calendar_events",
+            func=create_calendar_events,
+            description="Schedule several events at once. Input is a JSON list of objects with summary, start_iso (RFC3339), end_iso (RFC3339) and optional description."
+        ),
         Tool(
             name="list_upcoming_events",
             func=list_upcoming_events,
             description="List upcoming events on the specified or primary calendar."
         ),
-    ]
\ No newline at end of file
+    ]
@@ -1,3 +1,7 @@
+import sys
+from pathlib import Path
+# push_notifier and bounded_checkpointer live at the repository root and are shared by every Sidekick
+sys.path.append(str(Path(__file__).resolve().parents[2]))
 import gradio as gr
 from sidekick import Sidekick
 
@@ -62,11 +66,12 @@ with gr.Blocks(title="Multi-Agent Sidekick", theme=gr.themes.Default(primary_hue
         2. **Research Agent** - Handles web searches, Wikipedia lookups, and file analysis  
         3. **Action Agent** - Executes Python code, creates files, sends notifications, and automates browsers
         4. **Evaluator** - Combines results and evaluates completion against success criteria
+        5. **Replanner** - On a failed evaluation, redoes only the flagged tasks and reuses completed research
         
         **Smart Routing:**
         - Simple queries get direct responses without invoking agents
         - Complex tasks are intelligently delegated to specialized agents
-        - Agents work sequentially, sharing context when needed
+        - Research tasks run as parallel sub-agents; independent actions run alongside them, dependent actions wait for the findings
         
         **Examples:**
         - "Research Tesla stock and calculate returns on $5000" → Both agents collaborate
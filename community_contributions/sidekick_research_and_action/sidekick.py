@@ -5,16 +5,33 @@ from langgraph.graph.message import add_messages
 from langgraph.prebuilt import ToolNode
 from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI
-from langgraph.checkpoint.memory import MemorySaver
+from bounded_checkpointer import get_checkpointer
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_core.runnables import RunnableConfig
+from langgraph.types import Send
 from pydantic import BaseModel, Field
 from sidekick_tools import playwright_tools, get_research_tools, get_action_tools
+from push_notifier import current_session
+import os
 import uuid
 import asyncio
 from datetime import datetime
 
 load_dotenv(override=True)
 
+# How many research sub-agents may run at the same time
+RESEARCH_CONCURRENCY = int(os.getenv("RESEARCH_CONCURRENCY", "3"))
+# Tool-calling rounds a single sub-agent may use before it has to answer
+MAX_AGENT_STEPS = 10
+# Evaluator rejections that may be replanned before handing back to the user
+MAX_REPLANS = 3
+
+def merge_dict_updates(existing: Optional[Dict[str, str]], new: Optional[Dict[str, str]]) -> Dict[str, str]:
+    """Reducer for per-task values written by parallel agents; None clears them"""
+    if new is None:
+        return {}
+    return {**(existing or {}), **new}
+
 class State(TypedDict):
     """Simplified state with essential fields only"""
     messages: Annotated[List[Any], add_messages]
@@ -23,8 +40,33 @@ class State(TypedDict):
     user_input_needed: bool
     
     # Task coordination
-    task_plan: Dict[str, Any]  # Contains research_tasks, action_tasks, strategy
-    agent_status: Dict[str, str]  # Track completion: {research: "pending/complete/error"}
+    task_plan: Dict[str, Any]  # Contains strategy, requires_both and tasks: {task_id: {kind, description}}
+    task_status: Annotated[Dict[str, str], merge_dict_updates]  # {task_id: "pending/complete/error"}
+    agent_status: Dict[str, str]  # Summary per agent: {research: "pending/complete/error"}
+    research_results: Annotated[Dict[str, str], merge_dict_updates]  # Findings per research task id, kept across retries
+    
+    # Evaluator feedback driving the delta replanner
+    feedback_on_work: Optional[str]
+    failed_task_ids: List[str]
+    replan_count: int
+
+def history_message(thread_id: str, index: int, role: str, content: str):
+    """
+    Message for one chat history entry, with an ID derived from its position in the thread.
+    add_messages replaces messages with a known ID, so submitting the same turn twice is a no-op.
+    """
+    message_id = str(uuid.uuid5(uuid.NAMESPACE_URL, f"sidekick:{thread_id}:{index}:{role}"))
+    if role == "user":
+        return HumanMessage(content=content, id=message_id)
+    return AIMessage(content=content, id=message_id)
+
+class ResearchTask(TypedDict):
+    """Input sent to one research sub-agent"""
+    task_id: str
+    task: str
+    all_tasks: List[str]
+    success_criteria: str
+    feedback_on_work: Optional[str]
 
 class CoordinationPlan(BaseModel):
     """Single definition for coordinator llm's output"""
@@ -34,22 +76,56 @@ class CoordinationPlan(BaseModel):
     strategy: str = Field(description="Overall approach")
     direct_response: Optional[str] = Field(default=None, description="Direct response if no agents needed")
 
+class PlanDelta(BaseModel):
+    """Replanner output: the smallest change to the plan that addresses the evaluator's feedback"""
+    rework_task_ids: List[str] = Field(default_factory=list, description="IDs of existing tasks that must be redone")
+    new_research_tasks: List[str] = Field(default_factory=list, description="Additional information gathering tasks")
+    new_action_tasks: List[str] = Field(default_factory=list, description="Additional execution/creation tasks")
+
 class EvaluatorOutput(BaseModel):
     """Evaluator structured output"""
     response: str = Field(description="Final response to user")
     success_criteria_met: bool = Field(description="Whether criteria were met")
     user_input_needed: bool = Field(description="If more input is needed")
+    feedback: Optional[str] = Field(default=None, description="If criteria were not met, what is missing or wrong")
+    failed_task_ids: List[str] = Field(default_factory=list, description="IDs of the tasks whose results were inadequate")
+
+def plan_tasks(state: State, kind: str, statuses: Optional[List[str]] = None) -> List[tuple]:
+    """(task_id, description) pairs of one kind from the plan, optionally filtered by status"""
+    task_status = state.get("task_status") or {}
+    return [
+        (task_id, task["description"])
+        for task_id, task in state.get("task_plan", {}).get("tasks", {}).items()
+        if task["kind"] == kind and (statuses is None or task_status.get(task_id) in statuses)
+    ]
+
+def summarize_status(state: State, kind: str) -> Optional[str]:
+    """Collapse the status of all tasks of one kind into a single agent status"""
+    task_status = state.get("task_status") or {}
+    statuses = [task_status.get(task_id) for task_id, _ in plan_tasks(state, kind)]
+    if not statuses:
+        return None
+    if "pending" in statuses:
+        return "pending"
+    if all(status == "error" for status in statuses):
+        return "error"
+    return "complete"
 
 class Sidekick:
     def __init__(self):
         self.research_llm = None
         self.action_llm = None
         self.coordinator_llm = None
+        self.replanner_llm = None
         self.evaluator_llm = None
         self.research_tools = None
         self.action_tools = None
+        self.research_tool_node = None
+        self.action_tool_node = None
+        self.research_semaphore = asyncio.Semaphore(RESEARCH_CONCURRENCY)
         self.graph = None
-        self.memory = MemorySaver()
+        self.memory = get_checkpointer()
+        self.synced_turns = {}  # thread_id -> number of history entries already in the checkpoint
         self.browser = None
         self.playwright = None
 
@@ -62,6 +138,8 @@ class Sidekick:
         # Set up browser tools
         browser_tools, self.browser, self.playwright = await playwright_tools()
         self.action_tools += browser_tools
+        self.research_tool_node = ToolNode(self.research_tools)
+        self.action_tool_node = ToolNode(self.action_tools)
         
         # Initialize LLMs (single model for consistency)
         base_llm = ChatOpenAI(model="gpt-4o-mini")
@@ -69,6 +147,7 @@ class Sidekick:
         self.research_llm = base_llm.bind_tools(self.research_tools)
         self.action_llm = base_llm.bind_tools(self.action_tools)
         self.coordinator_llm = base_llm.with_structured_output(CoordinationPlan)
+        self.replanner_llm = base_llm.with_structured_output(PlanDelta)
         self.evaluator_llm = base_llm.with_structured_output(EvaluatorOutput)
         
         await self.build_graph()
@@ -103,16 +182,20 @@ Output a coordination plan with:
             HumanMessage(content=f"Request: {user_request}\nSuccess criteria: {success_criteria}")
         ])
         
-        # Initialize agent status
-        agent_status = {}
+        tasks = {}
+        for i, task in enumerate(result.research_tasks, 1):
+            tasks[f"research-{i}"] = {"kind": "research", "description": task}
+        for i, task in enumerate(result.action_tasks, 1):
+            tasks[f"action-{i}"] = {"kind": "action", "description": task}
         task_plan = {
-            "research_tasks": result.research_tasks,
-            "action_tasks": result.action_tasks,
+            "tasks": tasks,
             "strategy": result.strategy,
             "requires_both": result.requires_both
         }
         
-        # Set initial agent status based on tasks
+        # Every task starts pending
+        task_status = {task_id: "pending" for task_id in tasks}
+        agent_status = {}
         if result.research_tasks:
             agent_status["research"] = "pending"
         if result.action_tasks:
@@ -122,6 +205,7 @@ Output a coordination plan with:
         if result.direct_response and not (result.research_tasks or result.action_tasks):
             return {
                 "task_plan": task_plan,
+                "task_status": task_status,
                 "agent_status": agent_status,
                 "messages": [AIMessage(content=result.direct_response)]
             }
@@ -129,33 +213,97 @@ Output a coordination plan with:
         # Delegation path
         return {
             "task_plan": task_plan,
+            "task_status": task_status,
             "agent_status": agent_status,
             "messages": [AIMessage(content=f"Plan: {result.strategy}")]
         }
 
-    def research_agent(self, state: State) -> Dict[str, Any]:
-        """Gather information using search and read tools"""
+    def replanner(self, state: State) -> Dict[str, Any]:
+        """Turn an evaluator rejection into a delta on the current plan instead of a new plan"""
+        task_plan = state.get("task_plan", {})
+        tasks = dict(task_plan.get("tasks", {}))
+        task_status = state.get("task_status") or {}
+        feedback = state.get("feedback_on_work") or "No feedback given"
+        
+        plan_lines = "\n".join(
+            f"- {task_id} [{task['kind']}, {task_status.get(task_id, 'pending')}]: {task['description']}"
+            for task_id, task in tasks.items()
+        )
+        system_message = f"""You are a Replanner. The Evaluator rejected the last attempt at the user's request.
+Decide the SMALLEST change to the existing plan that fixes the problem. Completed tasks whose results are fine are reused as they are.
+
+CURRENT PLAN ({task_plan.get('strategy', '')}):
+{plan_lines}
+
+EVALUATOR FEEDBACK: {feedback}
+TASKS THE EVALUATOR FLAGGED: {", ".join(state.get("failed_task_ids") or []) or "none"}
+
+Output:
+1. The IDs of existing tasks that must be redone
+2. Any new research or action tasks that are missing from the plan
+"""
+        delta = self.replanner_llm.invoke([
+            SystemMessage(content=system_message),
+            HumanMessage(content="Create the plan delta")
+        ])
+        
+        rework = [task_id for task_id in delta.rework_task_ids + (state.get("failed_task_ids") or []) if task_id in tasks]
+        for kind, new_tasks in (("research", delta.new_research_tasks), ("action", delta.new_action_tasks)):
+            count = sum(1 for task in tasks.values() if task["kind"] == kind)
+            for i, task in enumerate(new_tasks, count + 1):
+                tasks[f"{kind}-{i}"] = {"kind": kind, "description": task}
+                rework.append(f"{kind}-{i}")
+        if not rework:
+            # Nothing specific was flagged: the deliverable is what failed, so redo the final stage
+            final_kind = "action" if any(task["kind"] == "action" for task in tasks.values()) else "research"
+            rework = [task_id for task_id, task in tasks.items() if task["kind"] == final_kind]
+        elif task_plan.get("requires_both") and any(tasks[task_id]["kind"] == "research" for task_id in rework):
+            # Actions were built on the research being redone
+            rework += [task_id for task_id, task in tasks.items() if task["kind"] == "action"]
+        
+        updated_plan = {**task_plan, "tasks": tasks}
+        updated_status = {task_id: "pending" for task_id in rework}
+        agent_status = dict(state.get("agent_status", {}))
+        for task_id in rework:
+            agent_status[tasks[task_id]["kind"]] = "pending"
+        return {
+            "task_plan": updated_plan,
+            "task_status": updated_status,
+            "agent_status": agent_status,
+            "replan_count": state.get("replan_count", 0) + 1,
+            "messages": [AIMessage(content=f"Replanning: redoing {', '.join(sorted(set(rework)))}")]
+        }
+
+    async def _run_tool_loop(self, llm, tool_node: ToolNode, messages: List[Any], config: RunnableConfig) -> AIMessage:
+        """Let a sub-agent call tools until it answers without tool calls"""
+        for _ in range(MAX_AGENT_STEPS):
+            response = await llm.ainvoke(messages)
+            messages.append(response)
+            if not (hasattr(response, "tool_calls") and response.tool_calls):
+                return response
+            tool_results = await tool_node.ainvoke({"messages": messages}, config)
+            messages.extend(tool_results["messages"])
+        # Out of steps: ask for an answer with what has been gathered so far
+        return await llm.bind(tool_choice="none").ainvoke(messages)
+
+    async def research_worker(self, task_state: ResearchTask, config: RunnableConfig) -> Dict[str, Any]:
+        """Research sub-agent for a single task; several of these run in parallel"""
+        task_id = task_state["task_id"]
+        task = task_state["task"]
+        other_tasks = [t for t in task_state["all_tasks"] if t != task]
         try:
-            task_plan = state.get("task_plan", {})
-            research_tasks = task_plan.get("research_tasks", [])
-            success_criteria = state.get("success_criteria")
-            
-            if not research_tasks:
-                agent_status = state.get("agent_status", {})
-                agent_status["research"] = "skipped"
-                return {
-                    "agent_status": agent_status,
-                    "messages": [AIMessage(content="No research needed")]
-                }
-            
             system_message = f"""You are a Research Agent specialized in information gathering ONLY.
 
 YOUR ROLE: Gather information and pass it to the Action Agent. You CANNOT create files or execute code.
 
-TASKS TO COMPLETE:
-{chr(10).join(f"- {task}" for task in research_tasks)}
+YOUR TASK:
+- {task}
 
-SUCCESS CRITERIA: {success_criteria}
+Other research tasks are handled by other Research Agents working in parallel, do not work on them:
+{chr(10).join(f"- {t}" for t in other_tasks) if other_tasks else "- (none)"}
+
+SUCCESS CRITERIA: {task_state["success_criteria"]}
+{f"A previous attempt was rejected with this feedback, address it: {task_state['feedback_on_work']}" if task_state.get("feedback_on_work") else ""}
 
 AVAILABLE TOOLS:
 - search: For current information and trends
@@ -165,68 +313,59 @@ AVAILABLE TOOLS:
 
 CRITICAL RULES:
 1. You ONLY gather information - you CANNOT create, write, or modify files
-2. After gathering all requested information, STOP and summarize your findings
+2. After gathering the requested information, STOP and summarize your findings
 3. Do NOT attempt to create reports or files - the Action Agent will handle that
 4. When your research is complete, provide a clear summary without making more tool calls
 
 Current time: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-
-IMPORTANT: Once you've gathered the information for all tasks, summarize it and STOP. 
-The Action Agent will use your findings to create any required files or reports.
 """
+            messages = [SystemMessage(content=system_message), HumanMessage(content=task)]
+            async with self.research_semaphore:
+                response = await self._run_tool_loop(self.research_llm, self.research_tool_node, messages, config)
+            return {
+                "research_results": {task_id: response.content},
+                "task_status": {task_id: "complete"}
+            }
 
-            messages = [SystemMessage(content=system_message)] + state["messages"]
-            response = self.research_llm.invoke(messages)
-            
-            result = {"messages": [response]}
-            
-            # Check if complete (no tool calls)
-            if not (hasattr(response, "tool_calls") and response.tool_calls):
-                agent_status = state.get("agent_status", {})
-                agent_status["research"] = "complete"
-                result["agent_status"] = agent_status
-            
-            return result
-            
         except Exception as e:
-            agent_status = state.get("agent_status", {})
-            agent_status["research"] = "error"
             return {
-                "agent_status": agent_status,
-                "messages": [AIMessage(content=f"Research error: {str(e)}")],
-                "user_input_needed": True
+                "research_results": {task_id: f"Research error: {str(e)}"},
+                "task_status": {task_id: "error"}
             }
 
-    def action_agent(self, state: State) -> Dict[str, Any]:
+    def merge_results(self, state: State) -> Dict[str, Any]:
+        """Join point for the parallel sub-agents: roll task statuses up into agent status"""
+        agent_status = dict(state.get("agent_status", {}))
+        for kind in ("research", "action"):
+            status = summarize_status(state, kind)
+            if status:
+                agent_status[kind] = status
+        return {"agent_status": agent_status}
+
+    async def action_agent(self, state: State, config: RunnableConfig) -> Dict[str, Any]:
         """Execute tasks using code, files, and browser tools"""
         try:
-            task_plan = state.get("task_plan", {})
-            action_tasks = task_plan.get("action_tasks", [])
+            action_tasks = plan_tasks(state, "action", ["pending"])
             success_criteria = state.get("success_criteria")
             
             if not action_tasks:
-                agent_status = state.get("agent_status", {})
-                agent_status["action"] = "skipped"
-                return {
-                    "agent_status": agent_status,
-                    "messages": [AIMessage(content="No actions needed")]
-                }
+                return {"messages": [AIMessage(content="No actions needed")]}
             
-            # Get research results if available
-            research_content = ""
-            if state.get("agent_status", {}).get("research") == "complete":
-                # Find research agent's findings
-                for msg in reversed(state["messages"]):
-                    if isinstance(msg, AIMessage) and any(word in msg.content.lower() for word in ["research", "findings", "gathered", "information"]):
-                        research_content = msg.content
-                        break
+            # Get research results if available (including results reused from earlier attempts)
+            research_results = state.get("research_results") or {}
+            research_content = "\n\n".join(
+                f"### {task}\n{research_results[task_id]}"
+                for task_id, task in plan_tasks(state, "research", ["complete"])
+                if task_id in research_results
+            )
             
             system_message = f"""You are an Action Agent specialized in executing tasks and creating deliverables.
 
 YOUR TASKS:
-{chr(10).join(f"- {task}" for task in action_tasks)}
+{chr(10).join(f"- {task}" for _, task in action_tasks)}
 
 SUCCESS CRITERIA: {success_criteria}
+{f"A previous attempt was rejected with this feedback, address it: {state['feedback_on_work']}" if state.get("feedback_on_work") else ""}
 
 RESEARCH FINDINGS FROM RESEARCH AGENT:
 {research_content if research_content else "No prior research available"}
@@ -251,23 +390,16 @@ IMPORTANT: The Research Agent has already gathered the information. Your job is
 
 
             messages = [SystemMessage(content=system_message)] + state["messages"]
-            response = self.action_llm.invoke(messages)
+            response = await self._run_tool_loop(self.action_llm, self.action_tool_node, messages, config)
             
-            result = {"messages": [response]}
-            
-            # Check if complete (no tool calls)
-            if not (hasattr(response, "tool_calls") and response.tool_calls):
-                agent_status = state.get("agent_status", {})
-                agent_status["action"] = "complete"
-                result["agent_status"] = agent_status
-            
-            return result
+            return {
+                "messages": [response],
+                "task_status": {task_id: "complete" for task_id, _ in action_tasks}
+            }
             
         except Exception as e:
-            agent_status = state.get("agent_status", {})
-            agent_status["action"] = "error"
             return {
-                "agent_status": agent_status,
+                "task_status": {task_id: "error" for task_id, _ in plan_tasks(state, "action", ["pending"])},
                 "messages": [AIMessage(content=f"Action error: {str(e)}")],
                 "user_input_needed": True
             }
@@ -276,13 +408,23 @@ IMPORTANT: The Research Agent has already gathered the information. Your job is
         """Create final response and evaluate success"""
         task_plan = state.get("task_plan", {})
         agent_status = state.get("agent_status", {})
+        task_status = state.get("task_status") or {}
         success_criteria = state["success_criteria"]
         
-        # Gather agent results
-        agent_results = []
+        # Gather agent results: research findings per task, then the recent agent messages
+        research_results = state.get("research_results") or {}
+        agent_results = [
+            f"[{task_id}] {task}:\n{research_results[task_id]}"
+            for task_id, task in plan_tasks(state, "research")
+            if task_id in research_results
+        ]
         for msg in state["messages"][-5:]:  # Check recent messages
             if isinstance(msg, AIMessage):
                 agent_results.append(msg.content)
+        task_lines = "\n".join(
+            f"- {task_id} [{task['kind']}, {task_status.get(task_id, 'pending')}]: {task['description']}"
+            for task_id, task in task_plan.get("tasks", {}).items()
+        )
         
         system_message = f"""You are an Evaluator/Synthesizer Agent that creates the final response.
 
@@ -291,6 +433,8 @@ COORDINATION PLAN: {task_plan.get('strategy', 'Direct response')}
 SUCCESS CRITERIA: {success_criteria}
 
 AGENT STATUS: {agent_status}
+TASKS:
+{task_lines or "- (none)"}
 RESULTS:
 {chr(10).join(agent_results)}
 
@@ -300,6 +444,7 @@ GUIDELINES:
 3. Evaluate if success criteria were met
 4. Highlight key info, deliverables, and follow-ups
 5. Note any missing info or need for user input
+6. If the criteria are not met, give feedback and list the IDs of the tasks whose results were inadequate
 
 Provide a clear, professional response.
 """
@@ -313,52 +458,53 @@ Provide a clear, professional response.
         return {
             "messages": [AIMessage(content=result.response)],
             "success_criteria_met": result.success_criteria_met,
-            "user_input_needed": result.user_input_needed
+            "user_input_needed": result.user_input_needed,
+            "feedback_on_work": result.feedback,
+            "failed_task_ids": result.failed_task_ids
         }
 
     # Simplified routing functions
-    def coordinator_router(self, state: State) -> str:
-        """Route from coordinator based on task plan"""
-        task_plan = state.get("task_plan", {})
+    def dispatch_router(self, state: State):
+        """Route from coordinator or replanner: fan out one research sub-agent per pending task"""
+        research_tasks = plan_tasks(state, "research", ["pending"])
+        action_tasks = plan_tasks(state, "action", ["pending"])
         
-        if task_plan.get("research_tasks"):
-            return "research_agent"
-        elif task_plan.get("action_tasks"):
+        if research_tasks:
+            all_tasks = [task for _, task in plan_tasks(state, "research")]
+            sends = [
+                Send("research_worker", {
+                    "task_id": task_id,
+                    "task": task,
+                    "all_tasks": all_tasks,
+                    "success_criteria": state["success_criteria"],
+                    "feedback_on_work": state.get("feedback_on_work"),
+                })
+                for task_id, task in research_tasks
+            ]
+            # Independent action work does not need to wait for the research
+            if action_tasks and not state.get("task_plan", {}).get("requires_both"):
+                sends.append(Send("action_agent", state))
+            return sends
+        elif action_tasks:
             return "action_agent"
         else:
             return "evaluator"
 
-    def research_router(self, state: State) -> str:
-        """Route from research agent"""
-        last_message = state["messages"][-1]
-        
-        if hasattr(last_message, "tool_calls") and last_message.tool_calls:
-            return "research_tools"
-        
-        # Research complete - check if action needed
-        task_plan = state.get("task_plan", {})
-        agent_status = state.get("agent_status", {})
-        
-        if task_plan.get("action_tasks") and agent_status.get("action") == "pending":
+    def merge_router(self, state: State) -> str:
+        """Route from the merge node: run dependent actions once research is in"""
+        if plan_tasks(state, "action", ["pending"]):
             return "action_agent"
         else:
             return "evaluator"
 
-    def action_router(self, state: State) -> str:
-        """Route from action agent"""
-        last_message = state["messages"][-1]
-        
-        if hasattr(last_message, "tool_calls") and last_message.tool_calls:
-            return "action_tools"
-        else:
-            return "evaluator"
-
     def evaluator_router(self, state: State) -> str:
         """Route from evaluator"""
         if state.get("success_criteria_met") or state.get("user_input_needed"):
             return "END"
+        elif state.get("replan_count", 0) >= MAX_REPLANS:
+            return "END"
         else:
-            return "coordinator"  # Retry if needed
+            return "replanner"  # Redo only what failed
 
     async def build_graph(self):
         """Construct the agent graph"""
@@ -366,22 +512,23 @@ Provide a clear, professional response.
         
         # Add nodes
         graph.add_node("coordinator", self.coordinator_agent)
-        graph.add_node("research_agent", self.research_agent)
+        graph.add_node("replanner", self.replanner)
+        graph.add_node("research_worker", self.research_worker)
         graph.add_node("action_agent", self.action_agent)
+        graph.add_node("merge_results", self.merge_results)
         graph.add_node("evaluator", self.evaluator)
-        graph.add_node("research_tools", ToolNode(self.research_tools))
-        graph.add_node("action_tools", ToolNode(self.action_tools))
         
-        # Add edges
+        # Add edges: every research sub-agent and the action agent report to the merge node,
+        # which runs once per superstep no matter how many of them finished in it
         graph.add_edge(START, "coordinator")
-        graph.add_edge("research_tools", "research_agent")
-        graph.add_edge("action_tools", "action_agent")
+        graph.add_edge("research_worker", "merge_results")
+        graph.add_edge("action_agent", "merge_results")
         
         # Add conditional edges
-        graph.add_conditional_edges("coordinator", self.coordinator_router)
-        graph.add_conditional_edges("research_agent", self.research_router)
-        graph.add_conditional_edges("action_agent", self.action_router)
-        graph.add_conditional_edges("evaluator", self.evaluator_router)
+        graph.add_conditional_edges("coordinator", self.dispatch_router, ["research_worker", "action_agent", "evaluator"])
+        graph.add_conditional_edges("replanner", self.dispatch_router, ["research_worker", "action_agent", "evaluator"])
+        graph.add_conditional_edges("merge_results", self.merge_router, ["action_agent", "evaluator"])
+        graph.add_conditional_edges("evaluator", self.evaluator_router, {"replanner": "replanner", "END": END})
         
         self.graph = graph.compile(checkpointer=self.memory)
 
@@ -391,27 +538,39 @@ Provide a clear, professional response.
             thread_id = str(uuid.uuid4())
         
         config = {"configurable": {"thread_id": thread_id}}
+        # Push notifications sent during this turn are merged per session
+        current_session.set(thread_id)
         
-        # Convert history to messages
-        messages = []
-        for msg in history:
-            if msg["role"] == "user":
-                messages.append(HumanMessage(content=msg["content"]))
-            else:
-                messages.append(AIMessage(content=msg["content"]))
+        # Only submit turns the checkpointed thread does not have yet
+        snapshot = await self.graph.aget_state(config)
+        if snapshot.values.get("messages"):
+            synced = self.synced_turns.get(thread_id, len(history))
+        else:
+            synced = 0
+        messages = [
+            history_message(thread_id, index, msg["role"], msg["content"])
+            for index, msg in enumerate(history[synced:], synced)
+        ]
+        messages.append(history_message(thread_id, len(history), "user", message))
         
         # Initialize state
         state = {
-            "messages": messages + [HumanMessage(content=message)],
+            "messages": messages,
             "success_criteria": success_criteria or "Provide a helpful response",
             "success_criteria_met": False,
             "user_input_needed": False,
             "task_plan": {},
-            "agent_status": {}
+            "task_status": None,
+            "agent_status": {},
+            "research_results": None,
+            "feedback_on_work": None,
+            "failed_task_ids": [],
+            "replan_count": 0
         }
         
         # Run the graph
         result = await self.graph.ainvoke(state, config=config)
+        self.synced_turns[thread_id] = len(history) + 2
         
         # Prepare response
         user = {"role": "user", "content": message}
@@ -420,7 +579,10 @@ Provide a clear, professional response.
         return history + [user, reply], thread_id
 
     async def cleanup(self):
-        """Clean up browser resources"""
+        """Clean up browser resources and forget this Sidekick's conversation threads"""
+        for thread_id in self.synced_turns:
+            self.memory.delete_thread(thread_id)
+        self.synced_turns.clear()
         if self.browser:
             try:
                 await self.browser.close()
@@ -1,3 +1,7 @@
+import sys
+from pathlib import Path
+# push_notifier and bounded_checkpointer live at the repository root and are shared by every Sidekick
+sys.path.append(str(Path(__file__).resolve().parents[2]))
 import gradio as gr
 from sidekick import Sidekick
 
@@ -5,11 +5,12 @@ from langgraph.graph.message import add_messages
 from dotenv import load_dotenv
 from langgraph.prebuilt import ToolNode
 from langchain_openai import ChatOpenAI
-from langgraph.checkpoint.memory import MemorySaver
+from bounded_checkpointer import get_checkpointer
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from typing import List, Any, Optional, Dict
 from pydantic import BaseModel, Field
 from sidekick_tools import playwright_tools, other_tools
+from push_notifier import current_session
 import uuid
 import asyncio
 from datetime import datetime
@@ -41,7 +42,7 @@ class Sidekick:
         self.llm_with_tools = None
         self.graph = None
         self.sidekick_id = str(uuid.uuid4())
-        self.memory = MemorySaver()
+        self.memory = get_checkpointer()
         self.browser = None
         self.playwright = None
 
@@ -198,6 +199,8 @@ class Sidekick:
 
     async def run_superstep(self, message, success_criteria, history):
         config = {"configurable": {"thread_id": self.sidekick_id}}
+        # Push notifications sent during this turn are merged per session
+        current_session.set(self.sidekick_id)
 
         state = {
             "messages": message,
@@ -213,6 +216,8 @@ class Sidekick:
         return history + [user, reply, feedback]
 
     def cleanup(self):
+        # The thread ends with this session, so its checkpoints can go
+        self.memory.delete_thread(self.sidekick_id)
         if self.browser:
             try:
                 loop = asyncio.get_running_loop()
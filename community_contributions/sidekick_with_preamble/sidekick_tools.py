@@ -2,7 +2,7 @@ from playwright.async_api import async_playwright
 from langchain_community.agent_toolkits import PlayWrightBrowserToolkit
 from dotenv import load_dotenv
 import os
-import requests
+from push_notifier import get_notifier
 from langchain.agents import Tool
 from langchain_community.agent_toolkits import FileManagementToolkit
 from langchain_community.tools.wikipedia.tool import WikipediaQueryRun
@@ -26,8 +26,8 @@ async def playwright_tools():
 
 
 def push(text: str):
-    """Send a push notification to the user"""
-    requests.post(pushover_url, data = {"token": pushover_token, "user": pushover_user, "message": text})
+    """Queue a push notification to the user; it is delivered in the background"""
+    get_notifier(pushover_token, pushover_user, pushover_url).enqueue(text)
     return "success"
 
 
@@ -37,6 +37,8 @@ def get_file_tools():
 
 
 async def other_tools():
+    # Deliver notifications still queued from a previous run without waiting for a new push
+    get_notifier(pushover_token, pushover_user, pushover_url)
     push_tool = Tool(name="send_push_notification", func=push, description="Use this tool when you want to send a push notification")
     file_tools = get_file_tools()
 
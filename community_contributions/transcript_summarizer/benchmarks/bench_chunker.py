@@ -0,0 +1,143 @@
+"""
+Benchmark TextChunker on large synthetic transcripts.
+
+chunk_text is timed on 100k-2M token inputs. chunk_by_sentences is timed on
+text parsed from a generated VTT file and compared with the previous
+implementation, which re-encoded the growing chunk after every sentence.
+
+Run from the project root:
+
+    python benchmarks/bench_chunker.py
+    python benchmarks/bench_chunker.py --sizes 100000,2000000 --cues 20000 --chunk-size 2000 --overlap 200
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.chunker import TextChunker, TextChunk
+from src.core.vtt_parser import VTTParser
+
+WORDS = (
+    "the team discussed roadmap budget release customer feedback design review "
+    "latency metrics deployment migration schedule hiring onboarding incident "
+    "retrospective priorities quarter launch testing coverage documentation"
+).split()
+
+def make_transcript(chunker: TextChunker, target_tokens: int, seed: int = 0) -> str:
+    """Build speaker-turn text of roughly target_tokens tokens."""
+    rng = random.Random(seed)
+    sample = []
+    for _ in range(500):
+        words = rng.choices(WORDS, k=rng.randint(6, 24))
+        ending = rng.choice([".", ".", ".", "?", "!"])
+        sample.append(f"Speaker {rng.randint(1, 6)}: {' '.join(words).capitalize()}{ending}")
+    sample_text = " ".join(sample)
+    tokens_per_copy = len(chunker.tokenizer.encode(sample_text))
+    copies = max(1, -(-target_tokens // tokens_per_copy))
+    return " ".join([sample_text] * copies)
+
+def make_vtt_text(cues: int, seed: int = 0) -> str:
+    """Generate a VTT file with the given number of cues and return its parsed transcript."""
+    rng = random.Random(seed)
+    lines = ["WEBVTT", ""]
+    for cue in range(cues):
+        start = cue * 3
+        words = rng.choices(WORDS, k=rng.randint(4, 14))
+        ending = rng.choice([".", "?", ",", ""])
+        lines.append(f"{start // 3600:02d}:{start // 60 % 60:02d}:{start % 60:02d}.000 --> "
+                     f"{(start + 3) // 3600:02d}:{(start + 3) // 60 % 60:02d}:{(start + 3) % 60:02d}.000")
+        lines.append(f"{' '.join(words).capitalize()}{ending}")
+        lines.append("")
+    parser = VTTParser()
+    parser.parse_content("\n".join(lines))
+    return parser.get_full_transcript()
+
+def legacy_chunk_by_sentences(chunker: TextChunker, text: str):
+    """chunk_by_sentences as it was before incremental token accounting."""
+    import re
+
+    def get_overlap_text(text):
+        tokens = chunker.tokenizer.encode(text)
+        if len(tokens) <= chunker.overlap_size:
+            return text
+        return chunker.tokenizer.decode(tokens[-chunker.overlap_size:])
+
+    sentences = re.split(r'[.!?]+\s+', text)
+    chunks = []
+    current_chunk = ""
+    current_tokens = 0
+    chunk_id = 0
+    start_index = 0
+    for sentence in sentences:
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        sentence_tokens = len(chunker.tokenizer.encode(sentence))
+        if current_tokens + sentence_tokens > chunker.chunk_size and current_chunk:
+            chunk = TextChunk(current_chunk.strip(), start_index, start_index + len(current_chunk), current_tokens, chunk_id)
+            chunks.append(chunk)
+            overlap_text = get_overlap_text(current_chunk)
+            current_chunk = overlap_text + " " + sentence
+            current_tokens = len(chunker.tokenizer.encode(current_chunk))
+            start_index += len(chunk.content) - len(overlap_text)
+            chunk_id += 1
+        else:
+            current_chunk = current_chunk + " " + sentence if current_chunk else sentence
+            current_tokens = len(chunker.tokenizer.encode(current_chunk))
+    if current_chunk.strip():
+        chunks.append(TextChunk(current_chunk.strip(), start_index, start_index + len(current_chunk), current_tokens, chunk_id))
+    return chunks
+
+def run_sentences(cue_counts, chunk_size: int, overlap: int):
+    chunker = TextChunker(chunk_size=chunk_size, overlap_size=overlap)
+    print(f"{'cues':>8} {'tokens':>10} {'legacy s':>9} {'chunks':>7} {'new s':>8} {'chunks':>7} {'speedup':>8}")
+    for cues in cue_counts:
+        text = make_vtt_text(cues)
+        tokens = len(chunker.tokenizer.encode(text))
+
+        started = time.perf_counter()
+        legacy = legacy_chunk_by_sentences(chunker, text)
+        legacy_elapsed = time.perf_counter() - started
+
+        started = time.perf_counter()
+        chunks = chunker.chunk_by_sentences(text)
+        elapsed = time.perf_counter() - started
+
+        assert all(c.token_count <= chunk_size for c in chunks), "chunk over the token limit"
+        print(f"{cues:>8} {tokens:>10} {legacy_elapsed:>9.2f} {len(legacy):>7} {elapsed:>8.2f} {len(chunks):>7} "
+              f"{legacy_elapsed / elapsed:>7.1f}x")
+
+def run(sizes, chunk_size: int, overlap: int):
+    chunker = TextChunker(chunk_size=chunk_size, overlap_size=overlap)
+    print("chunk_text")
+    print(f"{'tokens':>10} {'chars':>11} {'chunks':>7} {'seconds':>8} {'tokens/s':>12}")
+    for size in sizes:
+        text = make_transcript(chunker, size)
+        tokens = len(chunker.tokenizer.encode(text))
+
+        started = time.perf_counter()
+        chunks = chunker.chunk_text(text)
+        elapsed = time.perf_counter() - started
+
+        assert all(text[c.start_index:c.end_index] == c.content for c in chunks), "offsets do not match content"
+        assert chunks[-1].end_index == len(text)
+        print(f"{tokens:>10} {len(text):>11} {len(chunks):>7} {elapsed:>8.2f} {tokens / elapsed:>12,.0f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="100000,500000,1000000,2000000", help="Comma-separated input sizes in tokens")
+    parser.add_argument("--cues", default="10000,50000", help="Comma-separated VTT cue counts for chunk_by_sentences")
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    parser.add_argument("--overlap", type=int, default=200)
+    args = parser.parse_args()
+    run([int(size) for size in args.sizes.split(",")], args.chunk_size, args.overlap)
+    print()
+    print("chunk_by_sentences")
+    run_sentences([int(cues) for cues in args.cues.split(",")], args.chunk_size, args.overlap)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark VTTParser against webvtt-py on large generated VTT files.
+
+The webvtt column is the previous parse_file: webvtt.read followed by the
+regex cleanup of every caption. The streaming column iterates segments
+without keeping them. Memory compares a list of TranscriptSegment objects
+with the columnar SegmentStore that parse_file now returns.
+
+Run from the project root:
+
+    python benchmarks/bench_vtt_parser.py
+    python benchmarks/bench_vtt_parser.py --cues 10000,200000
+"""
+import os
+import re
+import sys
+import time
+import random
+import argparse
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import webvtt
+
+from src.core.vtt_parser import VTTParser
+
+WORDS = (
+    "the team discussed roadmap budget release customer feedback design review "
+    "latency metrics deployment migration schedule hiring onboarding incident"
+).split()
+
+def timestamp(seconds: int) -> str:
+    return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}.000"
+
+def write_vtt(path: str, cues: int, seed: int = 0):
+    """Write a VTT file with speaker tags and two-line cues."""
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("WEBVTT\n\n")
+        for cue in range(cues):
+            start = cue
+            first = " ".join(rng.choices(WORDS, k=rng.randint(3, 8)))
+            second = " ".join(rng.choices(WORDS, k=rng.randint(3, 8)))
+            file.write(f"{cue + 1}\n{timestamp(start)} --> {timestamp(start + 1)}\n"
+                       f"<v Speaker {rng.randint(1, 6)}>{first}</v>\n{second}.\n\n")
+
+def parse_with_webvtt(path: str):
+    """The previous VTTParser.parse_file."""
+    segments = []
+    for caption in webvtt.read(path):
+        text = re.sub(r'<[^>]+>', '', caption.text)
+        text = re.sub(r'\s+', ' ', text).strip()
+        if text:
+            segments.append((caption.start, caption.end, text))
+    return segments
+
+def timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+def allocated_mb(function, *args) -> float:
+    """Memory still allocated by the result of function."""
+    tracemalloc.start()
+    result = function(*args)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current / (1024 * 1024)
+
+def run(cue_counts):
+    print(f"{'cues':>8} {'MB':>6} {'webvtt s':>9} {'parser s':>9} {'stream s':>9} {'speedup':>8} "
+          f"{'list MB':>8} {'store MB':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for cues in cue_counts:
+            path = os.path.join(directory, f"{cues}.vtt")
+            write_vtt(path, cues)
+            parser = VTTParser()
+
+            legacy, legacy_elapsed = timed(parse_with_webvtt, path)
+            segments, elapsed = timed(parser.parse_file, path)
+            streamed, stream_elapsed = timed(lambda: sum(1 for _ in parser.iter_segments(path)))
+
+            assert [(s.start_time, s.end_time, s.text) for s in segments] == legacy, "parsers disagree"
+            assert streamed == len(segments)
+            del legacy, segments
+            list_memory = allocated_mb(lambda: list(parser.iter_segments(path)))
+            store_memory = allocated_mb(lambda: VTTParser().parse_file(path))
+            size = os.path.getsize(path) / (1024 * 1024)
+            print(f"{cues:>8} {size:>6.1f} {legacy_elapsed:>9.2f} {elapsed:>9.2f} {stream_elapsed:>9.2f} "
+                  f"{legacy_elapsed / elapsed:>7.1f}x {list_memory:>8.1f} {store_memory:>9.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cues", default="10000,200000", help="Comma-separated cue counts")
+    args = parser.parse_args()
+    run([int(cues) for cues in args.cues.split(",")])
+
+if __name__ == "__main__":
+    main()
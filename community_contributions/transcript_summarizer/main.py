@@ -1,14 +1,11 @@
 import os
-import gradio as gr
-from src.ui.gradio_app import create_gradio_interface
+import sys
+import asyncio
+import argparse
 from src.utils.config import Config
 
-def main():
-    """Main entry point for the transcript summarizer application."""
-    # Load configuration
-    config = Config()
-    
-    print("🚀 Starting Transcript Summarizer...")
+def print_provider(config: Config):
+    """Print the configured LLM provider and model."""
     print(f"✨ LLM Provider: {config.llm_provider.capitalize()}")
     if config.llm_provider == "ollama":
         print(f"📡 Ollama URL: {config.ollama_base_url}")
@@ -16,11 +13,18 @@ def main():
     elif config.llm_provider == "gemini":
         print(f"🔑 Gemini API Key: {'Set' if config.gemini_api_key else 'Not Set'}")
         print(f"🤖 Gemini Model: {config.gemini_model_name}")
+
+def run_ui(config: Config):
+    """Launch the Gradio interface."""
+    from src.ui.gradio_app import create_gradio_interface
+
+    print("🚀 Starting Transcript Summarizer...")
+    print_provider(config)
     print(f"🌐 Gradio Port: {config.gradio_port}")
-    
+
     # Create and launch Gradio interface
     interface = create_gradio_interface(config)
-    
+
     # Launch the application
     interface.launch(
         server_name="0.0.0.0",
@@ -29,5 +33,46 @@ def main():
         show_error=True
     )
 
+def run_batch(config: Config, args: argparse.Namespace) -> int:
+    """Summarize every transcript matched by the batch arguments."""
+    from src.core.batch import BatchManifest, BatchRunner, discover_transcripts
+    from src.core.summarizer import TranscriptSummarizer
+
+    files = discover_transcripts(args.inputs)
+    if not files:
+        print("❌ No .vtt files found.")
+        return 1
+
+    print(f"📚 Batch summarizing {len(files)} transcripts")
+    print_provider(config)
+    print(f"📒 Manifest: {args.manifest}")
+
+    manifest = BatchManifest(args.manifest)
+    runner = BatchRunner(TranscriptSummarizer(config), manifest, workers=args.workers, force=args.force)
+    counts = asyncio.run(runner.run(files))
+
+    print(f"🏁 Done: {counts['done']} summarized, {counts['skipped']} already done, {counts['failed']} failed")
+    return 1 if counts["failed"] else 0
+
+def main():
+    """Main entry point for the transcript summarizer application."""
+    parser = argparse.ArgumentParser(description="Transcript Summarizer")
+    subcommands = parser.add_subparsers(dest="command")
+    subcommands.add_parser("ui", help="Launch the Gradio interface (default)")
+    batch = subcommands.add_parser("batch", help="Summarize directories or globs of .vtt files without the UI")
+    batch.add_argument("inputs", nargs="+", help="VTT files, directories (searched recursively) or glob patterns")
+    batch.add_argument("--manifest", default=os.path.join(".cache", "batch_manifest.jsonl"),
+                       help="JSONL progress file; rerunning with the same manifest resumes the batch")
+    batch.add_argument("--workers", type=int, default=None, help="Processes for parsing and chunking (default: CPU count)")
+    batch.add_argument("--force", action="store_true", help="Summarize files the manifest already has as done")
+    args = parser.parse_args()
+
+    # Load configuration
+    config = Config()
+
+    if args.command == "batch":
+        sys.exit(run_batch(config, args))
+    run_ui(config)
+
 if __name__ == "__main__":
     main()
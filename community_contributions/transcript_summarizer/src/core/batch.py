@@ -0,0 +1,245 @@
+import os
+import glob
+import json
+import time
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from .chunker import TextChunker, TextChunk
+from .vtt_parser import VTTParser
+from ..services.http_pool import close_async_session
+
+if TYPE_CHECKING:
+    from .summarizer import TranscriptSummarizer, SummarizationResult
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_SUFFIX = ".summary.md"
+
+# Chunkers of a worker process, keyed by (chunk_size, overlap_size)
+_worker_chunkers: Dict[Tuple[int, int], TextChunker] = {}
+
+@dataclass
+class ManifestEntry:
+    """Outcome of one transcript in a batch run."""
+    file: str
+    status: str  # "done" or "failed"
+    size: int
+    mtime: float
+    summary_path: Optional[str] = None
+    chunks: int = 0
+    processing_time: float = 0.0
+    error: Optional[str] = None
+    finished_at: float = 0.0
+
+class BatchManifest:
+    """
+    Append-only JSONL record of finished transcripts.
+
+    Every finished file appends one line, flushed to disk before the next
+    file is reported, so a crashed run can be resumed. The last line for a
+    file wins.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open or create the manifest.
+
+        Args:
+            path: Path of the JSONL file
+        """
+        self.path = path
+        self.entries: Dict[str, ManifestEntry] = {}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        entry = ManifestEntry(**json.loads(line))
+                    except (ValueError, TypeError):
+                        # A line cut short by a crash
+                        logger.warning(f"Skipping unreadable manifest line in {path}")
+                        continue
+                    self.entries[entry.file] = entry
+
+    def is_done(self, path: str) -> bool:
+        """Whether a file was summarized and has not changed since."""
+        entry = self.entries.get(os.path.abspath(path))
+        if entry is None or entry.status != "done":
+            return False
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        return entry.size == stat.st_size and entry.mtime == stat.st_mtime and os.path.exists(entry.summary_path or "")
+
+    def record(self, entry: ManifestEntry):
+        """Append an entry and flush it to disk."""
+        self.entries[entry.file] = entry
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(asdict(entry), ensure_ascii=False) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+
+def discover_transcripts(inputs: List[str]) -> List[str]:
+    """
+    Expand directories and glob patterns into a sorted list of .vtt files.
+
+    Args:
+        inputs: Files, directories (searched recursively) or glob patterns
+
+    Returns:
+        Absolute paths without duplicates
+    """
+    found = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            matches = glob.glob(os.path.join(item, "**", "*.vtt"), recursive=True)
+        elif os.path.isfile(item):
+            matches = [item]
+        else:
+            matches = glob.glob(item, recursive=True)
+        found.update(os.path.abspath(match) for match in matches if match.lower().endswith(".vtt"))
+    return sorted(found)
+
+def summary_path_for(path: str) -> str:
+    """Path of the summary written next to a transcript."""
+    return os.path.splitext(path)[0] + SUMMARY_SUFFIX
+
+def prepare_transcript(path: str, chunk_size: int, overlap_size: int) -> Tuple[str, List[TextChunk]]:
+    """
+    Parse and chunk a transcript; runs in a worker process.
+
+    Args:
+        path: Path to the VTT file
+        chunk_size: Maximum tokens per chunk
+        overlap_size: Token overlap between chunks
+
+    Returns:
+        Tuple of (full transcript text, cue-aligned chunks)
+    """
+    chunker = _worker_chunkers.get((chunk_size, overlap_size))
+    if chunker is None:
+        chunker = _worker_chunkers[(chunk_size, overlap_size)] = TextChunker(chunk_size=chunk_size, overlap_size=overlap_size)
+    segments = VTTParser().parse_file(path)
+    return segments.full_text(), chunker.chunk_segments(segments)
+
+def format_summary(path: str, result: "SummarizationResult") -> str:
+    """Markdown written to the summary file."""
+    lines = [f"# Summary of {os.path.basename(path)}", "", result.summary.strip(), ""]
+    if result.chunk_timeline:
+        lines.extend(["## Timeline", ""])
+        for entry in result.chunk_timeline:
+            lines.append(f"- **{entry['start_time']} – {entry['end_time']}:** {entry['summary']}")
+        lines.append("")
+    return "\n".join(lines)
+
+class BatchRunner:
+    """Summarizes many transcripts with one shared LLM concurrency budget."""
+
+    def __init__(self, summarizer: "TranscriptSummarizer", manifest: BatchManifest, workers: Optional[int] = None, force: bool = False):
+        """
+        Initialize the runner.
+
+        Args:
+            summarizer: Summarizer whose request scheduler caps LLM requests across all files
+            manifest: Manifest used to skip finished files and record progress
+            workers: Processes used for parsing and chunking (default: CPU count)
+            force: Summarize files even if the manifest has them as done
+        """
+        self.summarizer = summarizer
+        self.manifest = manifest
+        self.workers = workers or os.cpu_count() or 1
+        self.force = force
+
+    async def run(self, files: List[str]) -> Dict[str, int]:
+        """
+        Summarize files, writing each summary next to its transcript.
+
+        Args:
+            files: Transcript paths
+
+        Returns:
+            Counts of "done", "failed" and "skipped" files
+        """
+        pending = [path for path in files if self.force or not self.manifest.is_done(path)]
+        counts = {"done": 0, "failed": 0, "skipped": len(files) - len(pending)}
+        if counts["skipped"]:
+            logger.info(f"Skipping {counts['skipped']} transcripts already in {self.manifest.path}")
+        if not pending:
+            return counts
+
+        config = self.summarizer.config
+        loop = asyncio.get_running_loop()
+        # Keep enough files in flight to fill the LLM budget while the pool prepares the next ones
+        files_in_flight = asyncio.Semaphore(max(self.workers, config.max_concurrent_requests) * 2)
+
+        async def process(path: str):
+            async with files_in_flight:
+                stat = None
+                started = time.time()
+                try:
+                    stat = os.stat(path)
+                    text, chunks = await loop.run_in_executor(
+                        pool, prepare_transcript, path, config.chunk_size, config.chunk_overlap
+                    )
+                    result = await self.summarizer.summarize_text(text, chunks=chunks)
+                    if result.error:
+                        raise RuntimeError(result.error)
+                    summary_path = summary_path_for(path)
+                    self._write_atomic(summary_path, format_summary(path, result))
+                    entry = ManifestEntry(
+                        file=path,
+                        status="done",
+                        size=stat.st_size,
+                        mtime=stat.st_mtime,
+                        summary_path=summary_path,
+                        chunks=result.chunks_processed,
+                        processing_time=time.time() - started,
+                        finished_at=time.time()
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to summarize {path}: {e}")
+                    entry = ManifestEntry(
+                        file=path,
+                        status="failed",
+                        # The file may have gone before it could be stat'ed
+                        size=stat.st_size if stat else 0,
+                        mtime=stat.st_mtime if stat else 0.0,
+                        processing_time=time.time() - started,
+                        error=str(e),
+                        finished_at=time.time()
+                    )
+                self.manifest.record(entry)
+                counts[entry.status] += 1
+                self._report(entry, counts, len(pending))
+
+        # Load the model while the first files are parsed and chunked
+        warm_up = loop.run_in_executor(None, self.summarizer.warm_up_model) if config.ollama_warm_up else None
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            async with self.summarizer.llm_service:
+                await asyncio.gather(*(process(path) for path in pending))
+        if warm_up is not None:
+            await warm_up
+        await close_async_session()
+        return counts
+
+    def _write_atomic(self, path: str, content: str):
+        """Write a file so that a crash never leaves it half written."""
+        temporary = path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            file.write(content)
+        os.replace(temporary, path)
+
+    def _report(self, entry: ManifestEntry, counts: Dict[str, int], total: int):
+        finished = counts["done"] + counts["failed"]
+        name = os.path.basename(entry.file)
+        if entry.status == "done":
+            print(f"✅ [{finished}/{total}] {name}: {entry.chunks} chunks in {entry.processing_time:.1f}s")
+        else:
+            print(f"❌ [{finished}/{total}] {name}: {entry.error}")
@@ -1,8 +1,21 @@
+import os
+import re
+import bisect
+import itertools
 import tiktoken
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Optional, Tuple
 from dataclasses import dataclass
 import math
 
+from .segment_store import SegmentStore
+
+# End of a sentence: terminal punctuation followed by whitespace
+SENTENCE_END_PATTERN = re.compile(r'[.!?]+(?=\s)')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# Threads used by tiktoken to tokenize sentences in a batch
+ENCODE_THREADS = min(8, os.cpu_count() or 1)
+
 @dataclass
 class TextChunk:
     """Represents a chunk of text with metadata."""
@@ -11,6 +24,9 @@ class TextChunk:
     end_index: int
     token_count: int
     chunk_id: int
+    # Seconds into the recording, set when chunking transcript cues
+    start_time: Optional[float] = None
+    end_time: Optional[float] = None
 
 class TextChunker:
     """Handles intelligent text chunking for long documents."""
@@ -46,7 +62,7 @@ class TextChunker:
         if not text.strip():
             return []
         
-        # Tokenize the entire text
+        # Tokenize the entire text once
         tokens = self.tokenizer.encode(text)
         total_tokens = len(tokens)
         
@@ -60,6 +76,20 @@ class TextChunker:
                 chunk_id=0
             )]
         
+        # Character offset of every token, plus the end of the text
+        offsets = self._token_offsets(tokens)
+        offsets.append(len(text))
+        
+        sentence_breaks = []
+        word_breaks = []
+        if preserve_sentences:
+            sentence_breaks = self._token_breaks(
+                (m.end() for m in SENTENCE_END_PATTERN.finditer(text)), offsets
+            )
+            word_breaks = self._token_breaks(
+                (m.start() for m in WHITESPACE_PATTERN.finditer(text)), offsets
+            )
+        
         chunks = []
         chunk_id = 0
         start_token = 0
@@ -68,34 +98,30 @@ class TextChunker:
             # Calculate end token for this chunk
             end_token = min(start_token + self.chunk_size, total_tokens)
             
-            # Extract tokens for this chunk
-            chunk_tokens = tokens[start_token:end_token]
-            chunk_text = self.tokenizer.decode(chunk_tokens)
-            
-            # If we're preserving sentences and not at the end, try to break at sentence boundary
+            # If we're preserving sentences and not at the end, try to break at a sentence, then a word
             if preserve_sentences and end_token < total_tokens:
-                chunk_text = self._adjust_chunk_boundary(chunk_text)
-                # Re-encode to get actual token count
-                chunk_tokens = self.tokenizer.encode(chunk_text)
-                end_token = start_token + len(chunk_tokens)
+                end_token = (
+                    self._last_break(sentence_breaks, start_token, end_token)
+                    or self._last_break(word_breaks, start_token, end_token)
+                    or end_token
+                )
             
             # Create chunk
             chunk = TextChunk(
-                content=chunk_text,
-                start_index=self._get_char_index(text, start_token, tokens),
-                end_index=self._get_char_index(text, end_token, tokens),
-                token_count=len(chunk_tokens),
+                content=text[offsets[start_token]:offsets[end_token]],
+                start_index=offsets[start_token],
+                end_index=offsets[end_token],
+                token_count=end_token - start_token,
                 chunk_id=chunk_id
             )
             chunks.append(chunk)
             
+            if end_token >= total_tokens:
+                break
+            
             # Calculate next start position with overlap
             start_token = max(end_token - self.overlap_size, start_token + 1)
             chunk_id += 1
-            
-            # Prevent infinite loop
-            if start_token >= end_token:
-                break
         
         return chunks
     
@@ -103,134 +129,218 @@ class TextChunker:
         """
         Chunk text by sentences, respecting token limits.
         
+        Every sentence is tokenized once and chunks are packed from running
+        sums of the sentence counts. Consecutive chunks share whole trailing
+        sentences worth up to overlap_size tokens. A sentence longer than
+        chunk_size is split with chunk_text.
+        
         Args:
             text: Input text to chunk
             
         Returns:
             List of TextChunk objects
         """
-        import re
+        sentences, starts, ends = self._split_sentences(text)
+        if not sentences:
+            return []
         
-        # Split into sentences using regex
-        sentence_endings = r'[.!?]+\s+'
-        sentences = re.split(sentence_endings, text)
+        prefix, ranges = self._pack_units(sentences)
         
         chunks = []
-        current_chunk = ""
-        current_tokens = 0
-        chunk_id = 0
-        start_index = 0
-        
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if not sentence:
+        for first, last in ranges:
+            if prefix[last] - prefix[first] > self.chunk_size:
+                # Sentence too long for any chunk; split it by tokens
+                for piece in self.chunk_text(sentences[first]):
+                    piece.start_index += starts[first]
+                    piece.end_index += starts[first]
+                    piece.chunk_id = len(chunks)
+                    chunks.append(piece)
                 continue
+            chunks.append(TextChunk(
+                content=" ".join(sentences[first:last]),
+                start_index=starts[first],
+                end_index=ends[last - 1],
+                token_count=prefix[last] - prefix[first],
+                chunk_id=len(chunks)
+            ))
+        
+        return chunks
+    
+    def chunk_segments(self, segments: SegmentStore) -> List[TextChunk]:
+        """
+        Chunk parsed transcript cues, keeping their timing.
+        
+        Cues are packed whole into chunks under the token limit, so every
+        chunk covers a time range of the recording. Consecutive chunks share
+        whole trailing cues worth up to overlap_size tokens. A cue longer than
+        chunk_size is split with chunk_text.
+        
+        Args:
+            segments: Parsed transcript cues
             
-            sentence_tokens = len(self.tokenizer.encode(sentence))
-            
-            # If adding this sentence would exceed the limit, create a new chunk
-            if current_tokens + sentence_tokens > self.chunk_size and current_chunk:
-                chunk = TextChunk(
-                    content=current_chunk.strip(),
-                    start_index=start_index,
-                    end_index=start_index + len(current_chunk),
-                    token_count=current_tokens,
-                    chunk_id=chunk_id
-                )
-                chunks.append(chunk)
-                
-                # Start new chunk with overlap
-                overlap_text = self._get_overlap_text(current_chunk)
-                current_chunk = overlap_text + " " + sentence
-                current_tokens = len(self.tokenizer.encode(current_chunk))
-                start_index += len(chunk.content) - len(overlap_text)
-                chunk_id += 1
-            else:
-                # Add sentence to current chunk
-                if current_chunk:
-                    current_chunk += " " + sentence
-                else:
-                    current_chunk = sentence
-                current_tokens = len(self.tokenizer.encode(current_chunk))
-        
-        # Add the last chunk
-        if current_chunk.strip():
-            chunk = TextChunk(
-                content=current_chunk.strip(),
-                start_index=start_index,
-                end_index=start_index + len(current_chunk),
-                token_count=current_tokens,
-                chunk_id=chunk_id
-            )
-            chunks.append(chunk)
+        Returns:
+            List of TextChunk objects with start_time and end_time set
+        """
+        texts = [segments.text(index) for index in range(len(segments))]
+        if not texts:
+            return []
+        
+        prefix, ranges = self._pack_units(texts)
+        buffer = segments.buffer
+        offsets = segments.offsets
+        
+        chunks = []
+        for first, last in ranges:
+            start_time = segments.starts[first]
+            end_time = max(segments.ends[first:last])
+            if prefix[last] - prefix[first] > self.chunk_size:
+                # Cue too long for any chunk; split it by tokens
+                for piece in self.chunk_text(texts[first]):
+                    piece.start_index += offsets[first]
+                    piece.end_index += offsets[first]
+                    piece.start_time = start_time
+                    piece.end_time = end_time
+                    piece.chunk_id = len(chunks)
+                    chunks.append(piece)
+                continue
+            chunks.append(TextChunk(
+                content=buffer[offsets[first]:offsets[last] - 1],
+                start_index=offsets[first],
+                end_index=offsets[last] - 1,
+                token_count=prefix[last] - prefix[first],
+                chunk_id=len(chunks),
+                start_time=start_time,
+                end_time=end_time
+            ))
         
         return chunks
     
-    def _adjust_chunk_boundary(self, text: str) -> str:
+    def _pack_units(self, units: List[str]) -> Tuple[List[int], List[Tuple[int, int]]]:
         """
-        Adjust chunk boundary to end at a sentence or at least a word boundary.
+        Pack consecutive text units (sentences or cues) into chunk ranges.
+        
+        Every unit is tokenized once, in a threaded batch, and ranges are
+        packed from running sums of the unit counts. Each range after the
+        first starts with the trailing whole units of the previous range that
+        fit in overlap_size tokens. A unit over chunk_size gets a range of its
+        own for the caller to split.
         
         Args:
-            text: Text to adjust
+            units: Texts that are joined with single spaces
             
         Returns:
-            Adjusted text
+            Tuple of (prefix sums of unit token counts, list of (first, last) unit ranges)
         """
-        # Try to find the last sentence ending
-        import re
-        sentence_endings = ['.', '!', '?']
-        
-        for i in range(len(text) - 1, -1, -1):
-            if text[i] in sentence_endings and i < len(text) - 1:
-                # Found a sentence ending, include it and any following whitespace
-                end_index = i + 1
-                while end_index < len(text) and text[end_index].isspace():
-                    end_index += 1
-                return text[:end_index]
-        
-        # If no sentence ending found, try to break at word boundary
-        words = text.split()
-        if len(words) > 1:
-            return ' '.join(words[:-1])
-        
-        return text
+        # Units are joined with spaces, so count each one with its leading space
+        encoded = self.tokenizer.encode_batch([" " + unit for unit in units], num_threads=ENCODE_THREADS)
+        prefix = list(itertools.accumulate((len(tokens) for tokens in encoded), initial=0))
+        
+        ranges = []
+        first = None
+        for index in range(len(units)):
+            if prefix[index + 1] - prefix[index] > self.chunk_size:
+                if first is not None:
+                    ranges.append((first, index))
+                    first = None
+                ranges.append((index, index + 1))
+                continue
+            
+            if first is None:
+                first = index
+            elif prefix[index + 1] - prefix[first] > self.chunk_size:
+                ranges.append((first, index))
+                # Start the next range with the trailing units that fit in the overlap
+                first = bisect.bisect_left(prefix, prefix[index] - self.overlap_size, first + 1, index)
+                # Drop overlap units until the next unit fits
+                first = bisect.bisect_left(prefix, prefix[index + 1] - self.chunk_size, first, index)
+        
+        if first is not None:
+            ranges.append((first, len(units)))
+        
+        return prefix, ranges
     
-    def _get_overlap_text(self, text: str) -> str:
+    def _split_sentences(self, text: str) -> Tuple[List[str], List[int], List[int]]:
         """
-        Get overlap text from the end of a chunk.
+        Split text into stripped sentences with their character spans.
         
         Args:
-            text: Source text
+            text: Input text
             
         Returns:
-            Overlap text
+            Tuple of (sentences, start indices, end indices)
         """
-        tokens = self.tokenizer.encode(text)
-        if len(tokens) <= self.overlap_size:
-            return text
+        sentences = []
+        starts = []
+        ends = []
+        previous = 0
+        boundaries = [m.end() for m in SENTENCE_END_PATTERN.finditer(text)]
+        boundaries.append(len(text))
+        for boundary in boundaries:
+            raw = text[previous:boundary]
+            sentence = raw.strip()
+            if sentence:
+                start = previous + len(raw) - len(raw.lstrip())
+                sentences.append(sentence)
+                starts.append(start)
+                ends.append(start + len(sentence))
+            previous = boundary
+        return sentences, starts, ends
+    
+    def _token_offsets(self, tokens: List[int]) -> List[int]:
+        """
+        Map each token to the character index where it starts.
         
-        overlap_tokens = tokens[-self.overlap_size:]
-        return self.tokenizer.decode(overlap_tokens)
+        Args:
+            tokens: Tokens of the full text
+            
+        Returns:
+            Character index of every token
+        """
+        _, offsets = self.tokenizer.decode_with_offsets(tokens)
+        return offsets
     
-    def _get_char_index(self, full_text: str, token_index: int, all_tokens: List[int]) -> int:
+    def _token_breaks(self, char_positions: Iterable[int], offsets: List[int]) -> List[int]:
         """
-        Convert token index to character index in the original text.
+        Convert ascending character positions into the token indices starting there.
+        
+        A position falling inside a token moves forward to the next token start.
+        Both inputs are sorted, so this is a single merge pass.
         
         Args:
-            full_text: Original full text
-            token_index: Token index
-            all_tokens: All tokens from the text
+            char_positions: Ascending character positions of candidate breaks
+            offsets: Character index of every token, ending with the text length
             
         Returns:
-            Character index
+            Ascending, de-duplicated token indices
         """
-        if token_index >= len(all_tokens):
-            return len(full_text)
+        breaks = []
+        token = 0
+        last = len(offsets) - 1
+        for position in char_positions:
+            while token < last and offsets[token] < position:
+                token += 1
+            if token >= last:
+                break
+            if not breaks or breaks[-1] != token:
+                breaks.append(token)
+        return breaks
+    
+    def _last_break(self, breaks: List[int], start_token: int, end_token: int) -> Optional[int]:
+        """
+        Find the last break in (start_token, end_token].
         
-        # This is an approximation - more accurate methods would require
-        # maintaining a mapping during tokenization
-        char_ratio = len(full_text) / len(all_tokens)
-        return min(int(token_index * char_ratio), len(full_text))
+        Args:
+            breaks: Ascending token indices of candidate breaks
+            start_token: First token of the chunk
+            end_token: Largest allowed end token
+            
+        Returns:
+            Token index of the break, or None if there is none in range
+        """
+        position = bisect.bisect_right(breaks, end_token) - 1
+        if position >= 0 and breaks[position] > start_token:
+            return breaks[position]
+        return None
     
     def get_chunk_stats(self, chunks: List[TextChunk]) -> Dict[str, Any]:
         """
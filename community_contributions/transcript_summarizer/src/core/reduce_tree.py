@@ -0,0 +1,123 @@
+import time
+import logging
+from dataclasses import dataclass
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Tokens taken by the "\n\n" that joins two summaries in a prompt
+SEPARATOR_TOKENS = 2
+
+@dataclass
+class ReduceLevel:
+    """Timing and size of one level of the reduce tree."""
+    level: int
+    inputs: int
+    outputs: int
+    input_tokens: int
+    max_fan_in: int
+    seconds: float
+
+def input_budget(context_window: int, prompt_tokens: int, output_reserve: int) -> int:
+    """
+    Tokens of summary text that fit in one reduce prompt.
+
+    Args:
+        context_window: Model context size in tokens
+        prompt_tokens: Tokens used by the prompt template around the summaries
+        output_reserve: Tokens kept free for the model's answer
+
+    Returns:
+        Input budget in tokens (at least 1)
+    """
+    return max(1, context_window - prompt_tokens - output_reserve)
+
+def plan_batches(token_counts: List[int], budget: int) -> List[List[int]]:
+    """
+    Group consecutive summaries into batches that fit the token budget.
+
+    Order is preserved so every batch covers a contiguous stretch of the
+    transcript. A summary larger than the budget gets a batch of its own.
+
+    Args:
+        token_counts: Token count of each summary
+        budget: Maximum tokens of summary text per batch
+
+    Returns:
+        List of batches, each a list of summary indices
+    """
+    batches = []
+    current = []
+    current_tokens = 0
+    for index, tokens in enumerate(token_counts):
+        needed = tokens + (SEPARATOR_TOKENS if current else 0)
+        if current and current_tokens + needed > budget:
+            batches.append(current)
+            current = []
+            current_tokens = 0
+            needed = tokens
+        current.append(index)
+        current_tokens += needed
+    if current:
+        batches.append(current)
+    return batches
+
+def total_tokens(token_counts: List[int]) -> int:
+    """Tokens of the summaries once joined into one prompt."""
+    return sum(token_counts) + SEPARATOR_TOKENS * max(0, len(token_counts) - 1)
+
+async def reduce_tree(
+    summaries: List[str],
+    count_tokens: Callable[[str], int],
+    reduce_batches: Callable[[List[List[str]], int], Awaitable[List[str]]],
+    budget: int,
+    on_level: Optional[Callable[[ReduceLevel], None]] = None,
+) -> Tuple[List[str], List[ReduceLevel]]:
+    """
+    Reduce summaries level by level until they fit in one prompt.
+
+    Each level packs the summaries into token-budgeted batches and reduces
+    all batches of the level in one call to reduce_batches, which is expected
+    to run them concurrently. The fan-in of a level is therefore set by how
+    many summaries fit in the model's context rather than a fixed number.
+
+    Args:
+        summaries: Summaries to reduce, in transcript order
+        count_tokens: Function returning the token count of a text
+        reduce_batches: Coroutine taking (batches of summaries, level) and returning one summary per batch
+        budget: Maximum tokens of summary text per prompt
+        on_level: Optional callback called with each finished level
+
+    Returns:
+        Tuple of (summaries that fit in one prompt, per-level statistics)
+    """
+    levels = []
+    token_counts = [count_tokens(summary) for summary in summaries]
+    while len(summaries) > 1 and total_tokens(token_counts) > budget:
+        batches = plan_batches(token_counts, budget)
+        if len(batches) == len(summaries):
+            # Every summary is too big to share a batch; pair them up so the tree still shrinks
+            logger.warning("Summaries exceed the reduce budget on their own, merging them in pairs")
+            batches = [list(range(i, min(i + 2, len(summaries)))) for i in range(0, len(summaries), 2)]
+
+        started = time.time()
+        reduced = await reduce_batches([[summaries[i] for i in batch] for batch in batches], len(levels) + 1)
+        level = ReduceLevel(
+            level=len(levels) + 1,
+            inputs=len(summaries),
+            outputs=len(reduced),
+            input_tokens=total_tokens(token_counts),
+            max_fan_in=max(len(batch) for batch in batches),
+            seconds=time.time() - started,
+        )
+        levels.append(level)
+        logger.info(f"Reduce level {level.level}: {level.inputs} -> {level.outputs} summaries in {level.seconds:.2f}s")
+        if on_level:
+            on_level(level)
+
+        summaries = reduced
+        token_counts = [count_tokens(summary) for summary in summaries]
+
+    if total_tokens(token_counts) > budget:
+        logger.warning(f"Final reduce input is {total_tokens(token_counts)} tokens, over the budget of {budget}")
+    return summaries, levels
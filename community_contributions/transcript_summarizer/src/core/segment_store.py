@@ -0,0 +1,214 @@
+import bisect
+import sys
+from array import array
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+@dataclass
+class TranscriptSegment:
+    """Represents a segment of transcript with timing information."""
+    start_time: str
+    end_time: str
+    text: str
+
+def parse_timestamp(timestamp: str) -> float:
+    """
+    Convert a VTT timestamp to seconds.
+
+    Args:
+        timestamp: Time in HH:MM:SS.mmm or MM:SS.mmm format
+
+    Returns:
+        Time in seconds
+    """
+    parts = timestamp.split(':')
+    if len(parts) == 3:  # HH:MM:SS.mmm
+        hours, minutes, seconds = parts
+        return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+    elif len(parts) == 2:  # MM:SS.mmm
+        minutes, seconds = parts
+        return int(minutes) * 60 + float(seconds)
+    return float(parts[0])
+
+def format_timestamp(seconds: float) -> str:
+    """
+    Format seconds as a VTT timestamp.
+
+    Args:
+        seconds: Time in seconds
+
+    Returns:
+        Time in HH:MM:SS.mmm format
+    """
+    milliseconds = round(seconds * 1000)
+    hours, milliseconds = divmod(milliseconds, 3600000)
+    minutes, milliseconds = divmod(milliseconds, 60000)
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}.{milliseconds:03d}"
+
+class SegmentStore:
+    """
+    Columnar storage for transcript segments.
+
+    Start and end times are kept in float arrays and all segment text in one
+    string, with segments separated by a single space so the full transcript
+    is the buffer itself. Segment i spans buffer[offsets[i]:offsets[i + 1] - 1].
+    Segments must be appended in start time order, which lets time ranges be
+    found by bisection.
+    """
+
+    def __init__(self):
+        self.starts = array('d')
+        self.ends = array('d')
+        self.offsets = array('q', [0])
+        self._buffer = ""
+        self._pending: List[str] = []
+
+    @classmethod
+    def from_cues(cls, cues: Iterable[Tuple[float, float, str]]) -> "SegmentStore":
+        """
+        Build a store from (start seconds, end seconds, text) tuples.
+
+        Cues are expected in start time order; if they are not, all of them
+        are sorted by start time once.
+
+        Args:
+            cues: Iterable of cue tuples
+
+        Returns:
+            SegmentStore holding the cues
+        """
+        store = cls()
+        cues = iter(cues)
+        for cue in cues:
+            if store.starts and cue[0] < store.starts[-1]:
+                collected = [(store.starts[i], store.ends[i], store.text(i)) for i in range(len(store))]
+                collected.append(cue)
+                collected.extend(cues)
+                collected.sort(key=lambda item: item[0])
+                return cls.from_cues(collected)
+            store.append(*cue)
+        store.compact()
+        return store
+
+    def append(self, start_seconds: float, end_seconds: float, text: str):
+        """
+        Add a segment after the existing ones.
+
+        Args:
+            start_seconds: Segment start time
+            end_seconds: Segment end time
+            text: Cleaned segment text
+        """
+        if self.starts and start_seconds < self.starts[-1]:
+            raise ValueError(f"Segment starting at {start_seconds}s is out of order")
+        self.starts.append(start_seconds)
+        self.ends.append(end_seconds)
+        self.offsets.append(self.offsets[-1] + len(text) + 1)
+        self._pending.append(text)
+
+    def compact(self):
+        """Join text appended since the last read into the buffer."""
+        if self._pending:
+            parts = [self._buffer] if self._buffer else []
+            parts.extend(self._pending)
+            self._buffer = " ".join(parts)
+            self._pending = []
+
+    @property
+    def buffer(self) -> str:
+        """All segment text joined with single spaces."""
+        self.compact()
+        return self._buffer
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, index: int) -> TranscriptSegment:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("segment index out of range")
+        return TranscriptSegment(
+            start_time=format_timestamp(self.starts[index]),
+            end_time=format_timestamp(self.ends[index]),
+            text=self.text(index)
+        )
+
+    def __iter__(self) -> Iterator[TranscriptSegment]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def text(self, index: int) -> str:
+        """Text of one segment."""
+        return self.buffer[self.offsets[index]:self.offsets[index + 1] - 1]
+
+    def full_text(self) -> str:
+        """Text of all segments joined with single spaces."""
+        return self.buffer
+
+    def duration_seconds(self) -> float:
+        """Time from the first segment start to the last segment end."""
+        if not self.starts:
+            return 0.0
+        return self.ends[-1] - self.starts[0]
+
+    def index_range(self, start_seconds: Optional[float] = None, end_seconds: Optional[float] = None) -> Tuple[int, int]:
+        """
+        Find the segments starting within a time range.
+
+        Args:
+            start_seconds: Range start (inclusive); None for the beginning
+            end_seconds: Range end (exclusive); None for the end
+
+        Returns:
+            Tuple of (first index, index after the last)
+        """
+        first = 0 if start_seconds is None else bisect.bisect_left(self.starts, start_seconds)
+        last = len(self) if end_seconds is None else bisect.bisect_left(self.starts, end_seconds)
+        return first, max(first, last)
+
+    def text_between(self, start_seconds: Optional[float] = None, end_seconds: Optional[float] = None) -> str:
+        """
+        Text of the segments starting within a time range.
+
+        Args:
+            start_seconds: Range start (inclusive); None for the beginning
+            end_seconds: Range end (exclusive); None for the end
+
+        Returns:
+            Segment text joined with single spaces
+        """
+        first, last = self.index_range(start_seconds, end_seconds)
+        if first == last:
+            return ""
+        return self.buffer[self.offsets[first]:self.offsets[last] - 1]
+
+    def slice(self, start_seconds: Optional[float] = None, end_seconds: Optional[float] = None) -> "SegmentStore":
+        """
+        Copy the segments starting within a time range into a new store.
+
+        Args:
+            start_seconds: Range start (inclusive); None for the beginning
+            end_seconds: Range end (exclusive); None for the end
+
+        Returns:
+            SegmentStore holding the segments in range
+        """
+        first, last = self.index_range(start_seconds, end_seconds)
+        if first == 0 and last == len(self):
+            return self
+        store = SegmentStore()
+        if first == last:
+            return store
+        base = self.offsets[first]
+        store.starts = self.starts[first:last]
+        store.ends = self.ends[first:last]
+        store.offsets = array('q', (offset - base for offset in self.offsets[first:last + 1]))
+        store._buffer = self.buffer[base:self.offsets[last] - 1]
+        return store
+
+    def memory_bytes(self) -> int:
+        """Approximate memory held by the store."""
+        arrays = sum(column.itemsize * len(column) for column in (self.starts, self.ends, self.offsets))
+        return arrays + sys.getsizeof(self.buffer)
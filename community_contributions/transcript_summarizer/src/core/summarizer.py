@@ -1,18 +1,29 @@
 import asyncio
+import contextlib
 import logging
-from typing import List, Dict, Any, Optional, TypedDict
-from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, TypedDict, AsyncIterator
+from dataclasses import dataclass, asdict, field
 import time
-from concurrent.futures import ThreadPoolExecutor
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 
 from langchain_core.documents import Document
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langgraph.graph import StateGraph, START, END
+from langgraph.types import StreamWriter
 
 from ..core.vtt_parser import VTTParser, TranscriptSegment
 from ..core.chunker import TextChunker, TextChunk
+from ..core.segment_store import SegmentStore, format_timestamp
+from ..core.reduce_tree import ReduceLevel, input_budget, reduce_tree
+from ..core.summary_cache import SummaryCache, cache_key
 from ..services.ollama_service import OllamaService, OllamaResponse
 from ..services.gemini_service import GeminiService, GeminiResponse
+from ..services.request_scheduler import RequestScheduler, SchedulerStats
+from ..services.model_residency import ModelResidency, context_size
+from ..services.hedging import HedgedService
+from ..services.http_pool import PoolLimits, configure_pool
+from ..core.telemetry import RunTelemetry, export_telemetry
 from ..utils.config import Config
 
 # Set up logging for debugging using config
@@ -21,6 +32,15 @@ log_level = getattr(logging, config_instance.log_level.upper(), logging.INFO)
 logging.basicConfig(level=log_level)
 logger = logging.getLogger(__name__)
 
+# Bump whenever _create_chunk_summary_prompt changes, so cached chunk summaries are not reused
+PROMPT_VERSION = 1
+
+# Output budget for the final summary, matching what the synchronous Gemini call allowed
+FINAL_SUMMARY_MAX_TOKENS = 5000
+
+# Context reserved for a chunk summary, as a fraction of the chunk size
+CHUNK_SUMMARY_RESERVE = 0.5
+
 class SummarizationState(TypedDict):
     """State for the summarization workflow."""
     original_text: str
@@ -31,6 +51,26 @@ class SummarizationState(TypedDict):
     error: Optional[str]
     # Add configuration tracking
     debug_config: Optional[Dict[str, Any]]
+    # Stream the final summary token by token
+    stream: Optional[bool]
+    # Parsed cues of original_text; when set, chunks follow cue boundaries
+    segments: Optional[SegmentStore]
+    # Per-request token counts and latencies of this run
+    telemetry: Optional[RunTelemetry]
+    # Scheduler counters when the run started; the scheduler is shared by every run of this summarizer
+    scheduler_start: Optional[SchedulerStats]
+    # Chunking, temperature and context settings of this run
+    settings: Optional["RunSettings"]
+
+@dataclass
+class RunSettings:
+    """Settings one run is made with; runs may overlap, so they are never written back to the shared config or chunker."""
+    chunk_size: int
+    chunk_overlap: int
+    temperature: float
+    chunker: TextChunker
+    # Ollama context length the run's prompts need
+    num_ctx: int
 
 @dataclass
 class SummarizationResult:
@@ -41,8 +81,29 @@ class SummarizationResult:
     chunks_processed: int
     processing_time: float
     compression_ratio: float
+    cache_hit_ratio: float = 0.0
+    # Chunk summaries with the time range each covers, for cue-aligned chunks
+    chunk_timeline: List[Dict[str, Any]] = field(default_factory=list)
+    # Seconds the backend spent loading the model versus evaluating prompts and generating
+    model_load_time: float = 0.0
+    model_eval_time: float = 0.0
+    # RunTelemetry.to_dict(): aggregate throughput and latency figures plus one entry per LLM request
+    telemetry: Dict[str, Any] = field(default_factory=dict)
+    # HedgedService.latency_report() when a second backend is configured; counts since startup
+    hedging: Dict[str, Any] = field(default_factory=dict)
     error: Optional[str] = None
 
+@dataclass
+class ProgressEvent:
+    """Progress update emitted while a summary is being produced."""
+    kind: str  # "chunks_ready", "chunk_done", "reduce_level_done", "summary_delta" or "done"
+    chunk_index: Optional[int] = None
+    total_chunks: Optional[int] = None
+    level: Optional[int] = None
+    delta: str = ""
+    partial_summary: str = ""
+    result: Optional[SummarizationResult] = None
+
 class TranscriptSummarizer:
     """Main summarizer class using LangGraph for workflow orchestration."""
     
@@ -63,13 +124,45 @@ class TranscriptSummarizer:
         logger.info(f"📊 Initial Config - Ollama Model: {config.ollama_model_name}")
         logger.info(f"📊 Initial Config - Gemini Model: {config.gemini_model_name}")
         
-        self.llm_service = self._initialize_llm_service(config)
+        # Connection pool shared by every HTTP request to the LLM backends
+        configure_pool(PoolLimits(
+            max_connections=config.http_max_connections,
+            max_connections_per_host=config.http_max_connections_per_host,
+            keepalive_timeout=config.http_keepalive_seconds
+        ))
+        # Shared by every request to the LLM backend
+        self.scheduler = RequestScheduler(
+            max_concurrency=config.max_concurrent_requests,
+            max_retries=config.max_retries
+        )
+        primary_service = self._initialize_llm_service(config)
+        self.llm_service = primary_service
+        secondary_service = self._initialize_hedge_service(config)
+        if secondary_service is not None:
+            self.llm_service = HedgedService(
+                primary_service,
+                secondary_service,
+                percentile=config.hedge_percentile,
+                max_hedge_ratio=config.hedge_max_ratio
+            )
         self.chunker = TextChunker(
             chunk_size=config.chunk_size,
             overlap_size=config.chunk_overlap
         )
         self.vtt_parser = VTTParser()
+        # Ollama only: keep the model loaded across runs, with a context sized for the prompts we send
+        self.residency = None
+        if isinstance(primary_service, OllamaService):
+            self.residency = ModelResidency(primary_service, keep_alive=config.ollama_keep_alive, num_ctx=self._context_size(config.chunk_size))
+        self.summary_cache = None
+        if config.summary_cache_max_mb > 0:
+            self.summary_cache = SummaryCache(config.summary_cache_path, max_bytes=config.summary_cache_max_mb * 1024 * 1024)
         self.workflow = self._create_workflow()
+        # Last health check, refreshed in the background once older than health_cache_seconds
+        self._health: Optional[Dict[str, Any]] = None
+        self._health_lock = threading.Lock()
+        # Check in progress, shared by every caller that wants a fresh result meanwhile
+        self._health_refresh: Optional[Future] = None
     
     def _initialize_llm_service(self, config: Config):
         """Initialize the appropriate LLM service based on configuration."""
@@ -78,7 +171,8 @@ class TranscriptSummarizer:
             return OllamaService(
                 base_url=config.ollama_base_url,
                 model=config.ollama_model_name,
-                timeout=config.request_timeout
+                timeout=config.request_timeout,
+                scheduler=self.scheduler
             )
         elif config.llm_provider == "gemini":
             if not config.gemini_api_key:
@@ -87,14 +181,55 @@ class TranscriptSummarizer:
             return GeminiService(
                 api_key=config.gemini_api_key,
                 model=config.gemini_model_name,
-                timeout=config.request_timeout
+                timeout=config.request_timeout,
+                scheduler=self.scheduler,
+                requests_per_minute=config.gemini_requests_per_minute,
+                tokens_per_minute=config.gemini_tokens_per_minute,
+                # Resolved per call: the chunker is created after the service
+                count_tokens=lambda text: self._count_tokens(text)
             )
         else:
             raise ValueError(f"Unsupported LLM provider: {config.llm_provider}")
 
+    def _initialize_hedge_service(self, config: Config):
+        """Initialize the second backend used for hedged and failed-over requests, if one is configured."""
+        if not config.hedge_backend:
+            return None
+        if config.hedge_backend == "ollama":
+            base_url = config.hedge_ollama_base_url or config.ollama_base_url
+            if config.llm_provider == "ollama" and base_url.rstrip('/') == config.ollama_base_url.rstrip('/'):
+                raise ValueError("HEDGE_OLLAMA_BASE_URL must point to a different Ollama host than OLLAMA_BASE_URL.")
+            logger.info(f"Initializing hedge OllamaService with base_url={base_url}, model={config.ollama_model_name}")
+            # Its own scheduler: the second host has its own capacity
+            return OllamaService(
+                base_url=base_url,
+                model=config.ollama_model_name,
+                timeout=config.request_timeout,
+                scheduler=RequestScheduler(max_concurrency=config.max_concurrent_requests, max_retries=0)
+            )
+        elif config.hedge_backend == "gemini":
+            if config.llm_provider == "gemini":
+                raise ValueError("HEDGE_BACKEND must differ from LLM_PROVIDER.")
+            if not config.gemini_api_key:
+                raise ValueError("GEMINI_API_KEY must be set in .env for the Gemini hedge backend.")
+            logger.info(f"Initializing hedge GeminiService with model={config.gemini_model_name}")
+            return GeminiService(
+                api_key=config.gemini_api_key,
+                model=config.gemini_model_name,
+                timeout=config.request_timeout,
+                scheduler=RequestScheduler(max_concurrency=config.max_concurrent_requests, max_retries=0),
+                requests_per_minute=config.gemini_requests_per_minute,
+                tokens_per_minute=config.gemini_tokens_per_minute,
+                count_tokens=lambda text: self._count_tokens(text)
+            )
+        else:
+            raise ValueError(f"Unsupported hedge backend: {config.hedge_backend}")
+
     def update_config(self, chunk_size: int, chunk_overlap: int, temperature: float):
         """
-        Update configuration and recreate necessary components.
+        Update the default configuration for later runs and recreate necessary components.
+        
+        Runs already started keep their own settings; see RunSettings.
         
         Args:
             chunk_size: New chunk size
@@ -142,10 +277,11 @@ class TranscriptSummarizer:
             }
             
             # Add debug config to state
+            settings = state["settings"]
             debug_config = {
-                "temperature": self.config.temperature,
-                "chunk_size": self.config.chunk_size,
-                "chunk_overlap": self.config.chunk_overlap,
+                "temperature": settings.temperature,
+                "chunk_size": settings.chunk_size,
+                "chunk_overlap": settings.chunk_overlap,
                 "llm_provider": self.config.llm_provider,
                 "model_name": self.config.ollama_model_name if self.config.llm_provider == "ollama" else self.config.gemini_model_name
             }
@@ -154,7 +290,7 @@ class TranscriptSummarizer:
             
             return {**state, "processing_stats": processing_stats, "debug_config": debug_config}
         
-        def chunk_text(state: SummarizationState) -> SummarizationState:
+        def chunk_text(state: SummarizationState, writer: StreamWriter) -> SummarizationState:
             """Chunk the text for processing."""
             logger.info("✂️ WORKFLOW DEBUG: Starting chunk_text node")
             debug_config = state.get("debug_config", {})
@@ -165,10 +301,21 @@ class TranscriptSummarizer:
             
             try:
                 # Log current chunker configuration
-                logger.info(f"🔧 CHUNKER DEBUG: Chunker configured with size={self.chunker.chunk_size}, overlap={self.chunker.overlap_size}")
+                chunker = state["settings"].chunker
+                logger.info(f"🔧 CHUNKER DEBUG: Chunker configured with size={chunker.chunk_size}, overlap={chunker.overlap_size}")
                 
-                chunks = self.chunker.chunk_by_sentences(state["original_text"])
-                logger.info(f"📊 CHUNKER DEBUG: Created {len(chunks)} chunks")
+                segments = state.get("segments")
+                if state.get("chunks"):
+                    # Chunked ahead of time, e.g. in a batch worker process
+                    chunks = state["chunks"]
+                    chunking_strategy = "precomputed"
+                elif segments is not None and len(segments):
+                    chunks = chunker.chunk_segments(segments)
+                    chunking_strategy = "segment-based"
+                else:
+                    chunks = chunker.chunk_by_sentences(state["original_text"])
+                    chunking_strategy = "sentence-based"
+                logger.info(f"📊 CHUNKER DEBUG: Created {len(chunks)} chunks ({chunking_strategy})")
                 
                 # Log chunk details
                 for i, chunk in enumerate(chunks):
@@ -177,9 +324,9 @@ class TranscriptSummarizer:
                 processing_stats = state.get("processing_stats", {})
                 processing_stats.update({
                     "chunks_created": len(chunks),
-                    "chunking_strategy": "sentence-based",
-                    "actual_chunk_size_used": self.chunker.chunk_size,
-                    "actual_overlap_used": self.chunker.overlap_size
+                    "chunking_strategy": chunking_strategy,
+                    "actual_chunk_size_used": chunker.chunk_size,
+                    "actual_overlap_used": chunker.overlap_size
                 })
                 
                 # If only one chunk, we might not need chunk-level summarization
@@ -187,13 +334,15 @@ class TranscriptSummarizer:
                     processing_stats["single_chunk"] = True
                     logger.info("📝 CHUNKER DEBUG: Single chunk detected, will skip chunk summarization")
                 
+                writer(ProgressEvent(kind="chunks_ready", total_chunks=len(chunks)))
+                
                 return {**state, "chunks": chunks, "processing_stats": processing_stats}
                 
             except Exception as e:
                 logger.error(f"❌ CHUNKER DEBUG: Error in chunking - {str(e)}")
                 return {**state, "error": f"Error chunking text: {str(e)}"}
         
-        async def summarize_chunks(state: SummarizationState) -> SummarizationState:
+        async def summarize_chunks(state: SummarizationState, writer: StreamWriter) -> SummarizationState:
             """Summarize individual chunks."""
             logger.info("📝 WORKFLOW DEBUG: Starting summarize_chunks node")
             debug_config = state.get("debug_config", {})
@@ -204,24 +353,48 @@ class TranscriptSummarizer:
             
             try:
                 chunks = state["chunks"]
+                temperature = state["settings"].temperature
                 
                 # If only one chunk, skip chunk summarization
                 if len(chunks) == 1:
                     logger.info("📝 CHUNK SUMMARY DEBUG: Single chunk, using original content")
                     return {**state, "chunk_summaries": [chunks[0].content]}
                 
-                # Create prompts for each chunk
+                # Reuse cached summaries; only chunks not yet summarized with these settings go to the LLM
+                keys = [self._chunk_cache_key(chunk.content, temperature) for chunk in chunks]
+                chunk_summaries = [self.summary_cache.get(key) if self.summary_cache is not None else None for key in keys]
+                missing = [i for i, summary in enumerate(chunk_summaries) if summary is None]
+                cache_hits = len(chunks) - len(missing)
+                logger.info(f"💾 CACHE DEBUG: {cache_hits} of {len(chunks)} chunk summaries found in cache")
+                for i, summary in enumerate(chunk_summaries):
+                    if summary is not None:
+                        writer(ProgressEvent(kind="chunk_done", chunk_index=i + 1, total_chunks=len(chunks)))
+                
+                # Create prompts for each uncached chunk
                 chunk_prompts = []
-                for i, chunk in enumerate(chunks):
-                    prompt = self._create_chunk_summary_prompt(chunk.content, i + 1, len(chunks))
+                for i in missing:
+                    prompt = self._create_chunk_summary_prompt(chunks[i].content, i + 1, len(chunks))
                     chunk_prompts.append(prompt)
                     logger.info(f"📄 PROMPT DEBUG: Created prompt for chunk {i+1}, prompt length: {len(prompt)} chars")
                 
                 # Log temperature being used
-                logger.info(f"🌡️ TEMPERATURE DEBUG: About to call LLM service with temperature={self.config.temperature}")
+                logger.info(f"🌡️ TEMPERATURE DEBUG: About to call LLM service with temperature={temperature}")
+                
+                # Process chunks asynchronously, reporting each one as it finishes
+                responses = {}
+                def report_chunk(index: int, response):
+                    responses[missing[index]] = response
+                    writer(ProgressEvent(kind="chunk_done", chunk_index=missing[index] + 1, total_chunks=len(chunks)))
                 
-                # Process chunks asynchronously
-                chunk_summaries = await self._process_chunks_async(chunk_prompts)
+                new_summaries = await self._process_chunks_async(
+                    chunk_prompts, temperature, on_complete=report_chunk, telemetry=state.get("telemetry"), stage="chunk",
+                    numbers=[i + 1 for i in missing]
+                ) if chunk_prompts else []
+                for i, summary in zip(missing, new_summaries):
+                    chunk_summaries[i] = summary
+                    if self.summary_cache is not None and summary:
+                        # A hedge or failover may have answered from another model; file it under that model
+                        self.summary_cache.put(self._chunk_cache_key(chunks[i].content, temperature, responses[i]), summary)
                 
                 # Log results
                 for i, summary in enumerate(chunk_summaries):
@@ -229,7 +402,24 @@ class TranscriptSummarizer:
                 
                 processing_stats = state.get("processing_stats", {})
                 processing_stats["chunks_summarized"] = len(chunk_summaries)
-                processing_stats["temperature_used"] = self.config.temperature
+                processing_stats["temperature_used"] = temperature
+                rate_limiter = getattr(self.llm_service, "rate_limiter", None)
+                if rate_limiter is not None:
+                    processing_stats["rate_limiter"] = rate_limiter.stats.to_dict()
+                if isinstance(self.llm_service, HedgedService):
+                    processing_stats["hedging"] = self.llm_service.latency_report()
+                processing_stats["cache_hits"] = cache_hits
+                processing_stats["cache_misses"] = len(missing)
+                if chunks[0].start_time is not None:
+                    processing_stats["chunk_timeline"] = [
+                        {
+                            "chunk": i + 1,
+                            "start_time": format_timestamp(chunk.start_time),
+                            "end_time": format_timestamp(chunk.end_time),
+                            "summary": summary
+                        }
+                        for i, (chunk, summary) in enumerate(zip(chunks, chunk_summaries))
+                    ]
                 
                 return {**state, "chunk_summaries": chunk_summaries, "processing_stats": processing_stats}
                 
@@ -237,7 +427,7 @@ class TranscriptSummarizer:
                 logger.error(f"❌ CHUNK SUMMARY DEBUG: Error in chunk summarization - {str(e)}")
                 return {**state, "error": f"Error summarizing chunks: {str(e)}"}
         
-        def create_final_summary(state: SummarizationState) -> SummarizationState:
+        async def create_final_summary(state: SummarizationState, writer: StreamWriter) -> SummarizationState:
             """Create the final summary from chunk summaries."""
             logger.info("🎯 WORKFLOW DEBUG: Starting create_final_summary node")
             debug_config = state.get("debug_config", {})
@@ -247,8 +437,23 @@ class TranscriptSummarizer:
                 return state
             
             try:
-                # Combine chunk summaries
-                combined_summaries = "\n\n".join(state["chunk_summaries"])
+                # Merge chunk summaries level by level until they fit in one prompt
+                def report_level(level: ReduceLevel):
+                    writer(ProgressEvent(kind="reduce_level_done", level=level.level, total_chunks=level.outputs))
+                
+                telemetry = state.get("telemetry")
+                temperature = state["settings"].temperature
+                summaries, reduce_levels = await reduce_tree(
+                    state["chunk_summaries"],
+                    count_tokens=self._count_tokens,
+                    reduce_batches=lambda batches, level: self._reduce_batches(batches, level, temperature, telemetry),
+                    budget=self._reduce_budget(),
+                    on_level=report_level
+                )
+                logger.info(f"🌳 REDUCE DEBUG: {len(reduce_levels)} intermediate reduce levels, {len(summaries)} summaries left")
+                
+                # Combine the remaining summaries
+                combined_summaries = "\n\n".join(summaries)
                 logger.info(f"📄 FINAL SUMMARY DEBUG: Combined summaries length: {len(combined_summaries)} chars")
                 
                 # Create final summary prompt
@@ -256,15 +461,15 @@ class TranscriptSummarizer:
                 logger.info(f"📄 FINAL PROMPT DEBUG: Final prompt length: {len(final_prompt)} chars")
                 
                 # Log temperature being used
-                logger.info(f"🌡️ FINAL TEMPERATURE DEBUG: About to call LLM service with temperature={self.config.temperature}")
-                
-                # Generate final summary
-                response = self.llm_service.generate_sync(
-                    prompt=final_prompt,
-                    temperature=self.config.temperature,
-                )
+                logger.info(f"🌡️ FINAL TEMPERATURE DEBUG: About to call LLM service with temperature={temperature}")
                 
-                final_summary = response.content.strip()
+                # Generate final summary on the async path, through the same session and scheduler as the chunks
+                final_started = time.time()
+                if state.get("stream"):
+                    final_summary = await self._stream_final_summary(final_prompt, writer, temperature, telemetry)
+                else:
+                    final_summary = await self._generate_final_summary(final_prompt, temperature, telemetry)
+                final_seconds = time.time() - final_started
                 logger.info(f"📄 FINAL RESULT DEBUG: Final summary length: {len(final_summary)} chars")
                 logger.info(f"📄 FINAL RESULT DEBUG: First 200 chars: {final_summary}...")
                 
@@ -279,8 +484,16 @@ class TranscriptSummarizer:
                     "final_summary_length": len(final_summary),
                     "final_summary_words": len(final_summary.split()),
                     "compression_ratio": len(state["original_text"]) / len(final_summary) if final_summary else 0,
-                    "final_temperature_used": self.config.temperature
+                    "final_temperature_used": temperature,
+                    "reduce_levels": [asdict(level) for level in reduce_levels],
+                    "final_reduce_time": final_seconds,
+                    "scheduler": self.scheduler.stats.since(state["scheduler_start"])
                 })
+                if telemetry is not None:
+                    telemetry.finish()
+                    timings = telemetry.model_timings
+                    if timings.cold_loads:
+                        logger.warning(f"🧊 RESIDENCY DEBUG: {timings.cold_loads} requests waited {timings.load_seconds:.1f}s for the model to load")
                 
                 logger.info(f"⏱️ TIMING DEBUG: Total processing time: {processing_time:.2f} seconds")
                 logger.info(f"📊 COMPRESSION DEBUG: Compression ratio: {processing_stats['compression_ratio']:.2f}x")
@@ -309,21 +522,117 @@ class TranscriptSummarizer:
         
         return workflow.compile()
     
-    async def _process_chunks_async(self, prompts: List[str]) -> List[str]:
-        """Process multiple chunk prompts asynchronously."""
+    async def _process_chunks_async(self, prompts: List[str], temperature: float, on_complete=None, telemetry: Optional[RunTelemetry] = None,
+                                    stage: str = "chunk", numbers: Optional[List[int]] = None) -> List[str]:
+        """Process multiple prompts asynchronously, recording each request under stage and its number (default: position + 1)."""
         logger.info(f"🔄 ASYNC DEBUG: Processing {len(prompts)} chunks asynchronously")
-        logger.info(f"🌡️ ASYNC TEMPERATURE DEBUG: Using temperature={self.config.temperature}")
+        logger.info(f"🌡️ ASYNC TEMPERATURE DEBUG: Using temperature={temperature}")
         
         async with self.llm_service:
             responses = await self.llm_service.generate_multiple_async(
                 prompts, 
-                temperature=self.config.temperature
+                temperature=temperature,
+                on_complete=on_complete,
+                stage=stage
             )
             
+            if telemetry is not None:
+                for i, response in enumerate(responses):
+                    telemetry.record(stage, numbers[i] if numbers else i + 1, response)
             results = [response.content.strip() for response in responses]
             logger.info(f"✅ ASYNC DEBUG: Completed processing {len(results)} chunks")
             return results
     
+    def _chunk_cache_key(self, chunk_text: str, temperature: float, response: Optional[Any] = None) -> str:
+        """Cache key of a chunk summary at temperature, under the provider and model of response (default: the configured ones)."""
+        if response is None:
+            provider = self.config.llm_provider
+            model = self.config.ollama_model_name if provider == "ollama" else self.config.gemini_model_name
+        else:
+            provider = "gemini" if isinstance(response, GeminiResponse) else "ollama"
+            model = response.model
+        return cache_key(chunk_text, PROMPT_VERSION, provider, model, temperature)
+    
+    def _count_tokens(self, text: str) -> int:
+        """Count tokens with the chunker's tokenizer."""
+        return len(self.chunker.tokenizer.encode(text))
+    
+    def _context_size(self, chunk_size: int) -> int:
+        """
+        Context length to run the model with for chunks of chunk_size tokens.
+
+        Large enough for a full chunk prompt and its summary, and for reduce
+        and final prompts, which are sized to the configured context window.
+        One value is used for every request of a run because Ollama reloads
+        the model whenever num_ctx changes.
+        """
+        chunk_prompt_tokens = chunk_size + self._count_tokens(self._create_chunk_summary_prompt("", 1, 1))
+        return context_size(
+            chunk_prompt_tokens,
+            int(chunk_size * CHUNK_SUMMARY_RESERVE),
+            minimum=self.config.context_window
+        )
+    
+    def _reduce_budget(self) -> int:
+        """Tokens of summary text that fit in one reduce prompt for the configured context window."""
+        template_tokens = max(
+            self._count_tokens(self._create_final_summary_prompt("")),
+            self._count_tokens(self._create_reduce_prompt("", 1, 1))
+        )
+        output_reserve = min(FINAL_SUMMARY_MAX_TOKENS, self.config.context_window // 4)
+        return input_budget(self.config.context_window, template_tokens, output_reserve)
+    
+    async def _reduce_batches(self, batches: List[List[str]], level: int, temperature: float, telemetry: Optional[RunTelemetry] = None) -> List[str]:
+        """Merge each batch of summaries into one, running the batches of a level concurrently."""
+        prompts = [
+            self._create_reduce_prompt("\n\n".join(batch), i + 1, len(batches))
+            for i, batch in enumerate(batches)
+        ]
+        logger.info(f"🌳 REDUCE DEBUG: Level {level}, reducing {sum(len(batch) for batch in batches)} summaries in {len(batches)} batches")
+        return await self._process_chunks_async(prompts, temperature, telemetry=telemetry, stage=f"reduce-{level}")
+    
+    async def _generate_final_summary(self, prompt: str, temperature: float, telemetry: Optional[RunTelemetry] = None) -> str:
+        """Generate the final summary without blocking the event loop."""
+        submitted = time.monotonic()
+        started = submitted
+        
+        def request():
+            nonlocal started
+            started = time.monotonic()
+            return self.llm_service.generate_async(
+                prompt, temperature=temperature, max_output_tokens=FINAL_SUMMARY_MAX_TOKENS
+            )
+        
+        async with self.llm_service:
+            response = await self.scheduler.run(request, stage="final")
+        if telemetry is not None:
+            telemetry.record("final", 1, response, queue_wait=started - submitted + (response.queue_wait or 0.0))
+        return response.content.strip()
+    
+    async def _stream_final_summary(self, prompt: str, writer: StreamWriter, temperature: float, telemetry: Optional[RunTelemetry] = None) -> str:
+        """Generate the final summary token by token, emitting each delta as a progress event."""
+        parts = []
+        final_responses = []
+        first_token = None
+        submitted = time.monotonic()
+        async with self.llm_service, self.scheduler.slot(stage="final"):
+            started = time.monotonic()
+            async for delta in self.llm_service.generate_stream(prompt, temperature=temperature, on_done=final_responses.append):
+                if first_token is None:
+                    first_token = time.monotonic() - started
+                parts.append(delta)
+                writer(ProgressEvent(kind="summary_delta", delta=delta, partial_summary="".join(parts)))
+            latency = time.monotonic() - started
+        if telemetry is not None and final_responses:
+            # Time the rate limiter held the request back is queue wait, not latency
+            throttled = final_responses[0].queue_wait or 0.0
+            telemetry.record(
+                "final", 1, final_responses[0],
+                queue_wait=started - submitted + throttled, latency=latency - throttled,
+                time_to_first_token=first_token - throttled if first_token is not None else None
+            )
+        return "".join(parts).strip()
+    
     def _create_chunk_summary_prompt(self, chunk_text: str, chunk_num: int, total_chunks: int) -> str:
         """Create a prompt for summarizing a text chunk."""
         return f"""You are an expert at summarizing transcript content. Please provide a concise but comprehensive summary of the following transcript segment.
@@ -342,6 +651,23 @@ Transcript segment:
 
 Summary:"""
 
+    def _create_reduce_prompt(self, combined_summaries: str, batch_num: int, total_batches: int) -> str:
+        """Create a prompt for merging summaries of consecutive transcript segments."""
+        return f"""You are an expert at summarizing transcript content. Below are summaries of consecutive segments of a transcript. Please merge them into a single summary of this part of the transcript.
+
+This is part {batch_num} of {total_batches} of the transcript.
+
+Key requirements:
+- Keep every main topic, key point, name, and specific detail
+- Remove repetition between the segment summaries
+- Maintain the chronological flow of information
+- Use clear, professional language
+
+Segment summaries:
+{combined_summaries}
+
+Merged summary:"""
+
     def _create_final_summary_prompt(self, combined_summaries: str) -> str:
         """Create a prompt for the final summary."""
         return f"""You are an expert at creating comprehensive summaries from multiple related text segments. Below are summaries of different parts of a transcript. Please create a final, cohesive summary that:
@@ -358,7 +684,7 @@ Segment summaries:
 
 Please provide a comprehensive final summary:"""
 
-    async def summarize_vtt_file(self, file_path: str, chunk_size: Optional[int] = None, chunk_overlap: Optional[int] = None, temperature: Optional[float] = None) -> SummarizationResult:
+    async def summarize_vtt_file(self, file_path: str, chunk_size: Optional[int] = None, chunk_overlap: Optional[int] = None, temperature: Optional[float] = None, start_seconds: Optional[float] = None, end_seconds: Optional[float] = None) -> SummarizationResult:
         """
         Summarize a VTT file.
         
@@ -367,6 +693,8 @@ Please provide a comprehensive final summary:"""
             chunk_size: Override chunk size (optional)
             chunk_overlap: Override chunk overlap (optional)
             temperature: Override temperature (optional)
+            start_seconds: Only summarize cues starting at or after this time (optional)
+            end_seconds: Only summarize cues starting before this time (optional)
             
         Returns:
             SummarizationResult object
@@ -374,11 +702,11 @@ Please provide a comprehensive final summary:"""
         try:
             logger.info(f"📂 VTT FILE DEBUG: Processing file {file_path}")
             # Parse VTT file
-            segments = self.vtt_parser.parse_file(file_path)
-            full_text = self.vtt_parser.get_full_transcript()
-            logger.info(f"📄 VTT FILE DEBUG: Extracted {len(segments)} segments, {len(full_text)} chars total")
+            segments = self.vtt_parser.parse_file(file_path).slice(start_seconds, end_seconds)
+            full_text = segments.full_text()
+            logger.info(f"📄 VTT FILE DEBUG: Extracted {len(segments)} segments in range, {len(full_text)} chars total")
             
-            return await self.summarize_text(full_text, chunk_size, chunk_overlap, temperature)
+            return await self.summarize_text(full_text, chunk_size, chunk_overlap, temperature, segments=segments)
             
         except Exception as e:
             logger.error(f"❌ VTT FILE DEBUG: Error processing VTT file - {str(e)}")
@@ -392,7 +720,7 @@ Please provide a comprehensive final summary:"""
                 error=str(e)
             )
     
-    async def summarize_vtt_content(self, vtt_content: str, chunk_size: Optional[int] = None, chunk_overlap: Optional[int] = None, temperature: Optional[float] = None) -> SummarizationResult:
+    async def summarize_vtt_content(self, vtt_content: str, chunk_size: Optional[int] = None, chunk_overlap: Optional[int] = None, temperature: Optional[float] = None, start_seconds: Optional[float] = None, end_seconds: Optional[float] = None) -> SummarizationResult:
         """
         Summarize VTT content from a string.
         
@@ -401,6 +729,8 @@ Please provide a comprehensive final summary:"""
             chunk_size: Override chunk size (optional)
             chunk_overlap: Override chunk overlap (optional)
             temperature: Override temperature (optional)
+            start_seconds: Only summarize cues starting at or after this time (optional)
+            end_seconds: Only summarize cues starting before this time (optional)
             
         Returns:
             SummarizationResult object
@@ -408,11 +738,11 @@ Please provide a comprehensive final summary:"""
         try:
             logger.info(f"📄 VTT CONTENT DEBUG: Processing VTT content, {len(vtt_content)} chars")
             # Parse VTT content
-            segments = self.vtt_parser.parse_content(vtt_content)
-            full_text = self.vtt_parser.get_full_transcript()
-            logger.info(f"📄 VTT CONTENT DEBUG: Extracted {len(segments)} segments, {len(full_text)} chars total")
+            segments = self.vtt_parser.parse_content(vtt_content).slice(start_seconds, end_seconds)
+            full_text = segments.full_text()
+            logger.info(f"📄 VTT CONTENT DEBUG: Extracted {len(segments)} segments in range, {len(full_text)} chars total")
             
-            return await self.summarize_text(full_text, chunk_size, chunk_overlap, temperature)
+            return await self.summarize_text(full_text, chunk_size, chunk_overlap, temperature, segments=segments)
             
         except Exception as e:
             logger.error(f"❌ VTT CONTENT DEBUG: Error processing VTT content - {str(e)}")
@@ -426,49 +756,43 @@ Please provide a comprehensive final summary:"""
                 error=str(e)
             )
     
-    async def summarize_text(self, text: str, chunk_size: Optional[int] = None, chunk_overlap: Optional[int] = None, temperature: Optional[float] = None) -> SummarizationResult:
-        """
-        Summarize plain text.
-        
-        Args:
-            text: Input text to summarize
-            chunk_size: Override chunk size (optional)
-            chunk_overlap: Override chunk overlap (optional)
-            temperature: Override temperature (optional)
-            
-        Returns:
-            SummarizationResult object
-        """
-        logger.info("🚀 SUMMARIZE DEBUG: Starting text summarization")
-        
-        # Update configuration if provided
-        if chunk_size is not None or chunk_overlap is not None or temperature is not None:
-            new_chunk_size = chunk_size if chunk_size is not None else self.config.chunk_size
-            new_chunk_overlap = chunk_overlap if chunk_overlap is not None else self.config.chunk_overlap
-            new_temperature = temperature if temperature is not None else self.config.temperature
-            
-            logger.info("🔄 SUMMARIZE DEBUG: Updating configuration with provided values")
-            self.update_config(new_chunk_size, new_chunk_overlap, new_temperature)
+    def _prepare_run(self, text: str, chunk_size: Optional[int], chunk_overlap: Optional[int], temperature: Optional[float], stream: bool = False, segments: Optional[SegmentStore] = None, chunks: Optional[List[TextChunk]] = None) -> SummarizationState:
+        """Resolve the run's settings from the overrides and the configured defaults, and build the initial workflow state."""
+        chunk_size = chunk_size if chunk_size is not None else self.config.chunk_size
+        chunk_overlap = chunk_overlap if chunk_overlap is not None else self.config.chunk_overlap
+        temperature = temperature if temperature is not None else self.config.temperature
+        if chunk_size == self.chunker.chunk_size and chunk_overlap == self.chunker.overlap_size:
+            chunker = self.chunker
+        else:
+            chunker = TextChunker(chunk_size=chunk_size, overlap_size=chunk_overlap)
+        settings = RunSettings(
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            temperature=temperature,
+            chunker=chunker,
+            num_ctx=self._context_size(chunk_size)
+        )
         
-        logger.info(f"📊 SUMMARIZE DEBUG: Final config - Temperature: {self.config.temperature}, Chunk Size: {self.config.chunk_size}, Overlap: {self.config.chunk_overlap}")
+        logger.info(f"📊 SUMMARIZE DEBUG: Run config - Temperature: {temperature}, Chunk Size: {chunk_size}, Overlap: {chunk_overlap}")
         
         # Create initial state
-        initial_state: SummarizationState = {
+        return {
             "original_text": text,
-            "chunks": None,
+            "chunks": chunks,
             "chunk_summaries": None,
             "final_summary": "",
             "processing_stats": None,
             "error": None,
-            "debug_config": None
+            "debug_config": None,
+            "stream": stream,
+            "segments": segments,
+            "telemetry": RunTelemetry(),
+            "scheduler_start": self.scheduler.stats.snapshot(),
+            "settings": settings
         }
-        
-        # Run the workflow
-        logger.info("🎬 SUMMARIZE DEBUG: Starting LangGraph workflow")
-        result_state = await self.workflow.ainvoke(initial_state)
-        logger.info("🏁 SUMMARIZE DEBUG: LangGraph workflow completed")
-        
-        # Create result object
+    
+    def _build_result(self, text: str, result_state: SummarizationState) -> SummarizationResult:
+        """Turn the final workflow state into a SummarizationResult."""
         if result_state.get("error"):
             logger.error(f"❌ SUMMARIZE DEBUG: Error in workflow - {result_state['error']}")
             return SummarizationResult(
@@ -482,27 +806,215 @@ Please provide a comprehensive final summary:"""
             )
         
         stats = result_state.get("processing_stats", {})
+        telemetry = result_state.get("telemetry") or RunTelemetry()
         result = SummarizationResult(
             summary=result_state.get("final_summary", ""),
             original_length=stats.get("original_length", 0),
             summary_length=stats.get("final_summary_length", 0),
             chunks_processed=stats.get("chunks_summarized", 0),
             processing_time=stats.get("processing_time", 0.0),
-            compression_ratio=stats.get("compression_ratio", 0.0)
+            compression_ratio=stats.get("compression_ratio", 0.0),
+            cache_hit_ratio=stats.get("cache_hits", 0) / stats["chunks_summarized"] if stats.get("chunks_summarized") else 0.0,
+            chunk_timeline=stats.get("chunk_timeline", []),
+            model_load_time=telemetry.model_timings.load_seconds,
+            model_eval_time=telemetry.model_timings.compute_seconds,
+            telemetry=telemetry.to_dict(),
+            hedging=self.llm_service.latency_report() if isinstance(self.llm_service, HedgedService) else {}
         )
+        self._export_telemetry(result, result_state["settings"])
         
         logger.info(f"✅ SUMMARIZE DEBUG: Summarization completed successfully")
         logger.info(f"📊 RESULT DEBUG: Original: {result.original_length} chars, Summary: {result.summary_length} chars, Ratio: {result.compression_ratio:.2f}x")
         
         return result
     
+    async def summarize_text(self, text: str, chunk_size: Optional[int] = None, chunk_overlap: Optional[int] = None, temperature: Optional[float] = None, segments: Optional[SegmentStore] = None, chunks: Optional[List[TextChunk]] = None) -> SummarizationResult:
+        """
+        Summarize plain text.
+        
+        Args:
+            text: Input text to summarize
+            chunk_size: Override chunk size (optional)
+            chunk_overlap: Override chunk overlap (optional)
+            temperature: Override temperature (optional)
+            segments: Parsed cues the text was joined from; chunks then follow cue boundaries (optional)
+            chunks: Chunks already made from the text, used instead of chunking again (optional)
+            
+        Returns:
+            SummarizationResult object
+        """
+        logger.info("🚀 SUMMARIZE DEBUG: Starting text summarization")
+        initial_state = self._prepare_run(text, chunk_size, chunk_overlap, temperature, segments=segments, chunks=chunks)
+        
+        # Run the workflow
+        logger.info("🎬 SUMMARIZE DEBUG: Starting LangGraph workflow")
+        # One session for the whole run, shared by the chunk and final summary requests
+        async with self._model_resident(initial_state["settings"].num_ctx), self.llm_service:
+            result_state = await self.workflow.ainvoke(initial_state)
+        logger.info("🏁 SUMMARIZE DEBUG: LangGraph workflow completed")
+        
+        return self._build_result(text, result_state)
+    
+    async def stream_text(self, text: str, chunk_size: Optional[int] = None, chunk_overlap: Optional[int] = None, temperature: Optional[float] = None, segments: Optional[SegmentStore] = None) -> AsyncIterator[ProgressEvent]:
+        """
+        Summarize plain text, yielding progress events while the work is done.
+        
+        Args:
+            text: Input text to summarize
+            chunk_size: Override chunk size (optional)
+            chunk_overlap: Override chunk overlap (optional)
+            temperature: Override temperature (optional)
+            segments: Parsed cues the text was joined from; chunks then follow cue boundaries (optional)
+            
+        Yields:
+            ProgressEvent objects; the last one has kind "done" and carries the SummarizationResult
+        """
+        logger.info("🚀 SUMMARIZE DEBUG: Starting streaming text summarization")
+        initial_state = self._prepare_run(text, chunk_size, chunk_overlap, temperature, stream=True, segments=segments)
+        
+        result_state = initial_state
+        async with self._model_resident(initial_state["settings"].num_ctx), self.llm_service:
+            async for mode, payload in self.workflow.astream(initial_state, stream_mode=["custom", "values"]):
+                if mode == "custom":
+                    yield payload
+                else:
+                    result_state = payload
+        logger.info("🏁 SUMMARIZE DEBUG: LangGraph workflow completed")
+        
+        yield ProgressEvent(kind="done", result=self._build_result(text, result_state))
+    
+    async def stream_vtt_file(self, file_path: str, chunk_size: Optional[int] = None, chunk_overlap: Optional[int] = None, temperature: Optional[float] = None, start_seconds: Optional[float] = None, end_seconds: Optional[float] = None) -> AsyncIterator[ProgressEvent]:
+        """
+        Summarize a VTT file, yielding progress events while the work is done.
+        
+        Args:
+            file_path: Path to the VTT file
+            chunk_size: Override chunk size (optional)
+            chunk_overlap: Override chunk overlap (optional)
+            temperature: Override temperature (optional)
+            start_seconds: Only summarize cues starting at or after this time (optional)
+            end_seconds: Only summarize cues starting before this time (optional)
+            
+        Yields:
+            ProgressEvent objects; the last one has kind "done" and carries the SummarizationResult
+        """
+        try:
+            logger.info(f"📂 VTT FILE DEBUG: Processing file {file_path}")
+            segments = self.vtt_parser.parse_file(file_path).slice(start_seconds, end_seconds)
+            full_text = segments.full_text()
+            logger.info(f"📄 VTT FILE DEBUG: Extracted {len(segments)} segments in range, {len(full_text)} chars total")
+        except Exception as e:
+            logger.error(f"❌ VTT FILE DEBUG: Error processing VTT file - {str(e)}")
+            yield ProgressEvent(kind="done", result=SummarizationResult(
+                summary="",
+                original_length=0,
+                summary_length=0,
+                chunks_processed=0,
+                processing_time=0.0,
+                compression_ratio=0.0,
+                error=str(e)
+            ))
+            return
+        
+        async for event in self.stream_text(full_text, chunk_size, chunk_overlap, temperature, segments=segments):
+            yield event
+    
+    def _export_telemetry(self, result: SummarizationResult, settings: RunSettings):
+        """Append the run's telemetry, with the settings it ran under, to the configured JSONL file."""
+        if not self.config.telemetry_path:
+            return
+        provider = self.config.llm_provider
+        try:
+            export_telemetry(
+                self.config.telemetry_path,
+                result.telemetry,
+                provider=provider,
+                model=self.config.ollama_model_name if provider == "ollama" else self.config.gemini_model_name,
+                chunk_size=settings.chunk_size,
+                chunk_overlap=settings.chunk_overlap,
+                max_concurrent_requests=self.config.max_concurrent_requests,
+                original_length=result.original_length,
+                chunks=result.chunks_processed,
+                cache_hit_ratio=result.cache_hit_ratio
+            )
+        except OSError as e:
+            logger.warning(f"⚠️ TELEMETRY DEBUG: Could not write telemetry to {self.config.telemetry_path}: {e}")
+    
+    def warm_up_model(self) -> Optional[float]:
+        """
+        Load the model ahead of the first summary.
+        
+        Returns:
+            Seconds spent loading the model, or None if the provider needs no warm-up or loading failed
+        """
+        if self.residency is None:
+            return None
+        return self.residency.warm_up()
+    
+    def _model_resident(self, num_ctx: int):
+        """Context manager keeping the model loaded, with a context of at least num_ctx, for one run."""
+        return self.residency.resident(num_ctx) if self.residency is not None else contextlib.nullcontext()
+    
     def check_service_health(self) -> Dict[str, Any]:
         """
-        Check the health of the current LLM service and model availability.
+        Return the health of the current LLM service and model availability.
+        
+        The first call checks the service; later calls return the last result
+        right away and, once it is older than health_cache_seconds, start a
+        refresh in the background. "timestamp" tells when the result was taken.
         
         Returns:
             Health check results
         """
+        with self._health_lock:
+            health = self._health
+            stale = (
+                health is not None
+                and self._health_refresh is None
+                and time.time() - health["timestamp"] >= self.config.health_cache_seconds
+            )
+            if stale:
+                refresh = self._health_refresh = Future()
+        if health is None:
+            return self.refresh_service_health()
+        if stale:
+            threading.Thread(target=self._run_health_check, args=(refresh,), name="health-refresh", daemon=True).start()
+        return health
+    
+    def refresh_service_health(self) -> Dict[str, Any]:
+        """
+        Check the health of the current LLM service and model availability, and cache the result.
+        
+        Only one check runs at a time: a call made while one is in progress,
+        e.g. the page load racing the startup check, waits for its result.
+        
+        Returns:
+            Health check results
+        """
+        with self._health_lock:
+            pending = self._health_refresh
+            if pending is None:
+                refresh = self._health_refresh = Future()
+        if pending is not None:
+            return pending.result()
+        return self._run_health_check(refresh)
+    
+    def _run_health_check(self, refresh: Future) -> Dict[str, Any]:
+        """Run the check claimed as refresh, cache its result and hand it to everyone waiting on it."""
+        try:
+            health_status = self._check_service_health()
+            with self._health_lock:
+                self._health = health_status
+            refresh.set_result(health_status)
+            return health_status
+        except BaseException as e:
+            refresh.set_exception(e)
+            raise
+        finally:
+            with self._health_lock:
+                self._health_refresh = None
+    
+    def _check_service_health(self) -> Dict[str, Any]:
         health_status = {
             "llm_provider": self.config.llm_provider,
             "connection_ok": False,
@@ -0,0 +1,112 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+def cache_key(chunk_text: str, prompt_version: int, provider: str, model: str, temperature: float) -> str:
+    """
+    Content address of a chunk summary.
+
+    Args:
+        chunk_text: Text of the chunk being summarized
+        prompt_version: Version of the chunk summary prompt template
+        provider: LLM provider name
+        model: Model name
+        temperature: Generation temperature
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    payload = json.dumps([chunk_text, prompt_version, provider, model, round(temperature, 3)], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class SummaryCache:
+    """Persistent, size-bounded cache of chunk summaries stored in SQLite."""
+
+    def __init__(self, db_path: str, max_bytes: int = 100 * 1024 * 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            db_path: Path of the SQLite database file
+            max_bytes: Total size of cached summaries kept before the least recently used are evicted
+        """
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS summaries (
+                key TEXT PRIMARY KEY,
+                summary TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS summaries_last_used ON summaries(last_used);
+            """
+        )
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached summary for a key, or None on a miss."""
+        with self._lock:
+            row = self._conn.execute("SELECT summary FROM summaries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE summaries SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, summary: str):
+        """Store a summary and evict the least recently used entries beyond max_bytes."""
+        size = len(summary.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO summaries (key, summary, size, last_used) VALUES (?, ?, ?, ?)",
+                (key, summary, size, time.time()),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM summaries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        for key, size in self._conn.execute("SELECT key, size FROM summaries ORDER BY last_used").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM summaries WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        logger.info(f"Summary cache evicted {evicted} entries to stay under {self.max_bytes} bytes")
+
+    def size_bytes(self) -> int:
+        """Total size of the cached summaries."""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM summaries").fetchone()[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,156 @@
+import os
+import json
+import math
+import time
+import logging
+import threading
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..services.model_residency import ModelTimings, NANOSECONDS
+
+logger = logging.getLogger(__name__)
+
+_export_lock = threading.Lock()
+
+def usage_tokens(response: Any) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Prompt and output token counts reported by a provider.
+
+    Args:
+        response: OllamaResponse or GeminiResponse
+
+    Returns:
+        Tuple of (prompt tokens, output tokens); None where the provider did not report a count
+    """
+    prompt_tokens = getattr(response, "prompt_eval_count", None)
+    if prompt_tokens is None:
+        prompt_tokens = getattr(response, "prompt_tokens", None)
+    output_tokens = getattr(response, "eval_count", None)
+    if output_tokens is None:
+        output_tokens = getattr(response, "completion_tokens", None)
+    return prompt_tokens, output_tokens
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of values (0.0 for no values)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(len(ordered) * fraction))
+    return ordered[rank - 1]
+
+@dataclass
+class RequestTelemetry:
+    """Measurements of one LLM request."""
+    stage: str  # "chunk", "reduce-<level>" or "final"
+    number: int
+    prompt_tokens: Optional[int]
+    output_tokens: Optional[int]
+    queue_wait: float
+    latency: float
+    # Measured on streamed requests; otherwise the backend's load plus prompt evaluation time, if reported
+    time_to_first_token: Optional[float] = None
+
+    @property
+    def tokens_per_second(self) -> float:
+        """Output tokens per second of request latency."""
+        return self.output_tokens / self.latency if self.output_tokens and self.latency > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = asdict(self)
+        result["tokens_per_second"] = self.tokens_per_second
+        return result
+
+@dataclass
+class RunTelemetry:
+    """Per-request measurements of one summarization run and their aggregates."""
+    requests: List[RequestTelemetry] = field(default_factory=list)
+    model_timings: ModelTimings = field(default_factory=ModelTimings)
+    started_at: float = field(default_factory=time.time)
+    wall_time: float = 0.0
+
+    def record(self, stage: str, number: int, response: Any, queue_wait: Optional[float] = None,
+               latency: Optional[float] = None, time_to_first_token: Optional[float] = None) -> RequestTelemetry:
+        """
+        Record one finished request.
+
+        Args:
+            stage: Workflow step the request belongs to
+            number: Chunk or batch number within the stage (1-based)
+            response: Provider response; its usage fields give token counts
+            queue_wait: Seconds waited for a scheduler slot (default: the response's queue_wait)
+            latency: Seconds from sending the request to the full response (default: the response's latency)
+            time_to_first_token: Seconds until the first token arrived, when streamed
+
+        Returns:
+            The recorded RequestTelemetry
+        """
+        prompt_tokens, output_tokens = usage_tokens(response)
+        if time_to_first_token is None and getattr(response, "prompt_eval_duration", None) is not None:
+            time_to_first_token = ((response.load_duration or 0) + response.prompt_eval_duration) / NANOSECONDS
+        request = RequestTelemetry(
+            stage=stage,
+            number=number,
+            prompt_tokens=prompt_tokens,
+            output_tokens=output_tokens,
+            queue_wait=queue_wait if queue_wait is not None else getattr(response, "queue_wait", None) or 0.0,
+            latency=latency if latency is not None else getattr(response, "latency", None) or 0.0,
+            time_to_first_token=time_to_first_token
+        )
+        self.requests.append(request)
+        self.model_timings.add(response)
+        return request
+
+    def finish(self):
+        """Set the wall time of the run."""
+        self.wall_time = time.time() - self.started_at
+
+    def summary(self) -> Dict[str, Any]:
+        """Aggregates over all requests, with chunk latency percentiles and the slowest chunk."""
+        chunks = [request for request in self.requests if request.stage == "chunk"]
+        latencies = [request.latency for request in chunks]
+        waits = [request.queue_wait for request in self.requests]
+        first_tokens = [request.time_to_first_token for request in self.requests if request.time_to_first_token is not None]
+        prompt_tokens = sum(request.prompt_tokens or 0 for request in self.requests)
+        output_tokens = sum(request.output_tokens or 0 for request in self.requests)
+        slowest = max(chunks, key=lambda request: request.latency, default=None)
+        return {
+            "requests": len(self.requests),
+            "prompt_tokens": prompt_tokens,
+            "output_tokens": output_tokens,
+            "wall_time": self.wall_time,
+            "output_tokens_per_second": output_tokens / self.wall_time if self.wall_time > 0 else 0.0,
+            "avg_queue_wait": sum(waits) / len(waits) if waits else 0.0,
+            "max_queue_wait": max(waits, default=0.0),
+            "avg_time_to_first_token": sum(first_tokens) / len(first_tokens) if first_tokens else None,
+            "chunk_latency_p50": percentile(latencies, 0.5),
+            "chunk_latency_p95": percentile(latencies, 0.95),
+            "slowest_chunk": slowest.number if slowest else None,
+            "slowest_chunk_latency": slowest.latency if slowest else 0.0,
+            "model_load_seconds": self.model_timings.load_seconds,
+            "model_eval_seconds": self.model_timings.compute_seconds,
+            "cold_loads": self.model_timings.cold_loads
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "started_at": self.started_at,
+            "summary": self.summary(),
+            "requests": [request.to_dict() for request in self.requests]
+        }
+
+def export_telemetry(path: str, telemetry: Dict[str, Any], **context: Any):
+    """
+    Append one run's telemetry to a JSONL file.
+
+    Args:
+        path: JSONL file to append to
+        telemetry: RunTelemetry.to_dict() of the run
+        **context: Extra fields stored with the run, such as provider, model and chunk size
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    line = json.dumps({**context, **telemetry}, ensure_ascii=False)
+    with _export_lock, open(path, "a", encoding="utf-8") as file:
+        file.write(line + "\n")
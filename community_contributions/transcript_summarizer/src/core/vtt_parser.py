@@ -1,22 +1,30 @@
-import webvtt
-from typing import List, Optional
-from dataclasses import dataclass
+import os
 import re
+import mmap
+from typing import Iterator, List, Optional, Union
+from .segment_store import SegmentStore, TranscriptSegment, parse_timestamp
+
+# Bytes-like inputs accepted by iter_segments besides a file path
+VTTBuffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+LINE_PATTERN = re.compile(rb'([^\r\n]*)(?:\r\n|\r|\n|\Z)')
+TIMING_PATTERN = re.compile(
+    rb'\s*((?:\d+:)?\d{2}:\d{2}[.,]\d{3})\s*-->\s*((?:\d+:)?\d{2}:\d{2}[.,]\d{3})'
+)
+TAG_PATTERN = re.compile(r'<[^>]+>')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+BLANK_PATTERN = re.compile(rb'\s*\Z')
+
+BOM = b'\xef\xbb\xbf'
+SKIPPED_BLOCKS = (b'NOTE', b'STYLE', b'REGION')
 
-@dataclass
-class TranscriptSegment:
-    """Represents a segment of transcript with timing information."""
-    start_time: str
-    end_time: str
-    text: str
-    
 class VTTParser:
     """Parser for WebVTT transcript files."""
     
     def __init__(self):
-        self.segments: List[TranscriptSegment] = []
+        self.segments = SegmentStore()
     
-    def parse_file(self, file_path: str) -> List[TranscriptSegment]:
+    def parse_file(self, file_path: str) -> SegmentStore:
         """
         Parse a VTT file and extract transcript segments.
         
@@ -24,61 +32,134 @@ class VTTParser:
             file_path: Path to the VTT file
             
         Returns:
-            List of TranscriptSegment objects
+            SegmentStore of the transcript segments
         """
         try:
-            vtt = webvtt.read(file_path)
-            segments = []
-            
-            for caption in vtt:
-                # Clean the text by removing HTML tags and extra whitespace
-                clean_text = self._clean_text(caption.text)
-                if clean_text.strip():  # Only add non-empty segments
-                    segment = TranscriptSegment(
-                        start_time=caption.start,
-                        end_time=caption.end,
-                        text=clean_text
-                    )
-                    segments.append(segment)
-            
-            self.segments = segments
-            return segments
+            self.segments = self._build_store(file_path)
+            return self.segments
             
         except Exception as e:
             raise ValueError(f"Error parsing VTT file: {str(e)}")
     
-    def parse_content(self, vtt_content: str) -> List[TranscriptSegment]:
+    def parse_content(self, vtt_content: Union[str, VTTBuffer]) -> SegmentStore:
         """
-        Parse VTT content from a string.
+        Parse VTT content from a string or bytes-like buffer.
         
         Args:
-            vtt_content: VTT content as string
+            vtt_content: VTT content as a string, bytes, memoryview or mmap
             
         Returns:
-            List of TranscriptSegment objects
+            SegmentStore of the transcript segments
         """
-        # Handle empty content gracefully
-        if not vtt_content or not vtt_content.strip():
-            return []
+        if isinstance(vtt_content, str):
+            # Handle empty content gracefully
+            if not vtt_content.strip():
+                self.segments = SegmentStore()
+                return self.segments
+            vtt_content = vtt_content.encode("utf-8")
+        elif BLANK_PATTERN.match(vtt_content):
+            self.segments = SegmentStore()
+            return self.segments
             
         try:
-            # Write content to a temporary file and parse it
-            import tempfile
-            import os
-            
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.vtt', delete=False) as tmp_file:
-                tmp_file.write(vtt_content)
-                tmp_file_path = tmp_file.name
-            
-            try:
-                segments = self.parse_file(tmp_file_path)
-                return segments
-            finally:
-                os.unlink(tmp_file_path)
+            self.segments = self._build_store(vtt_content)
+            return self.segments
                 
         except Exception as e:
             raise ValueError(f"Error parsing VTT content: {str(e)}")
     
+    def iter_segments(self, source: Union[str, os.PathLike, VTTBuffer]) -> Iterator[TranscriptSegment]:
+        """
+        Lazily parse cues into cleaned transcript segments.
+        
+        A path is memory-mapped rather than read into memory. Segments are
+        yielded as they are parsed and are not stored on the parser.
+        
+        Args:
+            source: Path to a VTT file, or VTT content as bytes, memoryview or mmap
+            
+        Yields:
+            TranscriptSegment objects with non-empty text
+        """
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, "rb") as file:
+                if os.fstat(file.fileno()).st_size == 0:
+                    raise ValueError("File is empty")
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                    yield from self._iter_buffer(buffer)
+        else:
+            yield from self._iter_buffer(source)
+    
+    def _build_store(self, source: Union[str, os.PathLike, VTTBuffer]) -> SegmentStore:
+        """Parse a source straight into a SegmentStore."""
+        return SegmentStore.from_cues(
+            (parse_timestamp(segment.start_time), parse_timestamp(segment.end_time), segment.text)
+            for segment in self.iter_segments(source)
+        )
+    
+    def _iter_buffer(self, buffer: VTTBuffer) -> Iterator[TranscriptSegment]:
+        """Parse cues from a bytes-like buffer, one block at a time."""
+        lines = (match.group(1) for match in LINE_PATTERN.finditer(buffer))
+        
+        header = next(lines, b"")
+        if header.startswith(BOM):
+            header = header[len(BOM):]
+        if not header.startswith(b"WEBVTT"):
+            raise ValueError("Missing WEBVTT header")
+        
+        block = []
+        for line in lines:
+            if line.strip():
+                block.append(line)
+                continue
+            if block:
+                segment = self._parse_block(block)
+                block = []
+                if segment:
+                    yield segment
+        if block:
+            segment = self._parse_block(block)
+            if segment:
+                yield segment
+    
+    def _parse_block(self, block: List[bytes]) -> Optional[TranscriptSegment]:
+        """
+        Convert one blank-line separated block into a segment.
+        
+        Args:
+            block: Lines of the block
+            
+        Returns:
+            TranscriptSegment, or None for header, comment, style and empty blocks
+        """
+        if block[0].startswith(SKIPPED_BLOCKS):
+            return None
+        
+        # The timing line may follow an optional cue identifier
+        for index in range(min(2, len(block))):
+            timing = TIMING_PATTERN.match(block[index])
+            if timing:
+                break
+        else:
+            return None
+        
+        raw_text = b" ".join(block[index + 1:]).decode("utf-8", errors="replace")
+        clean_text = self._clean_text(raw_text)
+        if not clean_text:
+            return None
+        return TranscriptSegment(
+            start_time=self._normalize_timestamp(timing.group(1)),
+            end_time=self._normalize_timestamp(timing.group(2)),
+            text=clean_text
+        )
+    
+    def _normalize_timestamp(self, timestamp: bytes) -> str:
+        """Format a cue timestamp as HH:MM:SS.mmm."""
+        timestamp = timestamp.decode("ascii").replace(",", ".")
+        if timestamp.count(":") == 1:
+            timestamp = "00:" + timestamp
+        return timestamp
+    
     def get_full_transcript(self) -> str:
         """
         Get the full transcript text without timing information.
@@ -86,7 +167,7 @@ class VTTParser:
         Returns:
             Complete transcript as a single string
         """
-        return " ".join([segment.text for segment in self.segments])
+        return self.segments.full_text()
     
     def get_transcript_with_timestamps(self) -> str:
         """
@@ -113,10 +194,10 @@ class VTTParser:
             Cleaned text
         """
         # Remove HTML tags
-        text = re.sub(r'<[^>]+>', '', text)
+        text = TAG_PATTERN.sub('', text)
         
         # Replace multiple whitespace with single space
-        text = re.sub(r'\s+', ' ', text)
+        text = WHITESPACE_PATTERN.sub(' ', text)
         
         # Remove leading/trailing whitespace
         text = text.strip()
@@ -130,25 +211,4 @@ class VTTParser:
         Returns:
             Duration in seconds
         """
-        if not self.segments:
-            return 0.0
-        
-        def time_to_seconds(time_str: str) -> float:
-            """Convert VTT time format to seconds."""
-            # Handle format: HH:MM:SS.mmm or MM:SS.mmm
-            parts = time_str.split(':')
-            if len(parts) == 3:  # HH:MM:SS.mmm
-                hours, minutes, seconds = parts
-                return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
-            elif len(parts) == 2:  # MM:SS.mmm
-                minutes, seconds = parts
-                return int(minutes) * 60 + float(seconds)
-            else:
-                return float(parts[0])
-        
-        try:
-            start_time = time_to_seconds(self.segments[0].start_time)
-            end_time = time_to_seconds(self.segments[-1].end_time)
-            return end_time - start_time
-        except Exception:
-            return 0.0
+        return self.segments.duration_seconds()
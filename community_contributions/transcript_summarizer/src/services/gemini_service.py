@@ -1,12 +1,16 @@
 import os
 import json
+import time
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, AsyncIterator, Callable, Tuple
 import asyncio
 import aiohttp
 from dataclasses import dataclass
 import google.generativeai as genai
 from google.generativeai.types import GenerateContentResponse
+from google.api_core import exceptions as google_exceptions
+from .request_scheduler import RequestScheduler, RetryableRequestError, record_throttle_wait
+from .rate_limiter import RateLimiter, get_rate_limiter, parse_retry_delay
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -20,11 +24,20 @@ class GeminiResponse:
     prompt_tokens: Optional[int] = None
     completion_tokens: Optional[int] = None
     total_tokens: Optional[int] = None
+    # Measured by the client: seconds waiting for a scheduler slot or the rate limiter, and from sending the request to the full response
+    queue_wait: Optional[float] = None
+    latency: Optional[float] = None
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count used when no tokenizer is given (about four characters per token)."""
+    return len(text) // 4 + 1
 
 class GeminiService:
     """Service for interacting with Google Gemini API."""
     
-    def __init__(self, api_key: str, model: str = "gemini-pro", timeout: int = 300):
+    def __init__(self, api_key: str, model: str = "gemini-pro", timeout: int = 300,
+                 scheduler: Optional[RequestScheduler] = None, requests_per_minute: int = 0,
+                 tokens_per_minute: int = 0, count_tokens: Optional[Callable[[str], int]] = None):
         """
         Initialize Gemini service.
         
@@ -32,27 +45,67 @@ class GeminiService:
             api_key: Google Gemini API key
             model: Model name to use (e.g., "gemini-pro")
             timeout: Request timeout in seconds
+            scheduler: Request scheduler limiting concurrent requests (a default one is created if omitted)
+            requests_per_minute: Request quota of the API key for this model (0 for no client-side limit)
+            tokens_per_minute: Input token quota of the API key for this model (0 for no client-side limit)
+            count_tokens: Tokenizer used to estimate prompt tokens for the quota (default: about four characters per token)
         """
         self.api_key = api_key
         self.model_name = model
         self.timeout = timeout
+        self.scheduler = scheduler or RequestScheduler()
+        self.count_tokens = count_tokens or estimate_tokens
+        # Shared by every service using the same key and model, so concurrent summaries draw on one budget
+        self.rate_limiter: Optional[RateLimiter] = None
+        if requests_per_minute > 0 or tokens_per_minute > 0:
+            self.rate_limiter = get_rate_limiter((api_key, model), requests_per_minute, tokens_per_minute)
         genai.configure(api_key=self.api_key)
         self.model = genai.GenerativeModel(self.model_name)
         self.session = None # aiohttp session for async operations if needed for direct http calls
+        self._session_users = 0
 
     async def __aenter__(self):
-        """Async context manager entry."""
+        """Async context manager entry; nested and concurrent users share one session."""
         # For google-generativeai, aiohttp.ClientSession might not be directly used
         # as the library handles its own async HTTP.
         # However, if we were to make direct HTTP calls, we'd initialize it here.
-        self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout))
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout))
+        self._session_users += 1
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit."""
-        if self.session:
+        """Async context manager exit; the session is closed when its last user leaves."""
+        self._session_users -= 1
+        if self._session_users == 0 and self.session:
             await self.session.close()
+            self.session = None
     
+    async def _admit(self, prompt: str, system_prompt: Optional[str]) -> Tuple[int, float]:
+        """
+        Wait until the request fits the rate limits; returns the prompt tokens reserved and the seconds waited.
+
+        The wait is reported to the request scheduler as throttling, so it
+        counts as queue wait rather than as the server being slow.
+        """
+        if self.rate_limiter is None:
+            return 0, 0.0
+        tokens = self.count_tokens(prompt) + (self.count_tokens(system_prompt) if system_prompt else 0)
+        waited = await self.rate_limiter.acquire(tokens)
+        record_throttle_wait(waited)
+        return tokens, waited
+
+    def _settle(self, reserved_tokens: int, prompt_tokens: Optional[int]):
+        if self.rate_limiter is not None:
+            self.rate_limiter.settle(reserved_tokens, prompt_tokens)
+
+    def _quota_error(self, error: Exception) -> RetryableRequestError:
+        """Pause the rate limiter for a 429 and turn it into a retryable error carrying the server's delay."""
+        retry_after = parse_retry_delay(error)
+        if self.rate_limiter is not None:
+            self.rate_limiter.penalize(retry_after)
+        return RetryableRequestError(f"Error communicating with Gemini: {str(error)}", status=429, retry_after=retry_after)
+
     def test_connection(self) -> bool:
         """
         Test connection to Gemini API by listing models.
@@ -144,7 +197,8 @@ class GeminiService:
             logger.error(f"Error communicating with Gemini during synchronous generation: {str(e)}")
             raise Exception(f"Error communicating with Gemini: {str(e)}")
 
-    async def generate_async(self, prompt: str, temperature: float = 0.3, system_prompt: Optional[str] = None) -> GeminiResponse:
+    async def generate_async(self, prompt: str, temperature: float = 0.3, system_prompt: Optional[str] = None,
+                             max_output_tokens: Optional[int] = None) -> GeminiResponse:
         """
         Generate text asynchronously using Gemini.
 
@@ -152,6 +206,7 @@ class GeminiService:
             prompt: Input prompt
             temperature: Temperature for generation
             system_prompt: Optional system prompt
+            max_output_tokens: Optional cap on generated tokens (default: 2048)
 
         Returns:
             GeminiResponse object
@@ -160,7 +215,7 @@ class GeminiService:
         try:
             generation_config = {
                 "temperature": temperature,
-                "max_output_tokens": 2048
+                "max_output_tokens": max_output_tokens or 2048
             }
             
             contents = []
@@ -169,6 +224,8 @@ class GeminiService:
                 contents.append({"role": "model", "parts": ["Okay, I understand."]})
             contents.append({"role": "user", "parts": [prompt]})
 
+            reserved_tokens, throttled = await self._admit(prompt, system_prompt)
+            started = time.monotonic()
             response: GenerateContentResponse = await self.model.generate_content_async(
                 contents,
                 generation_config=generation_config,
@@ -183,6 +240,7 @@ class GeminiService:
             prompt_tokens = response.usage_metadata.prompt_token_count if response.usage_metadata else None
             completion_tokens = response.usage_metadata.candidates_token_count if response.usage_metadata else None
             total_tokens = response.usage_metadata.total_token_count if response.usage_metadata else None
+            self._settle(reserved_tokens, prompt_tokens)
 
             logger.info(f"Asynchronous generation successful for model '{self.model_name}'.")
             return GeminiResponse(
@@ -190,68 +248,123 @@ class GeminiService:
                 model=self.model_name,
                 prompt_tokens=prompt_tokens,
                 completion_tokens=completion_tokens,
-                total_tokens=total_tokens
+                total_tokens=total_tokens,
+                queue_wait=throttled,
+                latency=time.monotonic() - started
             )
 
+        except (google_exceptions.TooManyRequests, google_exceptions.ResourceExhausted) as e:
+            logger.error(f"Gemini quota exceeded during asynchronous generation: {str(e)}")
+            raise self._quota_error(e)
+        except (google_exceptions.ServerError, google_exceptions.DeadlineExceeded) as e:
+            logger.error(f"Retryable Gemini error during asynchronous generation: {str(e)}")
+            raise RetryableRequestError(f"Error communicating with Gemini: {str(e)}", status=getattr(e, "code", None))
         except Exception as e:
             logger.error(f"Error communicating with Gemini during asynchronous generation: {str(e)}")
             raise Exception(f"Error communicating with Gemini: {str(e)}")
 
-    async def generate_multiple_async(self, prompts: List[str], temperature: float = 0.3, system_prompt: Optional[str] = None) -> List[GeminiResponse]:
+    async def generate_stream(self, prompt: str, temperature: float = 0.3, system_prompt: Optional[str] = None,
+                              on_done: Optional[Callable[[GeminiResponse], None]] = None) -> AsyncIterator[str]:
         """
-        Generate text for multiple prompts concurrently.
+        Generate text using Gemini, yielding the text as it is produced.
 
         Args:
-            prompts: List of input prompts
+            prompt: Input prompt
             temperature: Temperature for generation
             system_prompt: Optional system prompt
+            on_done: Optional callback called with the final response (full text and token counts) once generation ends
 
-        Returns:
-            List of GeminiResponse objects
+        Yields:
+            Text deltas in generation order
         """
-        logger.info(f"Sending {len(prompts)} concurrent asynchronous generation requests for Gemini model '{self.model_name}'")
-        
-        tasks = []
-        for prompt in prompts:
+        logger.info(f"Sending streaming generation request to Gemini for model '{self.model_name}'")
+        try:
+            generation_config = {
+                "temperature": temperature,
+                "max_output_tokens": 5000
+            }
+
             contents = []
             if system_prompt:
                 contents.append({"role": "user", "parts": [system_prompt]})
                 contents.append({"role": "model", "parts": ["Okay, I understand."]})
             contents.append({"role": "user", "parts": [prompt]})
-            
-            generation_config = {
-                "temperature": temperature,
-                "max_output_tokens": 2048
-            }
-            
-            tasks.append(self.model.generate_content_async(
+
+            reserved_tokens, throttled = await self._admit(prompt, system_prompt)
+            response = await self.model.generate_content_async(
                 contents,
                 generation_config=generation_config,
+                stream=True,
                 request_options={"timeout": self.timeout}
-            ))
+            )
 
-        try:
-            responses: List[GenerateContentResponse] = await asyncio.gather(*tasks)
-            
-            results = []
-            for response in responses:
-                response_text = ""
-                if response.candidates:
-                    for part in response.candidates[0].content.parts:
-                        response_text += part.text
-                
-                prompt_tokens = response.usage_metadata.prompt_token_count if response.usage_metadata else None
-                completion_tokens = response.usage_metadata.candidates_token_count if response.usage_metadata else None
-                total_tokens = response.usage_metadata.total_token_count if response.usage_metadata else None
-                
-                results.append(GeminiResponse(
-                    content=response_text.strip(),
+            parts = []
+            usage = None
+            async for chunk in response:
+                if chunk.usage_metadata:
+                    usage = chunk.usage_metadata
+                if chunk.candidates:
+                    for part in chunk.candidates[0].content.parts:
+                        if part.text:
+                            parts.append(part.text)
+                            yield part.text
+
+            self._settle(reserved_tokens, usage.prompt_token_count if usage else None)
+            if on_done:
+                on_done(GeminiResponse(
+                    content="".join(parts),
                     model=self.model_name,
-                    prompt_tokens=prompt_tokens,
-                    completion_tokens=completion_tokens,
-                    total_tokens=total_tokens
+                    prompt_tokens=usage.prompt_token_count if usage else None,
+                    completion_tokens=usage.candidates_token_count if usage else None,
+                    total_tokens=usage.total_token_count if usage else None,
+                    queue_wait=throttled
                 ))
-            
+
+            logger.info(f"Streaming generation successful for model '{self.model_name}'.")
+
+        except (google_exceptions.TooManyRequests, google_exceptions.ResourceExhausted) as e:
+            logger.error(f"Gemini quota exceeded during streaming generation: {str(e)}")
+            raise self._quota_error(e)
+        except Exception as e:
+            logger.error(f"Error communicating with Gemini during streaming generation: {str(e)}")
+            raise Exception(f"Error communicating with Gemini: {str(e)}")
+
+    async def generate_multiple_async(self, prompts: List[str], temperature: float = 0.3, system_prompt: Optional[str] = None,
+                                      on_complete: Optional[Callable[[int, GeminiResponse], None]] = None,
+                                      stage: str = "default") -> List[GeminiResponse]:
+        """
+        Generate text for multiple prompts concurrently, as far as the request scheduler allows.
+
+        Args:
+            prompts: List of input prompts
+            temperature: Temperature for generation
+            system_prompt: Optional system prompt
+            on_complete: Optional callback called with (index, response) as each prompt finishes
+            stage: Scheduler stage the prompts belong to, e.g. "chunk" or "reduce-1"
+
+        Returns:
+            List of GeminiResponse objects
+        """
+        submitted = time.monotonic()
+
+        async def generate_one(index: int, prompt: str) -> GeminiResponse:
+            # Called once a scheduler slot is free; time before that (and any failed attempts) counts as queue wait
+            queue_wait = time.monotonic() - submitted
+            response = await self.generate_async(prompt, temperature, system_prompt)
+            # generate_async reports the rate limiter's delay as the response's own queue wait
+            response.queue_wait = queue_wait + (response.queue_wait or 0.0)
+            if on_complete:
+                on_complete(index, response)
+            return response
+
+        logger.info(f"Scheduling {len(prompts)} asynchronous generation requests for Gemini model '{self.model_name}'")
+        request_factories = [
+            lambda index=index, prompt=prompt: generate_one(index, prompt)
+            for index, prompt in enumerate(prompts)
+        ]
+
+        try:
+            results = await self.scheduler.map(request_factories, stage)
             logger.info(f"Successfully completed {len(results)} concurrent asynchronous generations for Gemini.")
             return results
         except Exception as e:
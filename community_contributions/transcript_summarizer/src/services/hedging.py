@@ -0,0 +1,268 @@
+import math
+import time
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass, asdict
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+def _percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(len(ordered) * fraction)) - 1]
+
+@dataclass
+class HedgeStats:
+    """Counters collected by a hedged service."""
+    requests: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    failovers: int = 0
+    failures: int = 0
+    hedge_delay: Optional[float] = None
+
+    @property
+    def hedge_rate(self) -> float:
+        return self.hedges / self.requests if self.requests else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = asdict(self)
+        result["hedge_rate"] = self.hedge_rate
+        return result
+
+class HedgedService:
+    """
+    Sends requests to a primary LLM service and backs them up with a secondary one.
+
+    A request that has not finished once the primary's learned latency
+    percentile has passed is hedged: the same request goes to the secondary
+    service and the first successful answer wins, the other request is
+    cancelled. A request that fails on the primary fails over to the
+    secondary. Hedges are capped at max_hedge_ratio of all requests, so a
+    slow primary cannot double the load.
+
+    Primary latencies are learned from recent requests; for requests the
+    hedge won, the time the primary had run when it was cancelled is used,
+    which is a lower bound. Until min_samples latencies are known nothing is
+    hedged, but failover already applies.
+
+    The service exposes the same interface as OllamaService and
+    GeminiService. Primary requests go through the primary's scheduler;
+    hedges and failovers go through the secondary's own scheduler.
+    """
+
+    def __init__(self, primary: Any, secondary: Any, percentile: float = 0.95, max_hedge_ratio: float = 0.1,
+                 min_samples: int = 5, window: int = 200):
+        """
+        Initialize the hedged service.
+
+        Args:
+            primary: Service handling requests normally
+            secondary: Service receiving hedges and failovers (another Ollama host or Gemini)
+            percentile: Primary latency percentile after which a request is hedged
+            max_hedge_ratio: Largest fraction of requests that may be hedged
+            min_samples: Primary latencies needed before hedging starts
+            window: Number of recent primary latencies the percentile is learned from
+        """
+        self.primary = primary
+        self.secondary = secondary
+        self.scheduler = primary.scheduler
+        self.percentile = percentile
+        self.max_hedge_ratio = max_hedge_ratio
+        self.min_samples = min_samples
+        self.stats = HedgeStats()
+        self._primary_latencies: Deque[float] = deque(maxlen=window)
+        self._latencies: Deque[float] = deque(maxlen=window)
+
+    @property
+    def rate_limiter(self):
+        return getattr(self.primary, "rate_limiter", None)
+
+    async def __aenter__(self):
+        await self.primary.__aenter__()
+        try:
+            await self.secondary.__aenter__()
+        except BaseException:
+            await self.primary.__aexit__(None, None, None)
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        try:
+            await self.secondary.__aexit__(exc_type, exc_val, exc_tb)
+        finally:
+            await self.primary.__aexit__(exc_type, exc_val, exc_tb)
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds after which a primary request is hedged, or None while too few latencies are known."""
+        if len(self._primary_latencies) < self.min_samples:
+            return None
+        return _percentile(list(self._primary_latencies), self.percentile)
+
+    def latency_report(self) -> Dict[str, Any]:
+        """
+        Hedge counters and latency percentiles.
+
+        primary_p95 is taken over primary latencies including lower bounds for
+        cancelled requests, so tail_improvement_p95 underestimates the gain.
+        """
+        latencies = list(self._latencies)
+        primary = list(self._primary_latencies)
+        report = self.stats.to_dict()
+        report.update({
+            "latency_p50": _percentile(latencies, 0.5),
+            "latency_p95": _percentile(latencies, 0.95),
+            "latency_max": max(latencies, default=0.0),
+            "primary_p95": _percentile(primary, 0.95),
+            "primary_max": max(primary, default=0.0)
+        })
+        report["tail_improvement_p95"] = max(0.0, report["primary_p95"] - report["latency_p95"])
+        return report
+
+    def _secondary_request(self, method: str, *args, **kwargs) -> "asyncio.Future":
+        return asyncio.ensure_future(self.secondary.scheduler.run(lambda: getattr(self.secondary, method)(*args, **kwargs)))
+
+    async def generate_async(self, prompt: str, temperature: float = 0.3, system_prompt: Optional[str] = None,
+                             max_output_tokens: Optional[int] = None) -> Any:
+        """
+        Generate text, hedging slow primary requests and failing over on errors.
+
+        Args:
+            prompt: Input prompt
+            temperature: Temperature for generation
+            system_prompt: Optional system prompt
+            max_output_tokens: Optional cap on generated tokens
+
+        Returns:
+            Response of whichever service answered first
+        """
+        started = time.monotonic()
+        self.stats.requests += 1
+        delay = self.hedge_delay()
+        self.stats.hedge_delay = delay
+        primary = asyncio.ensure_future(self.primary.generate_async(prompt, temperature, system_prompt, max_output_tokens))
+        pending = {primary}
+        backup = None
+        primary_error = None
+        try:
+            if delay is not None and self.stats.hedges < self.max_hedge_ratio * self.stats.requests:
+                await asyncio.wait(pending, timeout=delay)
+                if not primary.done():
+                    logger.info(f"Hedging request after {delay:.1f}s")
+                    self.stats.hedges += 1
+                    backup = self._secondary_request("generate_async", prompt, temperature, system_prompt, max_output_tokens)
+                    pending.add(backup)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return self._finish(task is primary, task.result(), started)
+                    if task is primary:
+                        primary_error = task.exception()
+                        logger.warning(f"Primary request failed, failing over: {primary_error}")
+                        if backup is None:
+                            self.stats.failovers += 1
+                            backup = self._secondary_request("generate_async", prompt, temperature, system_prompt, max_output_tokens)
+                            pending.add(backup)
+                    else:
+                        logger.warning(f"Secondary request failed: {task.exception()}")
+            self.stats.failures += 1
+            raise primary_error or backup.exception()
+        finally:
+            for task in (primary, backup):
+                if task is not None and not task.done():
+                    task.cancel()
+            if not primary.done() or primary.cancelled():
+                # Cancelled by the hedge: the primary took at least this long
+                self._primary_latencies.append(time.monotonic() - started)
+
+    def _finish(self, from_primary: bool, response: Any, started: float) -> Any:
+        latency = time.monotonic() - started
+        self._latencies.append(latency)
+        if from_primary:
+            self._primary_latencies.append(latency)
+        else:
+            self.stats.hedge_wins += 1
+        response.latency = latency
+        return response
+
+    async def generate_stream(self, prompt: str, temperature: float = 0.3, system_prompt: Optional[str] = None,
+                              on_done: Optional[Callable[[Any], None]] = None) -> AsyncIterator[str]:
+        """
+        Stream text from the primary, failing over to the secondary if it fails before producing any text.
+
+        Streams are not hedged: text that has already been shown cannot be taken back.
+        """
+        started = False
+        try:
+            async for delta in self.primary.generate_stream(prompt, temperature, system_prompt, on_done=on_done):
+                started = True
+                yield delta
+            return
+        except Exception as e:
+            if started:
+                raise
+            logger.warning(f"Primary stream failed, failing over: {e}")
+            self.stats.failovers += 1
+        async for delta in self.secondary.generate_stream(prompt, temperature, system_prompt, on_done=on_done):
+            yield delta
+
+    async def generate_multiple_async(self, prompts: List[str], temperature: float = 0.3, system_prompt: Optional[str] = None,
+                                      on_complete: Optional[Callable[[int, Any], None]] = None,
+                                      stage: str = "default") -> List[Any]:
+        """
+        Generate text for multiple prompts concurrently, as far as the primary's scheduler allows.
+
+        Args:
+            prompts: List of input prompts
+            temperature: Temperature for generation
+            system_prompt: Optional system prompt
+            on_complete: Optional callback called with (index, response) as each prompt finishes
+            stage: Scheduler stage the prompts belong to, e.g. "chunk" or "reduce-1"
+
+        Returns:
+            List of responses
+        """
+        submitted = time.monotonic()
+
+        async def generate_one(index: int, prompt: str) -> Any:
+            queue_wait = time.monotonic() - submitted
+            response = await self.generate_async(prompt, temperature, system_prompt)
+            response.queue_wait = queue_wait + (response.queue_wait or 0.0)
+            if on_complete:
+                on_complete(index, response)
+            return response
+
+        logger.info(f"Scheduling {len(prompts)} hedged generation requests")
+        results = await self.scheduler.map([
+            lambda index=index, prompt=prompt: generate_one(index, prompt)
+            for index, prompt in enumerate(prompts)
+        ], stage)
+        report = self.latency_report()
+        logger.info(
+            f"Hedging: {report['hedges']} of {report['requests']} requests hedged ({report['hedge_rate']:.0%}), "
+            f"{report['hedge_wins']} won by the hedge, {report['failovers']} failovers, "
+            f"p95 {report['latency_p95']:.1f}s vs primary {report['primary_p95']:.1f}s"
+        )
+        return results
+
+    def generate_sync(self, prompt: str, temperature: float = 0.3, system_prompt: Optional[str] = None) -> Any:
+        """Generate text synchronously, failing over to the secondary on errors."""
+        try:
+            return self.primary.generate_sync(prompt, temperature, system_prompt)
+        except Exception as e:
+            logger.warning(f"Primary request failed, failing over: {e}")
+            self.stats.failovers += 1
+            return self.secondary.generate_sync(prompt, temperature, system_prompt)
+
+    def test_connection(self) -> bool:
+        return self.primary.test_connection()
+
+    def check_model_availability(self) -> bool:
+        return self.primary.check_model_availability()
+
+    def get_model_info(self) -> Dict[str, Any]:
+        return self.primary.get_model_info()
@@ -0,0 +1,98 @@
+import asyncio
+import logging
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Optional
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class PoolLimits:
+    """Connection limits of the shared HTTP clients."""
+    max_connections: int = 20
+    max_connections_per_host: int = 10
+    keepalive_timeout: float = 60.0
+
+_limits = PoolLimits()
+_sync_session: Optional[requests.Session] = None
+_sync_lock = threading.Lock()
+# One aiohttp session per event loop: aiohttp sessions cannot be shared between loops
+_async_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = weakref.WeakKeyDictionary()
+
+def configure_pool(limits: PoolLimits):
+    """
+    Set the connection limits of the shared HTTP clients.
+
+    Clients that already exist keep the limits they were created with;
+    configure the pool before the first request.
+
+    Args:
+        limits: Connection limits
+    """
+    global _limits
+    _limits = limits
+
+def get_sync_session() -> requests.Session:
+    """
+    Return the process-wide requests session, creating it on first use.
+
+    The session keeps connections alive between calls, so health checks,
+    model loads and synchronous generation reuse TCP connections instead of
+    opening one per call. requests sessions are safe to share between
+    threads for plain requests like these.
+
+    requests pools connections per host only: at most
+    max_connections_per_host are open to a host, and further calls wait for
+    one to be free. There is no cap across hosts, so max_connections only
+    applies to the aiohttp sessions.
+    """
+    global _sync_session
+    with _sync_lock:
+        if _sync_session is None:
+            session = requests.Session()
+            # pool_connections is how many hosts' pools are kept, not a connection limit; the default is plenty
+            adapter = HTTPAdapter(pool_maxsize=_limits.max_connections_per_host, pool_block=True)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _sync_session = session
+        return _sync_session
+
+def get_async_session() -> aiohttp.ClientSession:
+    """
+    Return the aiohttp session of the running event loop, creating it on first use.
+
+    The session stays open for the lifetime of the loop, so every service
+    and every run on that loop shares one pool of keep-alive connections.
+    Whoever owns the loop closes it with close_async_session before closing
+    the loop. The session sets no timeout; callers pass one per request.
+    """
+    loop = asyncio.get_running_loop()
+    session = _async_sessions.get(loop)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=_limits.max_connections,
+            limit_per_host=_limits.max_connections_per_host,
+            keepalive_timeout=_limits.keepalive_timeout
+        )
+        session = _async_sessions[loop] = aiohttp.ClientSession(connector=connector)
+        logger.info(f"Opened pooled HTTP session ({_limits.max_connections} connections, {_limits.max_connections_per_host} per host)")
+    return session
+
+async def close_async_session():
+    """Close the aiohttp session of the running event loop, if it has one."""
+    session = _async_sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
+
+def close_sync_session():
+    """Close the process-wide requests session; the next call opens a new one."""
+    global _sync_session
+    with _sync_lock:
+        if _sync_session is not None:
+            _sync_session.close()
+            _sync_session = None
@@ -0,0 +1,289 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .http_pool import close_async_session
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATUSES = (DONE, FAILED, CANCELLED)
+
+# Partial summaries are streamed often; write them to the database at most this often per job
+PARTIAL_WRITE_INTERVAL = 0.5
+
+@dataclass
+class Job:
+    """A summarization job and its latest progress."""
+    id: str
+    status: str
+    file_path: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    progress: str = ""
+    partial_summary: str = ""
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+# Called by a handler with a progress message and, optionally, the summary written so far
+ProgressReporter = Callable[..., None]
+JobHandler = Callable[[Job, ProgressReporter], Awaitable[Dict[str, Any]]]
+
+class JobQueue:
+    """
+    In-process job queue persisted in SQLite.
+
+    Jobs run on a background event loop owned by the queue, at most
+    max_workers at a time, so they keep running whether or not a browser is
+    watching. Progress and results are stored in the database; jobs that
+    were queued or running when the process stopped are queued again on
+    start.
+    """
+
+    _COLUMNS = "id, status, file_path, params, progress, partial_summary, result, error, created_at, started_at, finished_at"
+
+    def __init__(self, db_path: str, handler: JobHandler, max_workers: int = 2, delete_finished_files: bool = False):
+        """
+        Initialize the queue.
+
+        Args:
+            db_path: Path of the SQLite database file
+            handler: Coroutine function (job, report) returning the job result as a JSON-serializable dict
+            max_workers: Maximum number of jobs running at once
+            delete_finished_files: Delete a job's file once it is done, failed or cancelled
+        """
+        self.db_path = db_path
+        self.handler = handler
+        self.max_workers = max_workers
+        self.delete_finished_files = delete_finished_files
+        self._lock = threading.Lock()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                file_path TEXT NOT NULL,
+                params TEXT NOT NULL,
+                progress TEXT NOT NULL DEFAULT '',
+                partial_summary TEXT NOT NULL DEFAULT '',
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS jobs_created_at ON jobs(created_at);
+            """
+        )
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._running: Dict[str, asyncio.Task] = {}
+        self._workers: List[asyncio.Task] = []
+        self._stopping = False
+
+    def start(self):
+        """Start the background loop and workers, queueing unfinished jobs again."""
+        if self._thread is not None:
+            return
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="job-queue", daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start_workers(), self._loop).result()
+
+    async def _start_workers(self):
+        self._queue = asyncio.Queue()
+        with self._lock:
+            # Jobs interrupted by a restart start over
+            self._conn.execute("UPDATE jobs SET status = ?, started_at = NULL WHERE status = ?", (QUEUED, RUNNING))
+            self._conn.commit()
+            pending = self._conn.execute("SELECT id FROM jobs WHERE status = ? ORDER BY created_at", (QUEUED,)).fetchall()
+        for (job_id,) in pending:
+            self._queue.put_nowait(job_id)
+        if pending:
+            logger.info(f"Resuming {len(pending)} queued jobs")
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.max_workers)]
+
+    def submit(self, file_path: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Queue a job.
+
+        Args:
+            file_path: Transcript file the job works on
+            params: JSON-serializable options passed to the handler
+
+        Returns:
+            Job ID
+        """
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, status, file_path, params, progress, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, QUEUED, file_path, json.dumps(params or {}), "Queued", time.time()),
+            )
+            self._conn.commit()
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, job_id)
+        logger.info(f"Queued job {job_id} for {file_path}")
+        return job_id
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a queued or running job.
+
+        Returns:
+            False if the job does not exist or has already finished
+        """
+        if self._transition(job_id, QUEUED, CANCELLED, finished_at=time.time(), progress="Cancelled"):
+            self._delete_file(job_id)
+            return True
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return False
+        if self._loop is not None:
+            # On the loop, a running job's task is always registered: it is claimed and registered in one step
+            self._loop.call_soon_threadsafe(self._cancel_task, job_id)
+        return True
+
+    def _cancel_task(self, job_id: str):
+        task = self._running.get(job_id)
+        if task is not None:
+            task.cancel()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return a job, or None if the ID is unknown."""
+        with self._lock:
+            row = self._conn.execute(f"SELECT {self._COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_job(row) if row else None
+
+    def list_jobs(self, limit: int = 20) -> List[Job]:
+        """Return the most recently submitted jobs."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {self._COLUMNS} FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [self._to_job(row) for row in rows]
+
+    def shutdown(self):
+        """Stop the workers and the background loop; unfinished jobs resume on the next start."""
+        if self._loop is None:
+            return
+
+        async def stop():
+            self._stopping = True
+            for task in self._workers:
+                task.cancel()
+            await asyncio.gather(*self._workers, return_exceptions=True)
+            # Jobs share the pooled HTTP session of this loop; it goes with the loop
+            await close_async_session()
+
+        asyncio.run_coroutine_threadsafe(stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+        self._thread = None
+        with self._lock:
+            self._conn.close()
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            job = self.get(job_id)
+            if job is None or job.status != QUEUED:
+                continue
+            await self._run(job)
+
+    async def _run(self, job: Job):
+        # Only a job still queued is started; it may have been cancelled since the worker read it
+        if not self._transition(job.id, QUEUED, RUNNING, started_at=time.time(), progress="Started"):
+            return
+        last_partial_write = 0.0
+
+        def report(progress: str, partial_summary: Optional[str] = None):
+            nonlocal last_partial_write
+            if partial_summary is None:
+                self._update(job.id, progress=progress)
+            elif time.monotonic() - last_partial_write >= PARTIAL_WRITE_INTERVAL:
+                last_partial_write = time.monotonic()
+                self._update(job.id, progress=progress, partial_summary=partial_summary)
+
+        task = asyncio.ensure_future(self.handler(job, report))
+        self._running[job.id] = task
+        try:
+            result = await task
+            self._finish(job.id, DONE, progress="Done", result=json.dumps(result))
+            logger.info(f"Job {job.id} finished")
+        except asyncio.CancelledError:
+            if self._stopping:
+                # The queue is shutting down; leave the job to be resumed
+                raise
+            self._finish(job.id, CANCELLED, progress="Cancelled")
+            logger.info(f"Job {job.id} cancelled")
+        except Exception as e:
+            self._finish(job.id, FAILED, progress="Failed", error=str(e))
+            logger.error(f"Job {job.id} failed: {e}")
+        finally:
+            self._running.pop(job.id, None)
+
+    def _to_job(self, row) -> Job:
+        job = Job(*row)
+        job.params = json.loads(job.params)
+        job.result = json.loads(job.result) if job.result else None
+        return job
+
+    def _update(self, job_id: str, **columns):
+        assignments = ", ".join(f"{name} = ?" for name in columns)
+        with self._lock:
+            self._conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*columns.values(), job_id))
+            self._conn.commit()
+
+    def _transition(self, job_id: str, from_status: str, to_status: str, **columns) -> bool:
+        """Set a job's status to to_status only if it is from_status; returns whether it was."""
+        assignments = ", ".join(f"{name} = ?" for name in ("status", *columns))
+        with self._lock:
+            cursor = self._conn.execute(
+                f"UPDATE jobs SET {assignments} WHERE id = ? AND status = ?",
+                (to_status, *columns.values(), job_id, from_status)
+            )
+            self._conn.commit()
+        return cursor.rowcount == 1
+
+    def _finish(self, job_id: str, status: str, **columns):
+        self._update(job_id, status=status, finished_at=time.time(), **columns)
+        self._delete_file(job_id)
+
+    def _delete_file(self, job_id: str):
+        # Jobs interrupted by a shutdown never get here, so their files are still there to resume from
+        if not self.delete_finished_files:
+            return
+        job = self.get(job_id)
+        if job is None:
+            return
+        try:
+            os.unlink(job.file_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not delete {job.file_path} for job {job_id}: {e}")
@@ -0,0 +1,166 @@
+import asyncio
+import logging
+import threading
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, asdict
+from typing import Any, AsyncIterator, Dict, Optional
+
+from .ollama_service import OllamaService
+
+logger = logging.getLogger(__name__)
+
+# Keep-alive sent while summaries are running: Ollama keeps the model loaded until told otherwise
+HOLD_KEEP_ALIVE = -1
+
+# A request whose load_duration exceeds this paid for loading the model rather than finding it resident
+COLD_LOAD_SECONDS = 1.0
+
+NANOSECONDS = 1e9
+
+def parse_keep_alive(value: Any) -> Any:
+    """
+    Convert a configured keep-alive to what Ollama expects.
+
+    Ollama takes either a duration string ("30m") or a number of seconds;
+    numeric strings such as "-1" or "3600" are sent as numbers.
+    """
+    if isinstance(value, str):
+        try:
+            number = float(value)
+        except ValueError:
+            return value
+        return int(number) if number.is_integer() else number
+    return value
+
+def context_size(prompt_tokens: int, output_tokens: int, minimum: int = 0, step: int = 1024) -> int:
+    """
+    Context length (num_ctx) needed for a prompt and its output.
+
+    Args:
+        prompt_tokens: Tokens of the longest prompt, template included
+        output_tokens: Tokens reserved for the generated text
+        minimum: Smallest context to return
+        step: The result is rounded up to a multiple of this
+
+    Returns:
+        Context length in tokens
+    """
+    needed = max(prompt_tokens + output_tokens, minimum, 1)
+    return -(-needed // step) * step
+
+@dataclass
+class ModelTimings:
+    """Time the backend spent loading the model versus evaluating prompts during one run."""
+    requests: int = 0
+    cold_loads: int = 0
+    load_seconds: float = 0.0
+    prompt_eval_seconds: float = 0.0
+    eval_seconds: float = 0.0
+
+    @property
+    def compute_seconds(self) -> float:
+        """Prompt evaluation plus generation time."""
+        return self.prompt_eval_seconds + self.eval_seconds
+
+    def add(self, response: Any):
+        """Record one response; responses without timings (e.g. Gemini) only count as requests."""
+        self.requests += 1
+        load_seconds = (getattr(response, "load_duration", None) or 0) / NANOSECONDS
+        self.load_seconds += load_seconds
+        self.prompt_eval_seconds += (getattr(response, "prompt_eval_duration", None) or 0) / NANOSECONDS
+        self.eval_seconds += (getattr(response, "eval_duration", None) or 0) / NANOSECONDS
+        if load_seconds >= COLD_LOAD_SECONDS:
+            self.cold_loads += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = asdict(self)
+        result["compute_seconds"] = self.compute_seconds
+        return result
+
+class ModelResidency:
+    """
+    Keeps an Ollama model loaded while it is needed.
+
+    warm_up() loads the model ahead of the first request. While at least one
+    summary is running (see resident()), every request asks Ollama to keep
+    the model loaded indefinitely; when the last one finishes the model gets
+    the idle keep-alive back, so it is unloaded only after keep_alive of
+    inactivity. The service's num_ctx is sent with every request, including
+    the warm-up, because Ollama reloads the model when it changes. A run
+    asks for the context its prompts need when it starts; while other runs
+    are in progress the context is only ever raised, never lowered under them.
+    """
+
+    def __init__(self, service: OllamaService, keep_alive: Any = "30m", num_ctx: Optional[int] = None):
+        """
+        Initialize residency management for a service.
+
+        Args:
+            service: Ollama service whose requests carry the keep-alive and context settings
+            keep_alive: How long Ollama keeps the model loaded after the last summary (e.g. "30m", seconds, -1 for ever)
+            num_ctx: Context length sent with every request (default: the model's own)
+        """
+        self.service = service
+        self.keep_alive = parse_keep_alive(keep_alive)
+        self.warm_up_seconds: Optional[float] = None
+        self._holders = 0
+        self._lock = threading.Lock()
+        service.keep_alive = self.keep_alive
+        service.num_ctx = num_ctx
+
+    @property
+    def num_ctx(self) -> Optional[int]:
+        return self.service.num_ctx
+
+    @num_ctx.setter
+    def num_ctx(self, value: Optional[int]):
+        if value != self.service.num_ctx:
+            logger.info(f"Ollama context length set to {value}; the model is reloaded on its next request")
+        self.service.num_ctx = value
+
+    def warm_up(self) -> Optional[float]:
+        """
+        Load the model so the first summary does not wait for it.
+
+        Returns:
+            Seconds Ollama spent loading the model (close to 0 if it was already loaded), or None if it failed
+        """
+        response = self.service.load_model()
+        if response is None:
+            return None
+        self.warm_up_seconds = (response.load_duration or 0) / NANOSECONDS
+        logger.info(f"Model '{self.service.model}' warmed up, load took {self.warm_up_seconds:.2f}s")
+        return self.warm_up_seconds
+
+    def hold(self, num_ctx: Optional[int] = None):
+        """Keep the model loaded until the matching release(), with a context of at least num_ctx."""
+        with self._lock:
+            if num_ctx is not None and (self._holders == 0 or num_ctx > (self.service.num_ctx or 0)):
+                self.num_ctx = num_ctx
+            self._holders += 1
+            self.service.keep_alive = HOLD_KEEP_ALIVE
+
+    def release(self) -> bool:
+        """
+        End a hold.
+
+        Returns:
+            True if this was the last hold, in which case the idle keep-alive is back in effect for new requests
+        """
+        with self._lock:
+            self._holders -= 1
+            idle = self._holders == 0
+            if idle:
+                self.service.keep_alive = self.keep_alive
+        return idle
+
+    @asynccontextmanager
+    async def resident(self, num_ctx: Optional[int] = None) -> AsyncIterator[None]:
+        """Hold the model, with a context of at least num_ctx, for the duration of a block, e.g. one summarization run."""
+        self.hold(num_ctx)
+        try:
+            yield
+        finally:
+            if self.release():
+                # The last request asked Ollama to keep the model for ever; start the idle countdown instead
+                await asyncio.to_thread(self.service.load_model, self.keep_alive)
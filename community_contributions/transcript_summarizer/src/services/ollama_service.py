@@ -1,11 +1,13 @@
 import requests
 import json
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, AsyncIterator, Callable
 import asyncio
 import aiohttp
 from dataclasses import dataclass
 import time
 import logging
+from .request_scheduler import RequestScheduler, RetryableRequestError, parse_retry_after
+from .http_pool import get_sync_session, get_async_session
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -19,12 +21,32 @@ class OllamaResponse:
     total_duration: Optional[int] = None
     load_duration: Optional[int] = None
     prompt_eval_count: Optional[int] = None
+    prompt_eval_duration: Optional[int] = None
     eval_count: Optional[int] = None
+    eval_duration: Optional[int] = None
+    # Measured by the client: seconds waiting for a scheduler slot, and from sending the request to the full response
+    queue_wait: Optional[float] = None
+    latency: Optional[float] = None
+
+    @classmethod
+    def from_result(cls, result: Dict[str, Any], model: str) -> "OllamaResponse":
+        """Build a response from a decoded /api/generate result; durations are in nanoseconds."""
+        return cls(
+            content=result.get("response", ""),
+            model=result.get("model", model),
+            total_duration=result.get("total_duration"),
+            load_duration=result.get("load_duration"),
+            prompt_eval_count=result.get("prompt_eval_count"),
+            prompt_eval_duration=result.get("prompt_eval_duration"),
+            eval_count=result.get("eval_count"),
+            eval_duration=result.get("eval_duration")
+        )
 
 class OllamaService:
     """Service for interacting with Ollama API."""
     
-    def __init__(self, base_url: str = "http://localhost:11434", model: str = "llama3.1:8b", timeout: int = 500):
+    def __init__(self, base_url: str = "http://localhost:11434", model: str = "llama3.1:8b", timeout: int = 500,
+                 scheduler: Optional[RequestScheduler] = None):
         """
         Initialize Ollama service.
         
@@ -32,21 +54,50 @@ class OllamaService:
             base_url: Base URL for Ollama API
             model: Model name to use
             timeout: Request timeout in seconds
+            scheduler: Request scheduler limiting concurrent requests (a default one is created if omitted)
         """
         self.base_url = base_url.rstrip('/')
         self.model = model
         self.timeout = timeout
+        self.scheduler = scheduler or RequestScheduler()
+        # Pooled aiohttp session of the current event loop, set while the service is used as a context manager
         self.session = None
+        self._request_timeout = aiohttp.ClientTimeout(total=timeout)
+        self._session_users = 0
+        # Sent with every request; set by ModelResidency. Ollama reloads the model when num_ctx changes.
+        self.keep_alive: Optional[Any] = None
+        self.num_ctx: Optional[int] = None
     
     async def __aenter__(self):
-        """Async context manager entry."""
-        self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout))
+        """Async context manager entry; binds the pooled session of the running event loop."""
+        if self.session is None or self.session.closed:
+            self.session = get_async_session()
+        self._session_users += 1
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit."""
-        if self.session:
-            await self.session.close()
+        """Async context manager exit; the pooled session and its connections stay open for the next run."""
+        self._session_users -= 1
+        if self._session_users == 0:
+            self.session = None
+    
+    @property
+    def http(self):
+        """Process-wide pooled requests session used by the synchronous calls."""
+        return get_sync_session()
+    
+    def _payload(self, prompt: Optional[str], options: Dict[str, Any], stream: bool = False, system_prompt: Optional[str] = None) -> Dict[str, Any]:
+        """Build a /api/generate payload with the residency settings of the service."""
+        payload = {"model": self.model, "stream": stream, "options": dict(options)}
+        if prompt is not None:
+            payload["prompt"] = prompt
+        if system_prompt:
+            payload["system"] = system_prompt
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+        if self.num_ctx:
+            payload["options"]["num_ctx"] = self.num_ctx
+        return payload
     
     def test_connection(self) -> bool:
         """
@@ -58,7 +109,7 @@ class OllamaService:
         url = f"{self.base_url}/api/tags"
         logger.info(f"Attempting to test connection to Ollama at {url}")
         try:
-            response = requests.get(url, timeout=10)
+            response = self.http.get(url, timeout=10)
             if response.status_code == 200:
                 logger.info("Successfully connected to Ollama.")
                 return True
@@ -78,7 +129,7 @@ class OllamaService:
         url = f"{self.base_url}/api/tags"
         logger.info(f"Checking availability of model '{self.model}' at {url}")
         try:
-            response = requests.get(url, timeout=10)
+            response = self.http.get(url, timeout=10)
             if response.status_code == 200:
                 models = response.json().get('models', [])
                 if any(model['name'].startswith(self.model) for model in models):
@@ -105,22 +156,14 @@ class OllamaService:
         """
         url = f"{self.base_url}/api/generate"
 
-        payload = {
-            "model": self.model,
-            "prompt": prompt,
-            "stream": False,
-            "options": {
-                "temperature": temperature,
-                "num_predict": -1  # Generate until natural stopping point
-            }
-        }
-
-        if system_prompt:
-            payload["system"] = system_prompt
+        payload = self._payload(prompt, {
+            "temperature": temperature,
+            "num_predict": -1  # Generate until natural stopping point
+        }, system_prompt=system_prompt)
 
         logger.info(f"Sending synchronous generation request to {url} for model '{self.model}'")
         try:
-            response = requests.post(
+            response = self.http.post(
                 url,
                 json=payload,
                 timeout=self.timeout,
@@ -130,14 +173,7 @@ class OllamaService:
 
             result = response.json()
             logger.info(f"Synchronous generation successful for model '{self.model}'.")
-            return OllamaResponse(
-                content=result.get("response", ""),
-                model=result.get("model", self.model),
-                total_duration=result.get("total_duration"),
-                load_duration=result.get("load_duration"),
-                prompt_eval_count=result.get("prompt_eval_count"),
-                eval_count=result.get("eval_count")
-            )
+            return OllamaResponse.from_result(result, self.model)
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Error communicating with Ollama during synchronous generation: {str(e)}")
@@ -149,7 +185,8 @@ class OllamaService:
             logger.error(f"An unexpected error occurred during synchronous generation: {str(e)}")
             raise Exception(f"Error communicating with Ollama: {str(e)}")
 
-    async def generate_async(self, prompt: str, temperature: float = 0.3, system_prompt: Optional[str] = None) -> OllamaResponse:
+    async def generate_async(self, prompt: str, temperature: float = 0.3, system_prompt: Optional[str] = None,
+                             max_output_tokens: Optional[int] = None) -> OllamaResponse:
         """
         Generate text asynchronously using Ollama.
 
@@ -157,6 +194,7 @@ class OllamaService:
             prompt: Input prompt
             temperature: Temperature for generation
             system_prompt: Optional system prompt
+            max_output_tokens: Optional cap on generated tokens (default: until natural stopping point)
 
         Returns:
             OllamaResponse object
@@ -167,35 +205,32 @@ class OllamaService:
 
         url = f"{self.base_url}/api/generate"
 
-        payload = {
-            "model": self.model,
-            "prompt": prompt,
-            "stream": False,
-            "options": {
-                "temperature": temperature,
-                "num_predict": -1
-            }
-        }
-
-        if system_prompt:
-            payload["system"] = system_prompt
+        payload = self._payload(prompt, {
+            "temperature": temperature,
+            "num_predict": max_output_tokens or -1
+        }, system_prompt=system_prompt)
 
         logger.info(f"Sending asynchronous generation request to {url} for model '{self.model}'")
         try:
-            async with self.session.post(url, json=payload) as response:
+            started = time.monotonic()
+            async with self.session.post(url, json=payload, timeout=self._request_timeout) as response:
                 response.raise_for_status()
                 result = await response.json()
 
                 logger.info(f"Asynchronous generation successful for model '{self.model}'.")
-                return OllamaResponse(
-                    content=result.get("response", ""),
-                    model=result.get("model", self.model),
-                    total_duration=result.get("total_duration"),
-                    load_duration=result.get("load_duration"),
-                    prompt_eval_count=result.get("prompt_eval_count"),
-                    eval_count=result.get("eval_count")
-                )
+                ollama_response = OllamaResponse.from_result(result, self.model)
+                ollama_response.latency = time.monotonic() - started
+                return ollama_response
 
+        except aiohttp.ClientResponseError as e:
+            logger.error(f"Ollama returned status {e.status} during asynchronous generation: {e}")
+            if e.status == 429 or e.status >= 500:
+                retry_after = parse_retry_after(e.headers.get("Retry-After") if e.headers else None)
+                raise RetryableRequestError(f"Error communicating with Ollama: {str(e)}", status=e.status, retry_after=retry_after)
+            raise Exception(f"Error communicating with Ollama: {str(e)}")
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            logger.error(f"Connection error during asynchronous generation: {e!r}")
+            raise RetryableRequestError(f"Error communicating with Ollama: {e!r}")
         except aiohttp.ClientError as e:
             logger.error(f"Aiohttp client error during asynchronous generation: {e}")
             raise Exception(f"Error communicating with Ollama: {str(e)}")
@@ -206,14 +241,72 @@ class OllamaService:
             logger.error(f"An unexpected error occurred during asynchronous generation: {e}")
             raise Exception(f"Error : {str(e)}")
 
-    async def generate_multiple_async(self, prompts: List[str], temperature: float = 0.3, system_prompt: Optional[str] = None) -> List[OllamaResponse]:
+    async def generate_stream(self, prompt: str, temperature: float = 0.3, system_prompt: Optional[str] = None,
+                              on_done: Optional[Callable[[OllamaResponse], None]] = None) -> AsyncIterator[str]:
         """
-        Generate text for multiple prompts concurrently.
+        Generate text using Ollama, yielding the text as it is produced.
+
+        Args:
+            prompt: Input prompt
+            temperature: Temperature for generation
+            system_prompt: Optional system prompt
+            on_done: Optional callback called with the final response (full text and timings) once generation ends
+
+        Yields:
+            Text deltas in generation order
+        """
+        if not self.session:
+            logger.error("Aiohttp session not initialized for streaming generation.")
+            raise Exception("Session not initialized. Use async context manager.")
+
+        url = f"{self.base_url}/api/generate"
+
+        payload = self._payload(prompt, {
+            "temperature": temperature,
+            "num_predict": -1
+        }, stream=True, system_prompt=system_prompt)
+
+        logger.info(f"Sending streaming generation request to {url} for model '{self.model}'")
+        try:
+            async with self.session.post(url, json=payload, timeout=self._request_timeout) as response:
+                response.raise_for_status()
+                # Ollama streams one JSON object per line
+                parts = []
+                async for line in response.content:
+                    if not line.strip():
+                        continue
+                    part = json.loads(line)
+                    if part.get("error"):
+                        raise Exception(part["error"])
+                    if part.get("response"):
+                        parts.append(part["response"])
+                        yield part["response"]
+                    if part.get("done"):
+                        # The last object carries the timings and token counts of the whole request
+                        if on_done:
+                            on_done(OllamaResponse.from_result({**part, "response": "".join(parts)}, self.model))
+                        break
+            logger.info(f"Streaming generation successful for model '{self.model}'.")
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Aiohttp client error during streaming generation: {e!r}")
+            raise Exception(f"Error communicating with Ollama: {e!r}")
+        except json.JSONDecodeError as e:
+            logger.error(f"Error parsing Ollama response during streaming generation: {e}")
+            raise Exception(f"Error parsing Ollama response: {str(e)}")
+
+    async def generate_multiple_async(self, prompts: List[str], temperature: float = 0.3, system_prompt: Optional[str] = None,
+                                      on_complete: Optional[Callable[[int, OllamaResponse], None]] = None,
+                                      stage: str = "default") -> List[OllamaResponse]:
+        """
+        Generate text for multiple prompts concurrently, as far as the request scheduler allows.
 
         Args:
             prompts: List of input prompts
             temperature: Temperature for generation
             system_prompt: Optional system prompt
+            on_complete: Optional callback called with (index, response) as each prompt finishes
+            stage: Scheduler stage the prompts belong to, e.g. "chunk" or "reduce-1"
 
         Returns:
             List of OllamaResponse objects
@@ -222,20 +315,58 @@ class OllamaService:
             logger.error("Aiohttp session not initialized for multiple asynchronous generations.")
             raise Exception("Session not initialized. Use async context manager.")
 
-        logger.info(f"Sending {len(prompts)} concurrent asynchronous generation requests for model '{self.model}'")
-        tasks = [
-            self.generate_async(prompt, temperature, system_prompt)
-            for prompt in prompts
+        submitted = time.monotonic()
+
+        async def generate_one(index: int, prompt: str) -> OllamaResponse:
+            # Called once a scheduler slot is free; time before that (and any failed attempts) counts as queue wait
+            queue_wait = time.monotonic() - submitted
+            response = await self.generate_async(prompt, temperature, system_prompt)
+            response.queue_wait = queue_wait
+            if on_complete:
+                on_complete(index, response)
+            return response
+
+        logger.info(f"Scheduling {len(prompts)} asynchronous generation requests for model '{self.model}'")
+        request_factories = [
+            lambda index=index, prompt=prompt: generate_one(index, prompt)
+            for index, prompt in enumerate(prompts)
         ]
 
         try:
-            results = await asyncio.gather(*tasks)
+            results = await self.scheduler.map(request_factories, stage)
             logger.info(f"Successfully completed {len(results)} concurrent asynchronous generations.")
             return results
         except Exception as e:
             logger.error(f"An error occurred during concurrent asynchronous generation: {e}")
             raise
 
+    def load_model(self, keep_alive: Optional[Any] = None) -> Optional[OllamaResponse]:
+        """
+        Load the model into memory without generating anything.
+
+        The request uses the same num_ctx as generation requests, so the
+        loaded model is the one they will use. If the model is already
+        loaded this only resets its keep-alive timer.
+
+        Args:
+            keep_alive: How long Ollama keeps the model loaded afterwards (default: the service's keep_alive)
+
+        Returns:
+            OllamaResponse whose load_duration is the time spent loading, or None if the request failed
+        """
+        url = f"{self.base_url}/api/generate"
+        payload = self._payload(None, {})
+        if keep_alive is not None:
+            payload["keep_alive"] = keep_alive
+        logger.info(f"Loading model '{self.model}' (keep_alive={payload.get('keep_alive')}, num_ctx={self.num_ctx})")
+        try:
+            response = self.http.post(url, json=payload, timeout=self.timeout)
+            response.raise_for_status()
+            return OllamaResponse.from_result(response.json(), self.model)
+        except Exception as e:
+            logger.error(f"Error loading model '{self.model}': {e}")
+            return None
+
     def get_model_info(self) -> Dict[str, Any]:
         """
         Get information about the current model.
@@ -246,7 +377,7 @@ class OllamaService:
         url = f"{self.base_url}/api/show"
         logger.info(f"Requesting model info for '{self.model}' from {url}")
         try:
-            response = requests.post(
+            response = self.http.post(
                 url,
                 json={"name": self.model},
                 timeout=10
@@ -268,7 +399,7 @@ class OllamaService:
         url = f"{self.base_url}/api/pull"
         logger.info(f"Attempting to pull model '{self.model}' from {url}")
         try:
-            response = requests.post(
+            response = self.http.post(
                 url,
                 json={"name": self.model},
                 timeout=600  # Model pulling can take a while
@@ -0,0 +1,240 @@
+import re
+import time
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+RETRY_DELAY_PATTERNS = (
+    re.compile(r'retry_delay\s*\{\s*seconds:\s*(\d+)(?:\s*nanos:\s*(\d+))?'),
+    re.compile(r'retry in\s+([\d.]+)\s*s', re.IGNORECASE),
+)
+
+def parse_retry_delay(error: Exception) -> Optional[float]:
+    """
+    Find the retry delay a quota error asks for.
+
+    Google API errors carry it as a RetryInfo detail; the same value also
+    appears in the error message ("retry_delay { seconds: 17 }" or "Please
+    retry in 17.5s").
+
+    Args:
+        error: Exception raised by the API client
+
+    Returns:
+        Delay in seconds, or None if the error gives no hint
+    """
+    for detail in getattr(error, "details", None) or []:
+        delay = getattr(detail, "retry_delay", None)
+        if delay is not None and hasattr(delay, "seconds"):
+            return delay.seconds + getattr(delay, "nanos", 0) / 1e9
+    message = str(error)
+    for pattern in RETRY_DELAY_PATTERNS:
+        match = pattern.search(message)
+        if match:
+            groups = match.groups()
+            if len(groups) == 2:
+                return int(groups[0]) + int(groups[1] or 0) / 1e9
+            return float(groups[0])
+    return None
+
+class TokenBucket:
+    """
+    Token bucket that hands out reservations.
+
+    A reservation is taken from the bucket immediately, even if that drives
+    the level below zero; the caller then waits until the bucket has refilled
+    to zero. Callers are therefore served in the order they reserved.
+    """
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        """
+        Initialize a full bucket.
+
+        Args:
+            capacity: Largest burst the bucket allows
+            refill_per_second: Rate at which the bucket refills
+        """
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.level = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.refill_per_second)
+        self.updated = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        """
+        Take amount from the bucket.
+
+        Amounts larger than the capacity are capped to it, so an oversized
+        request waits for a full bucket instead of for ever.
+
+        Returns:
+            Seconds until the reservation is covered
+        """
+        self._refill(now)
+        self.level -= min(amount, self.capacity)
+        return max(0.0, -self.level / self.refill_per_second)
+
+    def refund(self, amount: float, now: float):
+        """Return part of a reservation that turned out not to be needed."""
+        self._refill(now)
+        self.level = min(self.capacity, self.level + amount)
+
+    def drain(self, now: float):
+        """Empty the bucket, e.g. after the server reported the quota as exhausted."""
+        self._refill(now)
+        self.level = min(self.level, 0.0)
+
+@dataclass
+class RateLimiterStats:
+    """Counters collected by a rate limiter."""
+    requests: int = 0
+    delayed: int = 0
+    total_delay: float = 0.0
+    max_delay: float = 0.0
+    throttled: int = 0
+    estimated_tokens: int = 0
+    actual_tokens: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+class RateLimiter:
+    """
+    Client-side requests-per-minute and tokens-per-minute limiter.
+
+    Every request reserves one request and its estimated prompt tokens up
+    front and waits until both buckets cover the reservation, so requests
+    are queued before they would exceed the quota instead of failing with a
+    429. Once a response reports its real token usage the difference is
+    settled. A 429 blocks all requests until the server's retry delay has
+    passed.
+
+    Limiters are thread-safe and not tied to an event loop, so one instance
+    can be shared by every summarization in the process (see get_rate_limiter).
+    """
+
+    def __init__(self, requests_per_minute: int = 0, tokens_per_minute: int = 0):
+        """
+        Initialize the limiter.
+
+        Args:
+            requests_per_minute: Request quota (0 for no limit)
+            tokens_per_minute: Input token quota (0 for no limit)
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.request_bucket = TokenBucket(requests_per_minute, requests_per_minute / 60) if requests_per_minute > 0 else None
+        self.token_bucket = TokenBucket(tokens_per_minute, tokens_per_minute / 60) if tokens_per_minute > 0 else None
+        self.stats = RateLimiterStats()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: int) -> float:
+        """
+        Reserve quota for one request.
+
+        Args:
+            tokens: Estimated prompt tokens of the request
+
+        Returns:
+            Seconds to wait before sending the request
+        """
+        with self._lock:
+            now = time.monotonic()
+            delay = max(0.0, self._blocked_until - now)
+            if self.request_bucket is not None:
+                delay = max(delay, self.request_bucket.reserve(1, now))
+            if self.token_bucket is not None:
+                delay = max(delay, self.token_bucket.reserve(tokens, now))
+            self.stats.requests += 1
+            self.stats.estimated_tokens += tokens
+            if delay > 0:
+                self.stats.delayed += 1
+                self.stats.total_delay += delay
+                self.stats.max_delay = max(self.stats.max_delay, delay)
+        return delay
+
+    async def acquire(self, tokens: int) -> float:
+        """
+        Wait until a request with the given estimated prompt tokens fits the quota.
+
+        Returns:
+            Seconds waited
+        """
+        delay = self.reserve(tokens)
+        if delay > 0:
+            logger.info(f"Rate limiter delaying request by {delay:.1f}s to stay within quota")
+            await asyncio.sleep(delay)
+        return delay
+
+    def settle(self, estimated_tokens: int, actual_tokens: Optional[int]):
+        """
+        Correct a reservation with the token count the server reported.
+
+        Args:
+            estimated_tokens: Tokens reserved for the request
+            actual_tokens: Tokens the server counted, or None if it did not say
+        """
+        if actual_tokens is None:
+            return
+        with self._lock:
+            self.stats.actual_tokens += actual_tokens
+            if self.token_bucket is None:
+                return
+            now = time.monotonic()
+            difference = estimated_tokens - actual_tokens
+            if difference > 0:
+                self.token_bucket.refund(difference, now)
+            elif difference < 0:
+                self.token_bucket.reserve(-difference, now)
+
+    def penalize(self, retry_after: Optional[float]):
+        """
+        Record a 429 from the server.
+
+        Both buckets are emptied, and if the server said how long to wait no
+        request is let through before then.
+
+        Args:
+            retry_after: Server's retry delay in seconds, if given
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.stats.throttled += 1
+            for bucket in (self.request_bucket, self.token_bucket):
+                if bucket is not None:
+                    bucket.drain(now)
+            if retry_after is not None:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+        logger.warning(f"Quota exceeded; rate limiter paused{f' for {retry_after:.1f}s' if retry_after is not None else ''}")
+
+_registry: Dict[Tuple[str, ...], RateLimiter] = {}
+_registry_lock = threading.Lock()
+
+def get_rate_limiter(key: Tuple[str, ...], requests_per_minute: int, tokens_per_minute: int) -> RateLimiter:
+    """
+    Return the process-wide limiter for a quota, creating it on first use.
+
+    Services using the same key (e.g. API key and model) share one budget.
+    The limits given when the limiter was created stay in effect.
+
+    Args:
+        key: Identifies the quota
+        requests_per_minute: Request quota (0 for no limit)
+        tokens_per_minute: Input token quota (0 for no limit)
+
+    Returns:
+        Shared RateLimiter
+    """
+    with _registry_lock:
+        limiter = _registry.get(key)
+        if limiter is None:
+            limiter = _registry[key] = RateLimiter(requests_per_minute, tokens_per_minute)
+        return limiter
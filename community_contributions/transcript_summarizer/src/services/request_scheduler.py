@@ -0,0 +1,276 @@
+import asyncio
+import random
+import time
+import logging
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, asdict, replace
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Service times are compared against at least this baseline, so jitter on fast requests is not read as overload
+MIN_BASELINE_SECONDS = 0.5
+
+# Stats that add up over requests, so a run's share is the difference of two snapshots
+_ADDITIVE_STATS = ("requests", "retries", "failures", "overload_signals", "total_queue_wait", "total_service_time")
+
+# Seconds the request holding the current slot spent in client-side throttling, e.g. a rate limiter
+_throttle_wait: ContextVar[Optional[List[float]]] = ContextVar("throttle_wait", default=None)
+
+def record_throttle_wait(seconds: float):
+    """
+    Report time the current request spent waiting on a client-side rate limiter.
+
+    The scheduler counts it as queue wait rather than service time, so our
+    own throttling is not mistaken for the server slowing down.
+    """
+    wait = _throttle_wait.get()
+    if wait is not None:
+        wait[0] += seconds
+
+class RetryableRequestError(Exception):
+    """Raised by a service when a request failed in a way that is worth retrying (429, 5xx, timeouts)."""
+
+    def __init__(self, message: str, status: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds; HTTP dates are ignored."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+@dataclass
+class SchedulerStats:
+    """Counters collected by the request scheduler."""
+    requests: int = 0
+    retries: int = 0
+    failures: int = 0
+    overload_signals: int = 0
+    total_queue_wait: float = 0.0
+    total_service_time: float = 0.0
+    max_queue_wait: float = 0.0
+    peak_in_flight: int = 0
+    concurrency_limit: float = 0.0
+
+    @property
+    def avg_queue_wait(self) -> float:
+        return self.total_queue_wait / self.requests if self.requests else 0.0
+
+    @property
+    def avg_service_time(self) -> float:
+        return self.total_service_time / self.requests if self.requests else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = asdict(self)
+        result["avg_queue_wait"] = self.avg_queue_wait
+        result["avg_service_time"] = self.avg_service_time
+        return result
+
+    def snapshot(self) -> "SchedulerStats":
+        """Copy of the current counters, to diff against later with since()."""
+        return replace(self)
+
+    def since(self, earlier: "SchedulerStats") -> Dict[str, Any]:
+        """
+        Counters for the requests made since earlier was taken, plus the current concurrency limit.
+
+        max_queue_wait and peak_in_flight are high-water marks over the
+        scheduler's lifetime and cannot be split by time, so they are left out.
+        """
+        result = {name: getattr(self, name) - getattr(earlier, name) for name in _ADDITIVE_STATS}
+        requests = result["requests"]
+        result["avg_queue_wait"] = result["total_queue_wait"] / requests if requests else 0.0
+        result["avg_service_time"] = result["total_service_time"] / requests if requests else 0.0
+        result["concurrency_limit"] = self.concurrency_limit
+        return result
+
+class RequestScheduler:
+    """
+    Caps in-flight LLM requests and adapts the cap to how the backend copes.
+
+    The limit follows AIMD: every request that completes without a sign of
+    overload raises it by 1/limit (about +1 per round of requests), up to
+    max_concurrency. A 429/5xx, a timeout, or a service time far above the
+    best seen so far for the same stage halves it, down to min_concurrency.
+    Stages ("chunk", "reduce-1", "final", ...) keep separate baselines because
+    their requests differ in size: a final summary taking much longer than a
+    chunk summary is expected, not a sign of overload. Retryable failures
+    are retried with full-jitter exponential backoff, or after the server's
+    Retry-After when one is given.
+
+    The scheduler is meant to be shared by everything that talks to the same
+    backend, but only from one event loop at a time.
+    """
+
+    def __init__(self, max_concurrency: int = 3, min_concurrency: int = 1, max_retries: int = 3,
+                 base_delay: float = 1.0, max_delay: float = 30.0, latency_tolerance: float = 3.0):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_concurrency: Upper bound for concurrent requests
+            min_concurrency: Lower bound the limit never drops below
+            max_retries: Retries per request for retryable errors
+            base_delay: First backoff delay in seconds
+            max_delay: Largest backoff delay in seconds
+            latency_tolerance: Service time, as a multiple of the fastest seen for the stage, treated as overload
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.latency_tolerance = latency_tolerance
+        self.limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self.stats = SchedulerStats(concurrency_limit=self.limit)
+        self._best_service_time: Dict[str, float] = {}
+        self._condition: Optional[asyncio.Condition] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_condition(self) -> asyncio.Condition:
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._loop is not loop:
+            self._condition = asyncio.Condition()
+            self._loop = loop
+            self.in_flight = 0
+        return self._condition
+
+    async def _acquire(self):
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+            self.stats.peak_in_flight = max(self.stats.peak_in_flight, self.in_flight)
+
+    async def _release(self):
+        condition = self._get_condition()
+        async with condition:
+            self.in_flight -= 1
+            condition.notify_all()
+
+    def _on_success(self, service_time: float, stage: str):
+        best = min(service_time, self._best_service_time.get(stage, service_time))
+        self._best_service_time[stage] = best
+        if service_time > max(best, MIN_BASELINE_SECONDS) * self.latency_tolerance:
+            self._decrease(f"{stage} service time {service_time:.1f}s")
+        else:
+            self.limit = min(float(self.max_concurrency), self.limit + 1.0 / self.limit)
+        self.stats.concurrency_limit = self.limit
+
+    def _record_wait(self, queue_wait: float):
+        self.stats.total_queue_wait += queue_wait
+        self.stats.max_queue_wait = max(self.stats.max_queue_wait, queue_wait)
+
+    def _decrease(self, reason: str):
+        previous = int(self.limit)
+        self.limit = max(float(self.min_concurrency), self.limit / 2)
+        self.stats.overload_signals += 1
+        self.stats.concurrency_limit = self.limit
+        if int(self.limit) != previous:
+            logger.info(f"Request scheduler lowered concurrency to {int(self.limit)} ({reason})")
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        if retry_after is not None:
+            return min(self.max_delay, retry_after) + random.uniform(0, self.base_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    async def run(self, request: Callable[[], Awaitable[T]], stage: str = "default") -> T:
+        """
+        Run one request under the concurrency limit, retrying retryable failures.
+
+        Args:
+            request: Zero-argument callable returning a new awaitable for each attempt
+            stage: Kind of request; service times are only compared within a stage
+
+        Returns:
+            The result of the first successful attempt
+        """
+        attempt = 0
+        while True:
+            queued_at = time.monotonic()
+            await self._acquire()
+            started_at = time.monotonic()
+            queue_wait = started_at - queued_at
+            throttled = [0.0]
+            token = _throttle_wait.set(throttled)
+            try:
+                result = await request()
+            except RetryableRequestError as e:
+                self._record_wait(queue_wait + throttled[0])
+                self.stats.total_service_time += time.monotonic() - started_at - throttled[0]
+                self._decrease(f"status {e.status}" if e.status else str(e))
+                if attempt >= self.max_retries:
+                    self.stats.requests += 1
+                    self.stats.failures += 1
+                    raise
+                delay = self._backoff(attempt, e.retry_after)
+                logger.warning(f"Retrying request in {delay:.1f}s after error: {e}")
+                self.stats.retries += 1
+                attempt += 1
+            except Exception:
+                self._record_wait(queue_wait + throttled[0])
+                self.stats.requests += 1
+                self.stats.failures += 1
+                self.stats.total_service_time += time.monotonic() - started_at - throttled[0]
+                raise
+            else:
+                self._record_wait(queue_wait + throttled[0])
+                service_time = time.monotonic() - started_at - throttled[0]
+                self.stats.requests += 1
+                self.stats.total_service_time += service_time
+                self._on_success(service_time, stage)
+                return result
+            finally:
+                _throttle_wait.reset(token)
+                await self._release()
+            await asyncio.sleep(delay)
+
+    @asynccontextmanager
+    async def slot(self, stage: str = "default") -> AsyncIterator[None]:
+        """
+        Hold one concurrency slot for work that cannot be retried as a unit, such as a streamed response.
+
+        Queue wait, service time and overload signals are recorded as for run(), but nothing is retried.
+        """
+        queued_at = time.monotonic()
+        await self._acquire()
+        started_at = time.monotonic()
+        queue_wait = started_at - queued_at
+        self.stats.requests += 1
+        throttled = [0.0]
+        token = _throttle_wait.set(throttled)
+        try:
+            yield
+        except RetryableRequestError as e:
+            self.stats.failures += 1
+            self._decrease(f"status {e.status}" if e.status else str(e))
+            raise
+        except BaseException:
+            self.stats.failures += 1
+            raise
+        else:
+            self._on_success(time.monotonic() - started_at - throttled[0], stage)
+        finally:
+            _throttle_wait.reset(token)
+            self._record_wait(queue_wait + throttled[0])
+            self.stats.total_service_time += time.monotonic() - started_at - throttled[0]
+            await self._release()
+
+    async def map(self, requests: List[Callable[[], Awaitable[T]]], stage: str = "default") -> List[T]:
+        """Run many requests of one stage through the scheduler and return their results in order."""
+        results = await asyncio.gather(*(self.run(request, stage) for request in requests))
+        logger.info(
+            f"Request scheduler: {len(results)} requests, avg queue wait {self.stats.avg_queue_wait:.2f}s, "
+            f"avg service time {self.stats.avg_service_time:.2f}s, concurrency limit {int(self.limit)}"
+        )
+        return results
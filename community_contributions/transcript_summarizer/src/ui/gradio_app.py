@@ -1,14 +1,20 @@
 import gradio as gr
-import tempfile
 import os
+import uuid
+import shutil
+import asyncio
+import threading
 import logging
-from typing import Optional, Tuple, Dict, Any
+import time
+from dataclasses import asdict
+from typing import Optional, Tuple, Dict, Any, AsyncIterator
 import json
 
 from ..core.summarizer import TranscriptSummarizer, SummarizationResult
 from ..utils.config import Config
 from ..services.ollama_service import OllamaService # For Ollama-specific health check info
 from ..services.gemini_service import GeminiService # For Gemini-specific health check info
+from ..services.job_queue import JobQueue, Job, CANCELLED, FAILED
 
 # Set up logging for debugging using config
 config_instance = Config()
@@ -16,6 +22,9 @@ log_level = getattr(logging, config_instance.log_level.upper(), logging.INFO)
 logging.basicConfig(level=log_level)
 logger = logging.getLogger(__name__)
 
+# Seconds between job progress checks while following a job
+JOB_POLL_INTERVAL = 0.5
+
 def create_gradio_interface(config: Config) -> gr.Interface:
     """
     Create and configure the Gradio interface for the transcript summarizer.
@@ -29,15 +38,60 @@ def create_gradio_interface(config: Config) -> gr.Interface:
     
     # Initialize the summarizer
     summarizer = TranscriptSummarizer(config)
+    if config.ollama_warm_up:
+        # Load the model while the UI starts, so the first summary does not wait for it
+        threading.Thread(target=summarizer.warm_up_model, name="model-warm-up", daemon=True).start()
+    # Check the backend now, so the health panel has a result when the page first loads
+    threading.Thread(target=summarizer.refresh_service_health, name="health-check", daemon=True).start()
+    
+    # Long summaries run as background jobs, so they survive page reloads and don't hold a Gradio worker
+    job_files_dir = os.path.join(os.path.dirname(config.job_db_path) or ".", "job_files")
+    os.makedirs(job_files_dir, exist_ok=True)
+    
+    async def run_summary_job(job: Job, report) -> Dict[str, Any]:
+        """Summarize the transcript of a job, reporting progress as it goes."""
+        result = None
+        async for event in summarizer.stream_vtt_file(job.file_path, **job.params):
+            if event.kind == "chunks_ready":
+                report(f"⏳ Summarizing {event.total_chunks} chunks...")
+            elif event.kind == "chunk_done":
+                report(f"⏳ Summarized chunk {event.chunk_index} of {event.total_chunks}...")
+            elif event.kind == "reduce_level_done":
+                report(f"⏳ Merged summaries (level {event.level}), {event.total_chunks} left...")
+            elif event.kind == "summary_delta":
+                report("✍️ Writing final summary...", partial_summary=event.partial_summary)
+            elif event.kind == "done":
+                result = event.result
+        
+        if result.error:
+            raise RuntimeError(result.error)
+        return asdict(result)
+    
+    # The queue removes each stored upload once its job is done, failed or cancelled
+    job_queue = JobQueue(config.job_db_path, run_summary_job, max_workers=config.job_workers, delete_finished_files=True)
+    job_queue.start()
+    
+    def store_upload(file_obj) -> str:
+        """Copy an upload where the job can still read it after Gradio cleans up its temp files."""
+        file_path = os.path.join(job_files_dir, f"{uuid.uuid4().hex}.vtt")
+        source = file_obj.name if hasattr(file_obj, 'name') else file_obj
+        if isinstance(source, str) and os.path.isfile(source):
+            shutil.copyfile(source, file_path)
+        else:
+            # Handle case where file_obj is just the content
+            with open(file_path, 'w', encoding='utf-8') as tmp_file:
+                tmp_file.write(source if isinstance(source, str) else source.read())
+        logger.info(f"📂 GRADIO DEBUG: Stored upload at: {file_path}")
+        return file_path
     
     async def process_vtt_file(
         file_obj,
         chunk_size: int,
         chunk_overlap: int,
         temperature: float
-    ) -> Tuple[str, str, str]:
+    ) -> AsyncIterator[Tuple[str, str, str, str]]:
         """
-        Process uploaded VTT file and return summary with statistics.
+        Queue a summary job for the uploaded VTT file and follow its progress.
         
         Args:
             file_obj: Uploaded file object
@@ -45,70 +99,81 @@ def create_gradio_interface(config: Config) -> gr.Interface:
             chunk_overlap: Overlap between chunks
             temperature: LLM temperature
             
-        Returns:
-            Tuple of (summary, statistics, status_message)
+        Yields:
+            Tuples of (job ID, summary, statistics, status_message), updated as chunks finish and the summary is written
         """
         if file_obj is None:
-            return "", "", "❌ Please upload a VTT file."
+            yield "", "", "", "❌ Please upload a VTT file."
+            return
         
         try:
             logger.info("🎬 GRADIO DEBUG: Starting VTT file processing")
             logger.info(f"🔧 GRADIO CONFIG DEBUG: Received from UI - chunk_size={chunk_size}, chunk_overlap={chunk_overlap}, temperature={temperature}")
             
-            # Read file content
-            if hasattr(file_obj, 'name'):
-                file_path = file_obj.name
-                logger.info(f"📂 GRADIO DEBUG: Processing file at path: {file_path}")
-            else:
-                # Handle case where file_obj is just the content
-                with tempfile.NamedTemporaryFile(mode='w', suffix='.vtt', delete=False) as tmp_file:
-                    if isinstance(file_obj, str):
-                        tmp_file.write(file_obj)
-                    else:
-                        tmp_file.write(file_obj.read())
-                    file_path = tmp_file.name
-                logger.info(f"📂 GRADIO DEBUG: Created temporary file at: {file_path}")
-            
-            # Process the file with the provided configuration
-            logger.info("🚀 GRADIO DEBUG: Calling summarizer with configuration from UI")
-            result = await summarizer.summarize_vtt_file(
-                file_path, 
-                chunk_size=chunk_size, 
-                chunk_overlap=chunk_overlap, 
-                temperature=temperature
+            job_id = job_queue.submit(
+                store_upload(file_obj),
+                {"chunk_size": chunk_size, "chunk_overlap": chunk_overlap, "temperature": temperature}
             )
-            
-            # Clean up temporary file if created
-            if hasattr(file_obj, 'name') and file_path != file_obj.name:
-                try:
-                    os.unlink(file_path)
-                    logger.info("🧹 GRADIO DEBUG: Cleaned up temporary file")
-                except:
-                    pass
-            
-            if result.error:
-                logger.error(f"❌ GRADIO DEBUG: Summarization error: {result.error}")
-                return "", "", f"❌ Error: {result.error}"
-            
-            # Format statistics
-            stats = format_statistics(result)
-            
-            # Success message
-            status_msg = f"✅ Summary generated successfully! Processed {result.chunks_processed} chunks in {result.processing_time:.2f} seconds."
-            logger.info(f"✅ GRADIO DEBUG: Processing completed successfully - {status_msg}")
-            
-            return result.summary, stats, status_msg
-            
         except Exception as e:
             logger.error(f"❌ GRADIO DEBUG: Exception in process_vtt_file: {str(e)}")
-            return "", "", f"❌ Error processing file: {str(e)}"
+            yield "", "", "", f"❌ Error processing file: {str(e)}"
+            return
+        
+        async for update in follow_job(job_id):
+            yield update
+    
+    async def follow_job(job_id: str) -> AsyncIterator[Tuple[str, str, str, str]]:
+        """
+        Poll a job until it finishes, yielding its progress.
+        
+        Args:
+            job_id: ID of the job to follow
+            
+        Yields:
+            Tuples of (job ID, summary, statistics, status_message)
+        """
+        job_id = (job_id or "").strip()
+        job = job_queue.get(job_id)
+        if job is None:
+            yield job_id, "", "", "❌ Unknown job ID."
+            return
+        
+        while not job.finished:
+            yield job_id, job.partial_summary, "", f"{job.progress} (job `{job_id}`)"
+            await asyncio.sleep(JOB_POLL_INTERVAL)
+            job = job_queue.get(job_id)
+        
+        if job.status == CANCELLED:
+            yield job_id, job.partial_summary, "", "⛔ Job cancelled."
+            return
+        if job.status == FAILED:
+            logger.error(f"❌ GRADIO DEBUG: Summarization error: {job.error}")
+            yield job_id, "", "", f"❌ Error: {job.error}"
+            return
+        
+        result = SummarizationResult(**job.result)
+        
+        # Format statistics
+        stats = format_statistics(result)
+        
+        # Success message
+        status_msg = f"✅ Summary generated successfully! Processed {result.chunks_processed} chunks in {result.processing_time:.2f} seconds."
+        logger.info(f"✅ GRADIO DEBUG: Processing completed successfully - {status_msg}")
+        
+        yield job_id, result.summary, stats, status_msg
+    
+    def cancel_job(job_id: str) -> str:
+        """Cancel a queued or running job."""
+        if job_queue.cancel((job_id or "").strip()):
+            return "⛔ Cancelling job..."
+        return "❌ No queued or running job with that ID."
     
     def check_system_health() -> str:
         """Check system health and return status."""
         try:
             health = summarizer.check_service_health()
             
-            status_lines = ["## System Health Check", ""]
+            status_lines = ["## System Health Check", f"_Checked {time.time() - health['timestamp']:.0f}s ago_", ""]
             
             # Connection status
             if health["connection_ok"]:
@@ -157,6 +222,8 @@ def create_gradio_interface(config: Config) -> gr.Interface:
                 f"- Gemini Model: {config.gemini_model_name}",
                 f"- Chunk Size: {config.chunk_size} tokens",
                 f"- Chunk Overlap: {config.chunk_overlap} tokens",
+                f"- Ollama Context Size: {summarizer.residency.num_ctx if summarizer.residency else 'N/A'} tokens",
+                f"- Ollama Keep-Alive: {config.ollama_keep_alive}",
                 f"- Temperature: {config.temperature}"
             ])
             
@@ -175,11 +242,49 @@ def create_gradio_interface(config: Config) -> gr.Interface:
             f"**Summary Length:** {result.summary_length:,} characters", 
             f"**Compression Ratio:** {result.compression_ratio:.1f}x",
             f"**Chunks Processed:** {result.chunks_processed}",
+            f"**Cached Chunk Summaries:** {result.cache_hit_ratio:.0%}",
             f"**Processing Time:** {result.processing_time:.2f} seconds",
+            f"**Model Load / Eval Time:** {result.model_load_time:.2f}s / {result.model_eval_time:.2f}s",
             "",
             f"**Efficiency:** {result.original_length / result.processing_time:.0f} characters/second"
         ]
         
+        telemetry = result.telemetry.get("summary") if result.telemetry else None
+        if telemetry and telemetry["requests"]:
+            first_token = telemetry["avg_time_to_first_token"]
+            stats_lines.extend([
+                "",
+                "## Throughput",
+                "",
+                f"**LLM Requests:** {telemetry['requests']}",
+                f"**Tokens:** {telemetry['prompt_tokens']:,} prompt / {telemetry['output_tokens']:,} output",
+                f"**Output Throughput:** {telemetry['output_tokens_per_second']:.1f} tokens/second",
+                f"**Queue Wait:** {telemetry['avg_queue_wait']:.2f}s average, {telemetry['max_queue_wait']:.2f}s max",
+                f"**Time to First Token:** {f'{first_token:.2f}s average' if first_token is not None else 'N/A'}",
+            ])
+            if telemetry["slowest_chunk"] is not None:
+                stats_lines.append(
+                    f"**Chunk Latency:** {telemetry['chunk_latency_p50']:.2f}s p50, {telemetry['chunk_latency_p95']:.2f}s p95, "
+                    f"slowest chunk {telemetry['slowest_chunk']} at {telemetry['slowest_chunk_latency']:.2f}s"
+                )
+
+        hedging = result.hedging
+        if hedging and hedging["requests"]:
+            stats_lines.extend([
+                "",
+                "## Hedging (since startup)",
+                "",
+                f"**Hedged Requests:** {hedging['hedges']} of {hedging['requests']} ({hedging['hedge_rate']:.0%}), {hedging['hedge_wins']} answered first by the second backend",
+                f"**Failovers:** {hedging['failovers']}",
+                f"**p95 Latency:** {hedging['latency_p95']:.2f}s vs {hedging['primary_p95']:.2f}s on the primary alone (at least {hedging['tail_improvement_p95']:.2f}s better)"
+            ])
+
+        if result.chunk_timeline:
+            stats_lines.extend(["", "## Chunk Timeline", ""])
+            for entry in result.chunk_timeline:
+                stats_lines.append(f"**{entry['start_time']} – {entry['end_time']}:** {entry['summary']}")
+                stats_lines.append("")
+        
         return "\n".join(stats_lines)
     
     # Create the Gradio interface
@@ -289,6 +394,16 @@ def create_gradio_interface(config: Config) -> gr.Interface:
                     elem_classes=["status-box"]
                 )
                 
+                # Background job controls
+                with gr.Row():
+                    job_id_input = gr.Textbox(
+                        label="Job ID",
+                        placeholder="Paste a job ID to follow it after reloading the page",
+                        scale=3
+                    )
+                    follow_btn = gr.Button("🔄 Follow Job", scale=1)
+                    cancel_btn = gr.Button("⛔ Cancel Job", variant="stop", scale=1)
+                
                 # Results tabs
                 with gr.Tabs():
                     with gr.TabItem("📄 Summary"):
@@ -320,6 +435,7 @@ def create_gradio_interface(config: Config) -> gr.Interface:
             - **Chunk Size**: Larger chunks = more context per summary, but may hit model limits
             - **Overlap**: Helps maintain continuity between chunks
             - **Temperature**: Lower values = more focused summaries, higher values = more creative
+            - **Jobs**: Summaries run in the background; keep the job ID to follow or cancel a job after reloading the page
             
             ## 🎬 Sample VTT Format
             ```
@@ -338,7 +454,19 @@ def create_gradio_interface(config: Config) -> gr.Interface:
         summarize_btn.click(
             fn=process_vtt_file,
             inputs=[file_input, chunk_size_input, chunk_overlap_input, temperature_input],
-            outputs=[summary_output, stats_output, status_output]
+            outputs=[job_id_input, summary_output, stats_output, status_output]
+        )
+        
+        follow_btn.click(
+            fn=follow_job,
+            inputs=[job_id_input],
+            outputs=[job_id_input, summary_output, stats_output, status_output]
+        )
+        
+        cancel_btn.click(
+            fn=cancel_job,
+            inputs=[job_id_input],
+            outputs=[status_output]
         )
         
         health_btn.click(
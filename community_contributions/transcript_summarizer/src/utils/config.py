@@ -29,6 +29,18 @@ class Config(BaseSettings):
         description="Name of the Ollama model to use"
     )
 
+    ollama_keep_alive: str = Field(
+        default="30m",
+        env="OLLAMA_KEEP_ALIVE",
+        description="How long Ollama keeps the model loaded after the last summary finishes (e.g. '30m', '3600' seconds, '-1' for ever)"
+    )
+
+    ollama_warm_up: bool = Field(
+        default=True,
+        env="OLLAMA_WARM_UP",
+        description="Load the Ollama model at startup instead of on the first request"
+    )
+
     # Gemini Configuration
     gemini_api_key: Optional[str] = Field(
         default=None,
@@ -41,6 +53,43 @@ class Config(BaseSettings):
         env="GEMINI_MODEL_NAME",
         description="Name of the Gemini model to use"
     )
+
+    gemini_requests_per_minute: int = Field(
+        default=10,
+        env="GEMINI_REQUESTS_PER_MINUTE",
+        description="Gemini request quota (RPM) enforced client-side (0 disables the limit)"
+    )
+
+    gemini_tokens_per_minute: int = Field(
+        default=250000,
+        env="GEMINI_TOKENS_PER_MINUTE",
+        description="Gemini input token quota (TPM) enforced client-side (0 disables the limit)"
+    )
+    
+    # Hedging Configuration
+    hedge_backend: str = Field(
+        default="",
+        env="HEDGE_BACKEND",
+        description="Second backend for hedged and failed-over requests: 'ollama', 'gemini', or empty to disable"
+    )
+    
+    hedge_ollama_base_url: str = Field(
+        default="",
+        env="HEDGE_OLLAMA_BASE_URL",
+        description="Base URL of the second Ollama host when HEDGE_BACKEND is 'ollama'"
+    )
+    
+    hedge_percentile: float = Field(
+        default=0.95,
+        env="HEDGE_PERCENTILE",
+        description="Primary latency percentile after which a request is duplicated to the second backend"
+    )
+    
+    hedge_max_ratio: float = Field(
+        default=0.1,
+        env="HEDGE_MAX_RATIO",
+        description="Largest fraction of requests that may be hedged"
+    )
     
     # Chunking Configuration
     chunk_size: int = Field(
@@ -55,6 +104,45 @@ class Config(BaseSettings):
         description="Token overlap between chunks"
     )
     
+    context_window: int = Field(
+        default=8192,
+        env="CONTEXT_WINDOW",
+        description="Model context window in tokens; bounds how many summaries are merged per reduce step"
+    )
+    
+    # Summary Cache Configuration
+    summary_cache_path: str = Field(
+        default=".cache/summaries.db",
+        env="SUMMARY_CACHE_PATH",
+        description="SQLite file caching chunk summaries between runs"
+    )
+    
+    summary_cache_max_mb: int = Field(
+        default=100,
+        env="SUMMARY_CACHE_MAX_MB",
+        description="Size limit of the chunk summary cache in MB (0 disables the cache)"
+    )
+    
+    # Telemetry Configuration
+    telemetry_path: str = Field(
+        default=".cache/telemetry.jsonl",
+        env="TELEMETRY_PATH",
+        description="JSONL file each summarization run appends its token, throughput and latency telemetry to (empty disables it)"
+    )
+    
+    # Background Job Configuration
+    job_db_path: str = Field(
+        default=".cache/jobs.db",
+        env="JOB_DB_PATH",
+        description="SQLite file holding queued, running and finished summarization jobs"
+    )
+    
+    job_workers: int = Field(
+        default=2,
+        env="JOB_WORKERS",
+        description="Summarization jobs processed at the same time"
+    )
+    
     # Gradio Configuration
     gradio_port: int = Field(
         default=7860,
@@ -69,12 +157,42 @@ class Config(BaseSettings):
         description="Maximum concurrent API requests"
     )
     
+    max_retries: int = Field(
+        default=3,
+        env="MAX_RETRIES",
+        description="Retries for rate-limited, failed (5xx) or timed out API requests"
+    )
+    
     request_timeout: int = Field(
         default=300,
         env="REQUEST_TIMEOUT",
         description="Request timeout in seconds"
     )
     
+    http_max_connections: int = Field(
+        default=20,
+        env="HTTP_MAX_CONNECTIONS",
+        description="Connections the shared async HTTP pool opens across all hosts (synchronous calls are only limited per host)"
+    )
+    
+    http_max_connections_per_host: int = Field(
+        default=10,
+        env="HTTP_MAX_CONNECTIONS_PER_HOST",
+        description="Connections the shared HTTP pools open per host; further requests wait for a free one"
+    )
+    
+    http_keepalive_seconds: float = Field(
+        default=60.0,
+        env="HTTP_KEEPALIVE_SECONDS",
+        description="Seconds an idle pooled connection is kept open"
+    )
+    
+    health_cache_seconds: float = Field(
+        default=30.0,
+        env="HEALTH_CACHE_SECONDS",
+        description="Seconds a service health check is reused before it is refreshed in the background"
+    )
+    
     # Temperature for LLM
     temperature: float = Field(
         default=0.3,
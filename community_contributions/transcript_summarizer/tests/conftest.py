@@ -0,0 +1,18 @@
+import pytest
+import tiktoken
+
+@pytest.fixture(scope="session")
+def byte_encoding():
+    """Byte-level tiktoken encoding built locally, standing in for cl100k_base (one token per UTF-8 byte)."""
+    return tiktoken.Encoding(
+        name="test_bytes",
+        pat_str=r"""\s+|\S+""",
+        mergeable_ranks={bytes([i]): i for i in range(256)},
+        special_tokens={}
+    )
+
+@pytest.fixture(autouse=True)
+def offline_tokenizer(monkeypatch, byte_encoding):
+    """Keep tiktoken from downloading cl100k_base, so the tests run offline."""
+    monkeypatch.setattr(tiktoken, "get_encoding", lambda name: byte_encoding)
+    monkeypatch.setattr(tiktoken, "encoding_for_model", lambda model: byte_encoding)
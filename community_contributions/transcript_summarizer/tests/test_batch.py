@@ -0,0 +1,121 @@
+import os
+import json
+import asyncio
+import pytest
+from src.core.batch import BatchManifest, BatchRunner, ManifestEntry, discover_transcripts, prepare_transcript, summary_path_for
+from src.utils.config import Config
+
+SAMPLE_VTT = """WEBVTT
+
+00:00:00.000 --> 00:00:03.000
+Hello and welcome to our presentation.
+
+00:00:03.000 --> 00:00:07.000
+Today we'll discuss artificial intelligence.
+"""
+
+class FakeResult:
+    summary = "A short summary."
+    chunk_timeline = []
+    chunks_processed = 1
+    error = None
+
+class FakeService:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+class FakeSummarizer:
+    """Stands in for TranscriptSummarizer without an LLM."""
+
+    def __init__(self, fail_on=None):
+        self.config = Config(chunk_size=100, chunk_overlap=20, max_concurrent_requests=2)
+        self.llm_service = FakeService()
+        self.fail_on = fail_on
+        self.calls = []
+        self.warmed_up = False
+
+    def warm_up_model(self):
+        self.warmed_up = True
+
+    async def summarize_text(self, text, chunks=None):
+        self.calls.append(text)
+        if self.fail_on and self.fail_on in text:
+            raise RuntimeError("LLM unavailable")
+        return FakeResult()
+
+class TestBatch:
+    """Test cases for headless batch summarization."""
+
+    @pytest.fixture(autouse=True)
+    def setup_files(self, tmp_path):
+        """Set up test fixtures."""
+        self.root = tmp_path
+        (tmp_path / "lectures" / "week1").mkdir(parents=True)
+        for name in ["lectures/a.vtt", "lectures/week1/b.vtt", "lectures/notes.txt"]:
+            (tmp_path / name).write_text(SAMPLE_VTT.replace("Hello", f"Hello {name}"))
+        self.manifest_path = str(tmp_path / "manifest.jsonl")
+
+    def test_discover_transcripts(self):
+        """Test directory and glob expansion."""
+        by_directory = discover_transcripts([str(self.root / "lectures")])
+        by_glob = discover_transcripts([str(self.root / "lectures" / "*.vtt")])
+
+        assert [os.path.basename(path) for path in by_directory] == ["a.vtt", "b.vtt"]
+        assert [os.path.basename(path) for path in by_glob] == ["a.vtt"]
+
+    def test_prepare_transcript(self):
+        """Test parsing and chunking of one file."""
+        text, chunks = prepare_transcript(str(self.root / "lectures" / "a.vtt"), 100, 20)
+
+        assert text.startswith("Hello lectures/a.vtt and welcome")
+        assert chunks[0].start_time == 0.0
+
+    def test_run_writes_summaries_and_resumes(self):
+        """Test that a second run skips files finished by the first."""
+        files = discover_transcripts([str(self.root / "lectures")])
+        summarizer = FakeSummarizer(fail_on="week1/b.vtt")
+
+        counts = asyncio.run(BatchRunner(summarizer, BatchManifest(self.manifest_path), workers=1).run(files))
+
+        assert counts == {"done": 1, "failed": 1, "skipped": 0}
+        assert summarizer.warmed_up
+        assert os.path.exists(summary_path_for(files[0]))
+        assert "A short summary." in open(summary_path_for(files[0]), encoding="utf-8").read()
+        statuses = [json.loads(line)["status"] for line in open(self.manifest_path, encoding="utf-8")]
+        assert sorted(statuses) == ["done", "failed"]
+
+        # Resume: only the failed file is retried
+        summarizer = FakeSummarizer()
+        counts = asyncio.run(BatchRunner(summarizer, BatchManifest(self.manifest_path), workers=1).run(files))
+
+        assert counts == {"done": 1, "failed": 0, "skipped": 1}
+        assert len(summarizer.calls) == 1
+
+    def test_missing_file_is_recorded_as_failed(self):
+        """Test that a transcript deleted after discovery fails on its own without stopping the run."""
+        files = discover_transcripts([str(self.root / "lectures")])
+        asyncio.run(BatchRunner(FakeSummarizer(), BatchManifest(self.manifest_path), workers=1).run(files))
+        os.remove(files[0])
+
+        manifest = BatchManifest(self.manifest_path)
+        counts = asyncio.run(BatchRunner(FakeSummarizer(), manifest, workers=1).run(files))
+
+        assert counts == {"done": 0, "failed": 1, "skipped": 1}
+        assert manifest.entries[files[0]].status == "failed"
+        assert manifest.entries[files[0]].size == 0
+
+    def test_manifest_ignores_truncated_line(self):
+        """Test that a line cut short by a crash does not break resuming."""
+        path = str(self.root / "lectures" / "a.vtt")
+        manifest = BatchManifest(self.manifest_path)
+        manifest.record(ManifestEntry(file=path, status="failed", size=1, mtime=1.0))
+        with open(self.manifest_path, "a", encoding="utf-8") as file:
+            file.write('{"file": "trunc')
+
+        reopened = BatchManifest(self.manifest_path)
+
+        assert reopened.entries[path].status == "failed"
+        assert not reopened.is_done(path)
@@ -1,5 +1,6 @@
 import pytest
 from src.core.chunker import TextChunker, TextChunk
+from src.core.segment_store import SegmentStore
 
 class TestTextChunker:
     """Test cases for text chunking functionality."""
@@ -59,3 +60,64 @@ class TestTextChunker:
         
         for i, chunk in enumerate(chunks):
             assert chunk.chunk_id == i
+    
+    def test_chunk_indices_are_exact(self):
+        """Test that chunk offsets point at the chunk content in the source text."""
+        text = " ".join(f"Sentence number {i} talks about topic {i % 7}." for i in range(200))
+        chunks = self.chunker.chunk_text(text)
+        
+        assert len(chunks) > 1
+        for chunk in chunks:
+            assert text[chunk.start_index:chunk.end_index] == chunk.content
+            assert chunk.token_count <= self.chunker.chunk_size
+        assert chunks[-1].end_index == len(text)
+        assert all(chunk.content.endswith(".") for chunk in chunks[:-1])
+    
+    def test_sentence_chunks_overlap_whole_sentences(self):
+        """Test that sentence chunks share whole sentences and keep exact offsets."""
+        sentences = [f"Sentence number {i} talks about topic {i % 7}." for i in range(60)]
+        text = " ".join(sentences)
+        chunker = TextChunker(chunk_size=100, overlap_size=50)
+        chunks = chunker.chunk_by_sentences(text)
+        
+        assert len(chunks) > 1
+        for chunk in chunks:
+            assert chunk.token_count <= chunker.chunk_size
+            assert text[chunk.start_index:chunk.end_index] == chunk.content
+        for previous, current in zip(chunks, chunks[1:]):
+            first_sentence = current.content.split(". ")[0] + "."
+            assert first_sentence in sentences
+            assert previous.content.endswith(first_sentence)
+    
+    def test_long_sentence_is_split(self):
+        """Test that a sentence over the chunk size is split by tokens."""
+        text = " ".join(["word"] * 300)
+        chunks = self.chunker.chunk_by_sentences(text)
+        
+        assert len(chunks) > 1
+        assert all(chunk.token_count <= self.chunker.chunk_size for chunk in chunks)
+        assert [chunk.chunk_id for chunk in chunks] == list(range(len(chunks)))
+    
+    def test_chunk_segments(self):
+        """Test cue-aligned chunks carry their time range."""
+        store = SegmentStore()
+        for i in range(40):
+            store.append(i * 5.0, i * 5.0 + 4.0, f"Cue {i} says something about topic {i % 7}.")
+        chunker = TextChunker(chunk_size=100, overlap_size=50)
+        chunks = chunker.chunk_segments(store)
+        
+        assert len(chunks) > 1
+        assert chunks[0].start_time == 0.0
+        assert chunks[-1].end_time == 39 * 5.0 + 4.0
+        for chunk in chunks:
+            assert chunk.token_count <= chunker.chunk_size
+            assert store.full_text()[chunk.start_index:chunk.end_index] == chunk.content
+            assert chunk.content.startswith("Cue ")
+            assert chunk.start_time < chunk.end_time
+        # Consecutive chunks share whole cues
+        for previous, current in zip(chunks, chunks[1:]):
+            assert current.start_time < previous.end_time
+    
+    def test_chunk_segments_empty(self):
+        """Test that an empty store gives no chunks."""
+        assert self.chunker.chunk_segments(SegmentStore()) == []
@@ -0,0 +1,117 @@
+import asyncio
+import pytest
+from src.services.hedging import HedgedService
+from src.services.ollama_service import OllamaResponse
+from src.services.request_scheduler import RequestScheduler
+
+class FakeService:
+    """Backend answering after a configurable delay per prompt."""
+
+    def __init__(self, name, delays=None, fail=False):
+        self.name = name
+        self.delays = delays or {}
+        self.fail = fail
+        self.scheduler = RequestScheduler(max_concurrency=10, max_retries=0)
+        self.calls = []
+        self.cancelled = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def generate_async(self, prompt, temperature=0.3, system_prompt=None, max_output_tokens=None):
+        self.calls.append(prompt)
+        try:
+            await asyncio.sleep(self.delays.get(prompt, 0.01))
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            raise Exception(f"{self.name} unavailable")
+        return OllamaResponse(content=f"{self.name}: {prompt}", model=self.name)
+
+    async def generate_stream(self, prompt, temperature=0.3, system_prompt=None, on_done=None):
+        if self.fail:
+            raise Exception(f"{self.name} unavailable")
+        yield f"{self.name} "
+        yield prompt
+
+class TestHedgedService:
+    """Test cases for hedged requests and failover."""
+
+    def test_no_hedging_until_latencies_are_learned(self):
+        """Test that nothing is hedged before min_samples latencies are known."""
+        primary = FakeService("primary", {"slow": 0.2})
+        secondary = FakeService("secondary")
+        service = HedgedService(primary, secondary, min_samples=5, max_hedge_ratio=1.0)
+
+        response = asyncio.run(service.generate_async("slow"))
+
+        assert response.content == "primary: slow"
+        assert secondary.calls == []
+
+    def test_slow_request_is_hedged(self):
+        """Test that a request slower than the learned percentile goes to the second backend too."""
+        primary = FakeService("primary", {"slow": 1.0})
+        secondary = FakeService("secondary")
+        service = HedgedService(primary, secondary, min_samples=5, max_hedge_ratio=0.5)
+
+        async def run():
+            async with service:
+                await service.generate_multiple_async([f"fast {i}" for i in range(9)])
+                return await service.generate_async("slow")
+
+        response = asyncio.run(run())
+        report = service.latency_report()
+
+        assert response.content == "secondary: slow"
+        assert response.latency < 0.5
+        assert primary.cancelled == 1
+        assert report["hedges"] >= 1
+        assert report["hedge_wins"] == 1
+        assert report["primary_max"] < 1.0
+
+    def test_hedge_ratio_is_capped(self):
+        """Test that hedges stay within max_hedge_ratio."""
+        primary = FakeService("primary", {f"slow {i}": 0.05 for i in range(10)})
+        secondary = FakeService("secondary")
+        service = HedgedService(primary, secondary, min_samples=1, max_hedge_ratio=0.1)
+        service._primary_latencies.append(0.01)
+
+        async def run():
+            for i in range(10):
+                await service.generate_async(f"slow {i}")
+
+        asyncio.run(run())
+
+        assert service.stats.hedges <= 1
+
+    def test_failover_on_error(self):
+        """Test that failed primary requests are answered by the second backend."""
+        service = HedgedService(FakeService("primary", fail=True), FakeService("secondary"))
+
+        response = asyncio.run(service.generate_async("prompt"))
+
+        assert response.content == "secondary: prompt"
+        assert service.stats.failovers == 1
+
+    def test_both_backends_failing_raises(self):
+        """Test that the primary's error is raised when the second backend fails as well."""
+        service = HedgedService(FakeService("primary", fail=True), FakeService("secondary", fail=True))
+
+        with pytest.raises(Exception) as exc_info:
+            asyncio.run(service.generate_async("prompt"))
+
+        assert "primary unavailable" in str(exc_info.value)
+        assert service.stats.failures == 1
+
+    def test_stream_fails_over_before_first_token(self):
+        """Test that a stream that fails to start is served by the second backend."""
+        service = HedgedService(FakeService("primary", fail=True), FakeService("secondary"))
+
+        async def collect():
+            return [delta async for delta in service.generate_stream("prompt")]
+
+        assert asyncio.run(collect()) == ["secondary ", "prompt"]
@@ -0,0 +1,57 @@
+import asyncio
+from src.services import http_pool
+from src.services.http_pool import PoolLimits, close_async_session, close_sync_session, configure_pool, get_async_session, get_sync_session
+from src.services.ollama_service import OllamaService
+
+class TestHttpPool:
+    """Test cases for the shared HTTP clients."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        configure_pool(PoolLimits(max_connections=7, max_connections_per_host=3, keepalive_timeout=5.0))
+        close_sync_session()
+
+    def teardown_method(self):
+        """Restore the default limits."""
+        configure_pool(PoolLimits())
+        close_sync_session()
+
+    def test_sync_session_is_shared_and_pooled(self):
+        """Test that synchronous calls share one session, blocking at the per-host limit."""
+        session = get_sync_session()
+        adapter = session.get_adapter("http://localhost:11434")
+
+        assert get_sync_session() is session
+        assert OllamaService().http is session
+        assert adapter._pool_maxsize == 3
+        assert adapter._pool_block is True
+
+    def test_async_session_is_shared_within_a_loop(self):
+        """Test that services and runs on one event loop share a session that outlives them."""
+        first, second = OllamaService(), OllamaService(base_url="http://other:11434")
+
+        async def run():
+            async with first:
+                async with second:
+                    assert first.session is second.session
+            assert first.session is None
+            session = get_async_session()
+            async with first:
+                assert first.session is session
+            assert not session.closed
+            assert session.connector.limit == 7
+            assert session.connector.limit_per_host == 3
+            await close_async_session()
+            return session
+
+        assert asyncio.run(run()).closed
+
+    def test_each_loop_gets_its_own_session(self):
+        """Test that sessions are not shared between event loops."""
+        async def open_session():
+            session = get_async_session()
+            await close_async_session()
+            return session
+
+        assert asyncio.run(open_session()) is not asyncio.run(open_session())
+        assert len(http_pool._async_sessions) == 0
@@ -0,0 +1,139 @@
+import asyncio
+import time
+import pytest
+from src.services.job_queue import JobQueue, DONE, FAILED, CANCELLED, QUEUED
+
+def wait_for(queue, job_id, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = queue.get(job_id)
+        if job.finished:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+class TestJobQueue:
+    """Test cases for the SQLite-backed job queue."""
+
+    @pytest.fixture(autouse=True)
+    def setup_queue(self, tmp_path):
+        """Set up test fixtures."""
+        self.db_path = str(tmp_path / "jobs.db")
+        self.active = 0
+        self.peak = 0
+
+        async def handler(job, report):
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            try:
+                report("working")
+                report("writing", partial_summary="partial")
+                await asyncio.sleep(job.params.get("seconds", 0.05))
+                if job.params.get("fail"):
+                    raise RuntimeError("model unavailable")
+                return {"summary": f"summary of {job.file_path}"}
+            finally:
+                self.active -= 1
+
+        self.handler = handler
+        self.queue = JobQueue(self.db_path, handler, max_workers=2)
+        self.queue.start()
+        yield
+        self.queue.shutdown()
+
+    def test_jobs_complete_with_concurrency_cap(self):
+        """Test that jobs finish, keep their results and respect max_workers."""
+        job_ids = [self.queue.submit(f"file{i}.vtt") for i in range(5)]
+        jobs = [wait_for(self.queue, job_id) for job_id in job_ids]
+
+        assert [job.status for job in jobs] == [DONE] * 5
+        assert jobs[0].result == {"summary": "summary of file0.vtt"}
+        assert jobs[0].partial_summary == "partial"
+        assert self.peak == 2
+
+    def test_failed_job_keeps_error(self):
+        """Test that handler errors are stored on the job."""
+        job = wait_for(self.queue, self.queue.submit("bad.vtt", {"fail": True}))
+
+        assert job.status == FAILED
+        assert job.error == "model unavailable"
+
+    def test_cancel_running_and_queued_jobs(self):
+        """Test cancelling a running job and a job still waiting for a worker."""
+        running = [self.queue.submit("long.vtt", {"seconds": 5}) for _ in range(2)]
+        waiting = self.queue.submit("waiting.vtt")
+        while self.queue.get(running[0]).status == QUEUED:
+            time.sleep(0.01)
+
+        assert self.queue.cancel(running[0])
+        assert self.queue.cancel(waiting)
+        assert wait_for(self.queue, running[0]).status == CANCELLED
+        assert self.queue.get(waiting).status == CANCELLED
+        assert not self.queue.cancel(waiting)
+        self.queue.cancel(running[1])
+
+    def test_job_cancelled_before_start_never_runs(self, tmp_path):
+        """Test that a job cancelled after a worker picked it up, but before it started, stays cancelled."""
+        started = []
+
+        async def handler(job, report):
+            started.append(job.id)
+            return {}
+
+        queue = JobQueue(str(tmp_path / "unstarted.db"), handler)
+        job_id = queue.submit("file.vtt")
+        picked_up = queue.get(job_id)
+
+        assert queue.cancel(job_id)
+        asyncio.run(queue._run(picked_up))
+
+        assert started == []
+        assert queue.get(job_id).status == CANCELLED
+        queue._conn.close()
+
+    def test_cancel_right_after_submit(self):
+        """Test that jobs cancelled while workers are picking them up all end cancelled."""
+        job_ids = [self.queue.submit("long.vtt", {"seconds": 5}) for _ in range(10)]
+        for job_id in job_ids:
+            assert self.queue.cancel(job_id)
+
+        assert [wait_for(self.queue, job_id, timeout=2.0).status for job_id in job_ids] == [CANCELLED] * 10
+
+    def test_finished_job_files_are_deleted(self, tmp_path):
+        """Test that with delete_finished_files each job's file is removed once it ends, however it ends."""
+        self.queue.shutdown()
+        self.queue = JobQueue(self.db_path, self.handler, max_workers=1, delete_finished_files=True)
+        self.queue.start()
+        paths = {name: tmp_path / f"{name}.vtt" for name in ("done", "failed", "running", "waiting")}
+        for path in paths.values():
+            path.write_text("WEBVTT")
+
+        done = self.queue.submit(str(paths["done"]))
+        failed = self.queue.submit(str(paths["failed"]), {"fail": True})
+        wait_for(self.queue, failed)
+        running = self.queue.submit(str(paths["running"]), {"seconds": 5})
+        waiting = self.queue.submit(str(paths["waiting"]))
+        while self.queue.get(running).status == QUEUED:
+            time.sleep(0.01)
+        self.queue.cancel(waiting)
+        self.queue.cancel(running)
+        wait_for(self.queue, running)
+
+        assert self.queue.get(done).status == DONE
+        assert [path.exists() for path in paths.values()] == [False] * 4
+
+    def test_results_survive_restart(self):
+        """Test that finished jobs are kept and unfinished ones resume after a restart."""
+        done = wait_for(self.queue, self.queue.submit("file.vtt"))
+        interrupted = self.queue.submit("long.vtt", {"seconds": 5})
+        while self.queue.get(interrupted).status == QUEUED:
+            time.sleep(0.01)
+        self.queue.shutdown()
+
+        self.queue = JobQueue(self.db_path, self.handler, max_workers=2)
+        assert self.queue.get(done.id).result == {"summary": "summary of file.vtt"}
+        self.queue.start()
+
+        assert self.queue.get(interrupted).status in (QUEUED, "running")
+        assert [job.id for job in self.queue.list_jobs()] == [interrupted, done.id]
+        self.queue.cancel(interrupted)
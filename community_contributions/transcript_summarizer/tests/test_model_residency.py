@@ -0,0 +1,103 @@
+import asyncio
+from unittest.mock import Mock, patch
+from src.services.ollama_service import OllamaService, OllamaResponse
+from src.services.model_residency import (
+    HOLD_KEEP_ALIVE, ModelResidency, ModelTimings, context_size, parse_keep_alive
+)
+
+class TestModelResidency:
+    """Test cases for Ollama model residency management."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.service = OllamaService(model="llama3.1:8b")
+        self.residency = ModelResidency(self.service, keep_alive="30m", num_ctx=4096)
+
+    def test_context_size_rounds_up(self):
+        """Test sizing of num_ctx from prompt and output tokens."""
+        assert context_size(2100, 1000) == 4096
+        assert context_size(1000, 24) == 1024
+        assert context_size(1000, 24, minimum=8192) == 8192
+
+    def test_parse_keep_alive(self):
+        """Test that numeric keep-alives are sent as numbers."""
+        assert parse_keep_alive("30m") == "30m"
+        assert parse_keep_alive("-1") == -1
+        assert parse_keep_alive("3600") == 3600
+
+    def test_timings_separate_load_from_eval(self):
+        """Test aggregation of backend timings."""
+        timings = ModelTimings()
+        timings.add(OllamaResponse(content="", model="m", load_duration=9_000_000_000,
+                                   prompt_eval_duration=1_000_000_000, eval_duration=2_000_000_000))
+        timings.add(OllamaResponse(content="", model="m", load_duration=5_000_000,
+                                   prompt_eval_duration=500_000_000, eval_duration=1_500_000_000))
+        timings.add(Mock(spec=["content"]))
+
+        assert timings.requests == 3
+        assert timings.cold_loads == 1
+        assert abs(timings.load_seconds - 9.005) < 1e-9
+        assert abs(timings.compute_seconds - 5.0) < 1e-9
+
+    @patch('src.services.http_pool.requests.Session.post')
+    def test_requests_carry_residency_settings(self, mock_post):
+        """Test that keep_alive and num_ctx are sent with generation requests."""
+        mock_post.return_value = Mock(status_code=200, json=Mock(return_value={"response": "ok"}))
+
+        self.service.generate_sync("Test prompt")
+        payload = mock_post.call_args.kwargs["json"]
+
+        assert payload["keep_alive"] == "30m"
+        assert payload["options"]["num_ctx"] == 4096
+
+    @patch('src.services.http_pool.requests.Session.post')
+    def test_warm_up_loads_model(self, mock_post):
+        """Test that warm-up loads the model with the same context size and no prompt."""
+        mock_post.return_value = Mock(status_code=200, json=Mock(return_value={"load_duration": 2_500_000_000}))
+
+        assert self.residency.warm_up() == 2.5
+        payload = mock_post.call_args.kwargs["json"]
+        assert "prompt" not in payload
+        assert payload["options"] == {"num_ctx": 4096}
+
+    @patch('src.services.http_pool.requests.Session.post')
+    def test_resident_holds_until_last_run_finishes(self, mock_post):
+        """Test that overlapping runs keep the model loaded and the idle keep-alive returns afterwards."""
+        mock_post.return_value = Mock(status_code=200, json=Mock(return_value={}))
+        seen = []
+
+        async def run(seconds):
+            async with self.residency.resident():
+                seen.append(self.service.keep_alive)
+                await asyncio.sleep(seconds)
+
+        async def main():
+            await asyncio.gather(run(0.01), run(0.05))
+
+        asyncio.run(main())
+
+        assert seen == [HOLD_KEEP_ALIVE, HOLD_KEEP_ALIVE]
+        assert self.service.keep_alive == "30m"
+        # Only the last run to finish resets the idle countdown
+        assert mock_post.call_count == 1
+        assert mock_post.call_args.kwargs["json"]["keep_alive"] == "30m"
+
+    @patch('src.services.http_pool.requests.Session.post')
+    def test_context_is_not_lowered_under_a_run(self, mock_post):
+        """Test that a run needing a smaller context does not shrink it while a larger run is in progress."""
+        mock_post.return_value = Mock(status_code=200, json=Mock(return_value={}))
+        seen = []
+
+        async def run(num_ctx, seconds):
+            async with self.residency.resident(num_ctx):
+                await asyncio.sleep(seconds)
+                seen.append(self.service.num_ctx)
+
+        async def main():
+            await asyncio.gather(run(8192, 0.05), run(2048, 0.01))
+
+        asyncio.run(main())
+
+        assert seen == [8192, 8192]
+        asyncio.run(run(2048, 0))
+        assert seen[-1] == 2048
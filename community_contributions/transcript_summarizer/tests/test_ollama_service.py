@@ -13,7 +13,7 @@ class TestOllamaService:
             timeout=30
         )
     
-    @patch('src.services.ollama_service.requests.get')
+    @patch('src.services.http_pool.requests.Session.get')
     def test_test_connection_success(self, mock_get):
         """Test successful connection test."""
         mock_response = Mock()
@@ -23,7 +23,7 @@ class TestOllamaService:
         result = self.service.test_connection()
         assert result is True
     
-    @patch('src.services.ollama_service.requests.get')
+    @patch('src.services.http_pool.requests.Session.get')
     def test_test_connection_failure(self, mock_get):
         """Test failed connection test."""
         mock_get.side_effect = Exception("Connection failed")
@@ -31,7 +31,7 @@ class TestOllamaService:
         result = self.service.test_connection()
         assert result is False
     
-    @patch('src.services.ollama_service.requests.get')
+    @patch('src.services.http_pool.requests.Session.get')
     def test_check_model_availability(self, mock_get):
         """Test model availability check."""
         mock_response = Mock()
@@ -47,7 +47,7 @@ class TestOllamaService:
         result = self.service.check_model_availability()
         assert result is True
     
-    @patch('src.services.ollama_service.requests.post')
+    @patch('src.services.http_pool.requests.Session.post')
     def test_generate_sync_success(self, mock_post):
         """Test successful synchronous generation."""
         mock_response = Mock()
@@ -66,7 +66,7 @@ class TestOllamaService:
         assert result.content == "This is a test response"
         assert result.model == "llama3.1:8b"
     
-    @patch('src.services.ollama_service.requests.post')
+    @patch('src.services.http_pool.requests.Session.post')
     def test_generate_sync_failure(self, mock_post):
         """Test failed synchronous generation."""
         mock_post.side_effect = Exception("API Error")
@@ -0,0 +1,101 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+from src.services.gemini_service import GeminiService
+from src.services.rate_limiter import RateLimiter, TokenBucket, get_rate_limiter, parse_retry_delay
+from src.services.request_scheduler import RequestScheduler
+
+class TestRateLimiter:
+    """Test cases for the RPM/TPM rate limiter."""
+
+    def test_bucket_reservations_queue_in_order(self):
+        """Test that reservations beyond the capacity wait for the refill."""
+        bucket = TokenBucket(capacity=10, refill_per_second=2)
+        now = bucket.updated
+
+        assert bucket.reserve(10, now) == 0.0
+        assert bucket.reserve(4, now) == 2.0
+        assert bucket.reserve(4, now) == 4.0
+        # Oversized requests wait for a full bucket, not for ever
+        assert bucket.reserve(100, now + 4.0) == 5.0
+
+    def test_requests_per_minute(self):
+        """Test that requests beyond the per-minute burst are delayed."""
+        limiter = RateLimiter(requests_per_minute=60)
+
+        delays = [limiter.reserve(0) for _ in range(61)]
+
+        assert max(delays[:60]) == 0.0
+        assert 0.9 < delays[60] <= 1.0
+        assert limiter.stats.delayed == 1
+
+    def test_tokens_per_minute_and_settle(self):
+        """Test token quota and correction by the reported usage."""
+        limiter = RateLimiter(tokens_per_minute=600)
+
+        assert limiter.reserve(300) == 0.0
+        limiter.settle(300, 100)
+        assert limiter.reserve(300) == 0.0
+        assert limiter.reserve(300) > 0.0
+        assert limiter.stats.actual_tokens == 100
+
+    def test_penalize_blocks_until_retry_delay(self):
+        """Test that a 429 pauses all requests for the server's retry delay."""
+        limiter = RateLimiter(requests_per_minute=1000)
+
+        limiter.penalize(5.0)
+
+        assert 4.9 < limiter.reserve(0) <= 6.0
+        assert limiter.stats.throttled == 1
+
+    def test_acquire_waits(self):
+        """Test that acquire sleeps for the reserved delay."""
+        limiter = RateLimiter(requests_per_minute=600)
+        for _ in range(600):
+            limiter.reserve(0)
+
+        waited = asyncio.run(limiter.acquire(0))
+
+        assert 0.0 < waited <= 0.1
+
+    def test_parse_retry_delay(self):
+        """Test reading retry hints from Google API errors."""
+        detail = SimpleNamespace(retry_delay=SimpleNamespace(seconds=17, nanos=500_000_000))
+        with_details = Exception("429 Resource exhausted")
+        with_details.details = [detail]
+
+        assert parse_retry_delay(with_details) == 17.5
+        assert parse_retry_delay(Exception("429 quota exceeded [retry_delay {\n  seconds: 29\n}\n]")) == 29.0
+        assert parse_retry_delay(Exception("Quota exceeded. Please retry in 12.25s.")) == 12.25
+        assert parse_retry_delay(Exception("429 Resource exhausted")) is None
+
+    def test_registry_shares_budget(self):
+        """Test that services with the same key share one limiter."""
+        first = get_rate_limiter(("test-key", "gemini-test"), 10, 1000)
+        second = get_rate_limiter(("test-key", "gemini-test"), 10, 1000)
+        other = get_rate_limiter(("test-key", "other-model"), 10, 1000)
+
+        assert first is second
+        assert first is not other
+
+    def test_throttling_is_not_read_as_overload(self):
+        """Test that time held back by the limiter counts as queue wait and does not lower the scheduler's limit."""
+        scheduler = RequestScheduler(max_concurrency=3, max_retries=0)
+        service = GeminiService(api_key="throttle-test-key", model="gemini-test", scheduler=scheduler, requests_per_minute=600)
+        service.model = SimpleNamespace(generate_content_async=AsyncMock(
+            return_value=SimpleNamespace(candidates=[], usage_metadata=None)
+        ))
+
+        async def run():
+            await service.generate_multiple_async(["warm up"], stage="chunk")
+            for _ in range(600):
+                service.rate_limiter.reserve(0)
+            return await service.generate_multiple_async(["a", "b", "c"], stage="chunk")
+
+        with patch("src.services.request_scheduler.MIN_BASELINE_SECONDS", 0.001):
+            responses = asyncio.run(run())
+
+        assert scheduler.stats.overload_signals == 0
+        assert scheduler.limit == 3
+        assert all(response.queue_wait >= 0.05 for response in responses)
+        assert scheduler.stats.total_queue_wait >= 0.3
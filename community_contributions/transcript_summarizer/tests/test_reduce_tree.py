@@ -0,0 +1,67 @@
+import asyncio
+import pytest
+from src.core.reduce_tree import input_budget, plan_batches, reduce_tree, total_tokens, SEPARATOR_TOKENS
+
+class TestReduceTree:
+    """Test cases for the hierarchical reduce tree."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.calls = []
+
+        async def reduce_batches(batches, level):
+            self.calls.append((level, [len(batch) for batch in batches]))
+            # Each merged summary is as long as one input summary
+            return ["x" * 10 for _ in batches]
+
+        self.reduce_batches = reduce_batches
+
+    def test_input_budget(self):
+        """Test budget derived from the context window."""
+        assert input_budget(8192, 200, 2048) == 5944
+        assert input_budget(100, 200, 50) == 1
+
+    def test_plan_batches_respects_budget(self):
+        """Test that batches stay within the budget and keep order."""
+        counts = [10] * 10
+        batches = plan_batches(counts, budget=35)
+
+        assert [i for batch in batches for i in batch] == list(range(10))
+        assert all(total_tokens([counts[i] for i in batch]) <= 35 for batch in batches)
+        assert batches[0] == [0, 1, 2]
+
+    def test_plan_batches_oversized_summary(self):
+        """Test that a summary over the budget gets its own batch."""
+        batches = plan_batches([5, 50, 5], budget=20)
+        assert batches == [[0], [1], [2]]
+
+    def test_no_reduce_when_summaries_fit(self):
+        """Test that summaries fitting in one prompt are returned unchanged."""
+        summaries, levels = asyncio.run(reduce_tree(["a", "b"], len, self.reduce_batches, budget=100))
+
+        assert summaries == ["a", "b"]
+        assert levels == []
+        assert self.calls == []
+
+    def test_multi_level_reduce(self):
+        """Test that many summaries are reduced over several levels."""
+        summaries = ["x" * 10] * 20
+        reported = []
+
+        result, levels = asyncio.run(
+            reduce_tree(summaries, len, self.reduce_batches, budget=30 + 2 * SEPARATOR_TOKENS, on_level=reported.append)
+        )
+
+        assert total_tokens([len(s) for s in result]) <= 30 + 2 * SEPARATOR_TOKENS
+        assert [level.inputs for level in levels] == [20, 7]
+        assert [level.outputs for level in levels] == [7, 3]
+        assert levels[0].max_fan_in == 3
+        assert reported == levels
+        assert all(level.seconds >= 0 for level in levels)
+
+    def test_oversized_summaries_are_paired(self):
+        """Test that the tree still shrinks when no two summaries fit together."""
+        result, levels = asyncio.run(reduce_tree(["x" * 10] * 4, len, self.reduce_batches, budget=5))
+
+        assert len(result) == 1
+        assert [level.outputs for level in levels] == [2, 1]
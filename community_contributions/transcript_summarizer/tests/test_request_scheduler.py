@@ -0,0 +1,147 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+from src.services.request_scheduler import RequestScheduler, RetryableRequestError, parse_retry_after
+
+class TestRequestScheduler:
+    """Test cases for the adaptive request scheduler."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.scheduler = RequestScheduler(max_concurrency=3, max_retries=2, base_delay=0.01, max_delay=0.05)
+
+    def test_caps_in_flight_requests(self):
+        """Test that no more than max_concurrency requests run at once."""
+        active = 0
+        peak = 0
+
+        async def request(i):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return i
+
+        results = asyncio.run(self.scheduler.map([lambda i=i: request(i) for i in range(10)]))
+
+        assert results == list(range(10))
+        assert peak == 3
+        assert self.scheduler.stats.requests == 10
+        assert self.scheduler.stats.peak_in_flight == 3
+
+    def test_retries_retryable_errors(self):
+        """Test that retryable errors are retried and halve the limit."""
+        attempts = 0
+
+        async def request():
+            nonlocal attempts
+            attempts += 1
+            if attempts < 3:
+                raise RetryableRequestError("busy", status=503)
+            return "ok"
+
+        result = asyncio.run(self.scheduler.run(request))
+
+        assert result == "ok"
+        assert attempts == 3
+        assert self.scheduler.stats.retries == 2
+        assert self.scheduler.stats.overload_signals == 2
+        assert self.scheduler.limit < 3
+
+    def test_gives_up_after_max_retries(self):
+        """Test that the last retryable error is raised."""
+        async def request():
+            raise RetryableRequestError("rate limited", status=429)
+
+        with pytest.raises(RetryableRequestError):
+            asyncio.run(self.scheduler.run(request))
+
+        assert self.scheduler.stats.retries == 2
+        assert self.scheduler.stats.failures == 1
+
+    def test_other_errors_are_not_retried(self):
+        """Test that non-retryable errors fail immediately."""
+        attempts = 0
+
+        async def request():
+            nonlocal attempts
+            attempts += 1
+            raise ValueError("bad request")
+
+        with pytest.raises(ValueError):
+            asyncio.run(self.scheduler.run(request))
+
+        assert attempts == 1
+
+    def test_limit_recovers_after_overload(self):
+        """Test additive increase back to the maximum after successes."""
+        self.scheduler.limit = 1.0
+
+        async def request():
+            return None
+
+        asyncio.run(self.scheduler.map([lambda: request() for _ in range(20)]))
+
+        assert self.scheduler.limit == 3
+
+    def test_slot_shares_the_limit(self):
+        """Test that slot() holders count against the same limit as run()."""
+        self.scheduler.limit = 1.0
+        order = []
+
+        async def streamed():
+            async with self.scheduler.slot():
+                order.append("stream start")
+                await asyncio.sleep(0.02)
+                order.append("stream end")
+
+        async def request():
+            order.append("request")
+
+        async def main():
+            await asyncio.gather(streamed(), self.scheduler.run(request))
+
+        asyncio.run(main())
+
+        assert order == ["stream start", "stream end", "request"]
+        assert self.scheduler.stats.requests == 2
+
+    def test_latency_baseline_is_per_stage(self):
+        """Test that slow requests only count as overload against fast requests of the same stage."""
+        async def request(seconds):
+            await asyncio.sleep(seconds)
+
+        async def main():
+            await self.scheduler.run(lambda: request(0), stage="chunk")
+            await self.scheduler.run(lambda: request(0.05), stage="final")
+            await self.scheduler.run(lambda: request(0.05), stage="final")
+            assert self.scheduler.stats.overload_signals == 0
+            await self.scheduler.run(lambda: request(0.05), stage="chunk")
+
+        with patch("src.services.request_scheduler.MIN_BASELINE_SECONDS", 0.001):
+            asyncio.run(main())
+
+        assert self.scheduler.stats.overload_signals == 1
+
+    def test_stats_since_snapshot(self):
+        """Test that since() only counts the requests made after the snapshot."""
+        async def request():
+            return None
+
+        asyncio.run(self.scheduler.map([lambda: request() for _ in range(4)]))
+        start = self.scheduler.stats.snapshot()
+        asyncio.run(self.scheduler.map([lambda: request() for _ in range(2)]))
+
+        run_stats = self.scheduler.stats.since(start)
+
+        assert self.scheduler.stats.requests == 6
+        assert run_stats["requests"] == 2
+        assert run_stats["retries"] == 0
+        assert run_stats["concurrency_limit"] == self.scheduler.limit
+
+    def test_parse_retry_after(self):
+        """Test Retry-After header parsing."""
+        assert parse_retry_after("5") == 5.0
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") is None
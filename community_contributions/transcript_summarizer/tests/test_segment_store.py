@@ -0,0 +1,65 @@
+import pytest
+from src.core.segment_store import SegmentStore, TranscriptSegment, format_timestamp, parse_timestamp
+
+class TestSegmentStore:
+    """Test cases for the columnar segment store."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.store = SegmentStore()
+        for minute in range(60):
+            self.store.append(minute * 60.0, minute * 60.0 + 30.0, f"Minute {minute}.")
+
+    def test_timestamps(self):
+        """Test conversion between VTT timestamps and seconds."""
+        assert parse_timestamp("01:02:03.500") == 3723.5
+        assert parse_timestamp("02:03.500") == 123.5
+        assert format_timestamp(3723.5) == "01:02:03.500"
+        assert format_timestamp(0) == "00:00:00.000"
+
+    def test_segments(self):
+        """Test indexing, iteration and the joined transcript."""
+        assert len(self.store) == 60
+        assert self.store[1] == TranscriptSegment("00:01:00.000", "00:01:30.000", "Minute 1.")
+        assert self.store[-1].text == "Minute 59."
+        assert [segment.text for segment in self.store][:2] == ["Minute 0.", "Minute 1."]
+        assert self.store.full_text().startswith("Minute 0. Minute 1. Minute 2.")
+        assert self.store.duration_seconds() == 59 * 60 + 30
+
+        with pytest.raises(IndexError):
+            self.store[60]
+
+    def test_text_between(self):
+        """Test time-range lookups."""
+        assert self.store.index_range(30 * 60, 45 * 60) == (30, 45)
+        text = self.store.text_between(30 * 60, 45 * 60)
+
+        assert text.startswith("Minute 30.")
+        assert text.endswith("Minute 44.")
+        assert self.store.text_between() == self.store.full_text()
+        assert self.store.text_between(7200, 9000) == ""
+
+    def test_append_after_reading(self):
+        """Test that segments added after the buffer is read are still found."""
+        self.store.full_text()
+        self.store.append(3600.0, 3630.0, "Minute 60.")
+
+        assert self.store.text(60) == "Minute 60."
+        assert self.store.text_between(59 * 60).endswith("Minute 59. Minute 60.")
+
+    def test_from_cues_sorts_out_of_order_cues(self):
+        """Test that cues out of start time order are sorted."""
+        store = SegmentStore.from_cues([(0.0, 1.0, "a"), (5.0, 6.0, "c"), (2.0, 3.0, "b"), (7.0, 8.0, "d")])
+
+        assert store.full_text() == "a b c d"
+        assert list(store.starts) == [0.0, 2.0, 5.0, 7.0]
+
+    def test_slice(self):
+        """Test copying a time range into a new store."""
+        sliced = self.store.slice(30 * 60, 45 * 60)
+
+        assert len(sliced) == 15
+        assert sliced[0].text == "Minute 30."
+        assert sliced.full_text() == self.store.text_between(30 * 60, 45 * 60)
+        assert sliced.text(14) == "Minute 44."
+        assert len(self.store.slice(7200)) == 0
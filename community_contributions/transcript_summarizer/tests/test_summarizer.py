@@ -0,0 +1,140 @@
+import time
+import asyncio
+import threading
+from unittest.mock import Mock, patch
+from src.core.summarizer import TranscriptSummarizer
+from src.services.ollama_service import OllamaResponse
+from src.utils.config import Config
+
+TEXT = " ".join(f"Sentence number {i} of the weekly planning meeting transcript." for i in range(40))
+
+class FakeService:
+    """Stands in for the LLM backend, answering every prompt as the given model."""
+
+    def __init__(self, model):
+        self.model = model
+        self.prompts = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def generate_async(self, prompt, temperature=0.3, system_prompt=None, max_output_tokens=None):
+        self.prompts.append(prompt)
+        return OllamaResponse(content=f"summary {len(self.prompts)}", model=self.model)
+
+    async def generate_multiple_async(self, prompts, temperature=0.3, system_prompt=None, on_complete=None, stage="default"):
+        responses = []
+        for index, prompt in enumerate(prompts):
+            response = await self.generate_async(prompt, temperature, system_prompt)
+            if on_complete:
+                on_complete(index, response)
+            responses.append(response)
+        return responses
+
+class TestTranscriptSummarizer:
+    """Test cases for the summarization workflow with a fake LLM backend."""
+
+    def _summarizer(self, tmp_path, **overrides):
+        config = Config(
+            llm_provider="ollama",
+            ollama_model_name="llama3.1:8b",
+            chunk_size=200,
+            chunk_overlap=20,
+            summary_cache_path=str(tmp_path / "summaries.db"),
+            telemetry_path="",
+            **overrides
+        )
+        summarizer = TranscriptSummarizer(config)
+        # Releasing the model after a run would otherwise call a local Ollama server
+        summarizer.residency.service.load_model = Mock(return_value=None)
+        return summarizer
+
+    def test_hedged_summaries_are_cached_under_their_model(self, tmp_path):
+        """Test that summaries written by another model are not served as the configured model's."""
+        summarizer = self._summarizer(tmp_path)
+
+        summarizer.llm_service = FakeService("gemini-2.0-flash")
+        first = asyncio.run(summarizer.summarize_text(TEXT))
+        summarizer.llm_service = FakeService("llama3.1:8b")
+        second = asyncio.run(summarizer.summarize_text(TEXT))
+        third = asyncio.run(summarizer.summarize_text(TEXT))
+
+        assert first.chunks_processed > 1
+        assert first.cache_hit_ratio == 0.0
+        assert second.cache_hit_ratio == 0.0
+        assert third.cache_hit_ratio == 1.0
+
+    def test_overrides_apply_to_one_run_only(self, tmp_path):
+        """Test that concurrent runs with different overrides neither see nor change each other's settings."""
+        summarizer = self._summarizer(tmp_path, summary_cache_max_mb=0, temperature=0.3)
+        summarizer.llm_service = FakeService("llama3.1:8b")
+
+        async def main():
+            return await asyncio.gather(
+                summarizer.summarize_text(TEXT, chunk_size=100, chunk_overlap=10, temperature=0.9),
+                summarizer.summarize_text(TEXT)
+            )
+
+        small, default = asyncio.run(main())
+
+        assert small.chunks_processed > default.chunks_processed
+        assert summarizer.config.chunk_size == 200
+        assert summarizer.config.temperature == 0.3
+        assert summarizer.chunker.chunk_size == 200
+
+    @patch('src.services.http_pool.requests.Session.post')
+    @patch('src.services.http_pool.requests.Session.get')
+    def test_health_check_is_cached(self, mock_get, mock_post, tmp_path):
+        """Test that a second health check within health_cache_seconds makes no HTTP calls."""
+        mock_get.return_value = Mock(status_code=200, json=Mock(return_value={"models": [{"name": "llama3.1:8b"}]}))
+        mock_post.return_value = Mock(status_code=200, json=Mock(return_value={"details": {}}))
+        summarizer = self._summarizer(tmp_path, health_cache_seconds=60)
+
+        first = summarizer.check_service_health()
+        calls = mock_get.call_count + mock_post.call_count
+        second = summarizer.check_service_health()
+
+        assert first["connection_ok"] and first["model_available"]
+        assert second is first
+        assert calls > 0
+        assert mock_get.call_count + mock_post.call_count == calls
+
+    def test_stale_health_is_refreshed_once(self, tmp_path):
+        """Test that a stale result is returned right away while exactly one refresh runs in the background."""
+        summarizer = self._summarizer(tmp_path, health_cache_seconds=60)
+        release = threading.Event()
+
+        def check():
+            release.wait(5)
+            return {"connection_ok": True, "timestamp": time.time()}
+
+        summarizer._check_service_health = Mock(side_effect=check)
+        stale = {"connection_ok": False, "timestamp": time.time() - 61}
+        summarizer._health = stale
+
+        results = [summarizer.check_service_health() for _ in range(3)]
+        release.set()
+        deadline = time.time() + 5
+        while summarizer._health is stale and time.time() < deadline:
+            time.sleep(0.01)
+
+        assert results == [stale] * 3
+        assert summarizer.check_service_health()["connection_ok"]
+        assert summarizer._check_service_health.call_count == 1
+
+    def test_concurrent_cold_checks_share_one_refresh(self, tmp_path):
+        """Test that the startup refresh and a page load on a cold cache check the service once."""
+        summarizer = self._summarizer(tmp_path)
+        summarizer._check_service_health = Mock(side_effect=lambda: time.sleep(0.1) or {"timestamp": time.time()})
+
+        startup = threading.Thread(target=summarizer.refresh_service_health)
+        startup.start()
+        time.sleep(0.02)
+        health = summarizer.check_service_health()
+        startup.join()
+
+        assert health is summarizer._health
+        assert summarizer._check_service_health.call_count == 1
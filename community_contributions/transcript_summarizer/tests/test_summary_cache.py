@@ -0,0 +1,56 @@
+import os
+import pytest
+from src.core.summary_cache import SummaryCache, cache_key
+
+class TestSummaryCache:
+    """Test cases for the chunk summary cache."""
+
+    @pytest.fixture(autouse=True)
+    def setup_cache(self, tmp_path):
+        """Set up test fixtures."""
+        self.db_path = str(tmp_path / "cache" / "summaries.db")
+        self.cache = SummaryCache(self.db_path, max_bytes=100)
+        yield
+        self.cache.close()
+
+    def test_cache_key_depends_on_all_inputs(self):
+        """Test that every input changes the key."""
+        base = cache_key("chunk", 1, "ollama", "llama3.1:8b", 0.3)
+
+        assert base == cache_key("chunk", 1, "ollama", "llama3.1:8b", 0.3)
+        assert base != cache_key("other chunk", 1, "ollama", "llama3.1:8b", 0.3)
+        assert base != cache_key("chunk", 2, "ollama", "llama3.1:8b", 0.3)
+        assert base != cache_key("chunk", 1, "gemini", "llama3.1:8b", 0.3)
+        assert base != cache_key("chunk", 1, "ollama", "llama3", 0.3)
+        assert base != cache_key("chunk", 1, "ollama", "llama3.1:8b", 0.4)
+
+    def test_get_and_put(self):
+        """Test storing and reading back a summary."""
+        assert self.cache.get("key") is None
+        self.cache.put("key", "summary")
+
+        assert self.cache.get("key") == "summary"
+        assert self.cache.hits == 1
+        assert self.cache.misses == 1
+        assert self.cache.hit_ratio == 0.5
+
+    def test_persists_between_instances(self):
+        """Test that summaries survive reopening the database."""
+        self.cache.put("key", "summary")
+        reopened = SummaryCache(self.db_path)
+
+        assert reopened.get("key") == "summary"
+        reopened.close()
+
+    def test_evicts_least_recently_used(self):
+        """Test size-bounded eviction."""
+        self.cache.put("a", "x" * 40)
+        self.cache.put("b", "x" * 40)
+        self.cache.get("a")
+        self.cache.put("c", "x" * 40)
+
+        assert self.cache.get("b") is None
+        assert self.cache.get("a") is not None
+        assert self.cache.get("c") is not None
+        assert self.cache.size_bytes() <= 100
+        assert len(self.cache) == 2
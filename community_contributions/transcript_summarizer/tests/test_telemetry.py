@@ -0,0 +1,64 @@
+import json
+from src.core.telemetry import RunTelemetry, export_telemetry, percentile, usage_tokens
+from src.services.ollama_service import OllamaResponse
+from src.services.gemini_service import GeminiResponse
+
+def ollama_response(output_tokens, latency, queue_wait=0.0):
+    return OllamaResponse(
+        content="summary", model="llama3.1:8b", load_duration=10_000_000,
+        prompt_eval_count=500, prompt_eval_duration=190_000_000,
+        eval_count=output_tokens, eval_duration=int(latency * 1e9),
+        queue_wait=queue_wait, latency=latency
+    )
+
+class TestTelemetry:
+    """Test cases for run telemetry."""
+
+    def test_usage_tokens_from_both_providers(self):
+        """Test reading token counts from Ollama and Gemini responses."""
+        assert usage_tokens(ollama_response(100, 1.0)) == (500, 100)
+        assert usage_tokens(GeminiResponse(content="", model="gemini", prompt_tokens=40, completion_tokens=8)) == (40, 8)
+        assert usage_tokens(GeminiResponse(content="", model="gemini")) == (None, None)
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles."""
+        values = [float(value) for value in range(1, 21)]
+
+        assert percentile(values, 0.5) == 10.0
+        assert percentile(values, 0.95) == 19.0
+        assert percentile([], 0.95) == 0.0
+
+    def test_record_and_summary(self):
+        """Test per-request measurements and their aggregates."""
+        telemetry = RunTelemetry()
+        telemetry.record("chunk", 1, ollama_response(100, 1.0, queue_wait=0.0))
+        telemetry.record("chunk", 2, ollama_response(100, 4.0, queue_wait=2.0))
+        final = telemetry.record("final", 1, ollama_response(200, 2.0), queue_wait=1.0, time_to_first_token=0.5)
+        telemetry.wall_time = 10.0
+        summary = telemetry.summary()
+
+        assert telemetry.requests[0].time_to_first_token == 0.2
+        assert final.tokens_per_second == 100.0
+        assert summary["prompt_tokens"] == 1500
+        assert summary["output_tokens"] == 400
+        assert summary["output_tokens_per_second"] == 40.0
+        assert summary["avg_queue_wait"] == 1.0
+        assert summary["max_queue_wait"] == 2.0
+        assert summary["slowest_chunk"] == 2
+        assert summary["slowest_chunk_latency"] == 4.0
+        assert summary["chunk_latency_p95"] == 4.0
+
+    def test_export_appends_json_lines(self, tmp_path):
+        """Test JSONL export of run telemetry."""
+        path = str(tmp_path / "telemetry" / "runs.jsonl")
+        telemetry = RunTelemetry()
+        telemetry.record("chunk", 1, ollama_response(100, 1.0))
+
+        export_telemetry(path, telemetry.to_dict(), provider="ollama")
+        export_telemetry(path, telemetry.to_dict(), provider="ollama")
+        runs = [json.loads(line) for line in open(path, encoding="utf-8")]
+
+        assert len(runs) == 2
+        assert runs[0]["provider"] == "ollama"
+        assert runs[0]["requests"][0]["output_tokens"] == 100
+        assert runs[0]["summary"]["requests"] == 1
@@ -1,6 +1,7 @@
 import pytest
 import tempfile
 import os
+import mmap
 from src.core.vtt_parser import VTTParser, TranscriptSegment
 
 class TestVTTParser:
@@ -64,3 +65,42 @@ Let's start with the basics of machine learning.
         
         with pytest.raises(ValueError):
             self.parser.parse_content(malformed_vtt)
+    
+    def test_parse_bytes_like_content(self):
+        """Test parsing bytes, memoryview and mmap buffers."""
+        data = self.sample_vtt.encode("utf-8")
+        
+        assert len(self.parser.parse_content(data)) == 3
+        assert len(self.parser.parse_content(memoryview(data))) == 3
+        
+        with tempfile.TemporaryFile() as tmp_file:
+            tmp_file.write(data)
+            tmp_file.flush()
+            with mmap.mmap(tmp_file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                segments = self.parser.parse_content(buffer)
+        
+        assert [segment.text for segment in segments][-1] == "Let's start with the basics of machine learning."
+    
+    def test_iter_segments_from_file(self):
+        """Test lazy parsing of a file with identifiers, notes and short timestamps."""
+        content = """WEBVTT
+Kind: captions
+
+NOTE speaker names are tagged
+
+intro
+00:01.000 --> 00:04.000 align:start
+<v Roger>Hello</v>
+  there
+
+00:00:04.000 --> 00:00:05.500
+"""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.vtt', delete=False) as tmp_file:
+            tmp_file.write(content)
+        try:
+            segments = self.parser.iter_segments(tmp_file.name)
+            first = next(segments)
+            assert first == TranscriptSegment("00:00:01.000", "00:00:04.000", "Hello there")
+            assert list(segments) == []
+        finally:
+            os.unlink(tmp_file.name)
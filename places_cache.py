@@ -0,0 +1,221 @@
+import os
+import re
+import time
+import sqlite3
+import logging
+import threading
+from langchain.agents import Tool
+
+logger = logging.getLogger(__name__)
+
+CACHE_PATH = os.getenv("PLACES_CACHE_PATH", "places_cache.db")
+CACHE_TTL_SECONDS = int(os.getenv("PLACES_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+
+# Precision 5 cells are roughly 4.9km x 4.9km, about the size of a Seoul district
+GEOHASH_PRECISION = 5
+_GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+_LOCATION_SPLIT_RE = re.compile(r"\b(?:in|near|around|at|close to|nearby)\b")
+_WORD_RE = re.compile(r"[^\W_]+", re.UNICODE)
+_STOPWORDS = {"a", "an", "the", "of", "for", "with", "and", "some", "good", "best", "top", "find", "me", "please"}
+_LOCATION_SUFFIXES = {"gu", "dong", "district", "city", "area", "neighborhood", "neighbourhood", "station"}
+
+
+def geohash_encode(lat: float, lng: float, precision: int = 9) -> str:
+    """Standard base32 geohash of a coordinate"""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        rng, value = (lng_range, lng) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            rng[0] = mid
+        else:
+            bits <<= 1
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_GEOHASH_ALPHABET[bits])
+            bits = 0
+            bit_count = 0
+    return "".join(chars)
+
+
+def _normalize_words(text: str, drop: set) -> list:
+    words = []
+    for word in _WORD_RE.findall(text.lower()):
+        if word in drop:
+            continue
+        # Treat "restaurants" and "restaurant" as the same request
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        words.append(word)
+    return words
+
+
+def split_query(query: str) -> tuple:
+    """
+    Split a places query into normalized (topic_key, location_key).
+
+    "Dog-friendly restaurants in Gangnam-gu" -> ("dog friendly restaurant", "gangnam")
+    """
+    lowered = query.lower()
+    match = _LOCATION_SPLIT_RE.search(lowered)
+    topic, location = (lowered[:match.start()], lowered[match.end():]) if match else (lowered, "")
+    topic_key = " ".join(sorted(set(_normalize_words(topic, _STOPWORDS))))
+    location_key = " ".join(_normalize_words(location, _STOPWORDS | _LOCATION_SUFFIXES))
+    return topic_key, location_key
+
+
+class PlacesCache:
+    """
+    Local cache for Google Places text searches.
+
+    Entries are keyed on the normalized query and carry the geohash of the
+    centroid of their results. Each location phrase seen in a query is also
+    remembered with its geohash, so a later query for the same kind of place
+    under another location name ("cafes in Yeoksam" after "restaurants in
+    Yeoksam" and "cafes in Gangnam") is answered without an API call when
+    both locations fall in the same geohash cell.
+
+    Geo reuse only works for exact cell matches: a location just across a
+    cell boundary is a miss, and so is a location phrase never seen before.
+    """
+
+    def __init__(self, db_path: str = CACHE_PATH, ttl_seconds: int = CACHE_TTL_SECONDS,
+                 precision: int = GEOHASH_PRECISION):
+        self.ttl_seconds = ttl_seconds
+        self.precision = precision
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS places (
+                query_key TEXT PRIMARY KEY,
+                topic_key TEXT NOT NULL,
+                geohash TEXT,
+                result TEXT NOT NULL,
+                created_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS places_topic_geohash ON places(topic_key, geohash);
+            CREATE TABLE IF NOT EXISTS locations (
+                location_key TEXT PRIMARY KEY,
+                geohash TEXT NOT NULL
+            );
+            """
+        )
+
+    def lookup(self, query: str):
+        """Return a cached result for the query, or None on a miss or a stale entry"""
+        topic_key, location_key = split_query(query)
+        fresh_after = time.time() - self.ttl_seconds
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result FROM places WHERE query_key = ? AND created_at >= ?",
+                (f"{topic_key}|{location_key}", fresh_after),
+            ).fetchone()
+            if row:
+                return row[0]
+            if not location_key:
+                return None
+            location = self._conn.execute(
+                "SELECT geohash FROM locations WHERE location_key = ?", (location_key,)
+            ).fetchone()
+            if not location:
+                return None
+            cell = location[0][:self.precision]
+            # Geohash prefix search as a range scan over the (topic_key, geohash) index
+            row = self._conn.execute(
+                """SELECT result FROM places
+                   WHERE topic_key = ? AND geohash >= ? AND geohash < ? AND created_at >= ?
+                   ORDER BY created_at DESC LIMIT 1""",
+                (topic_key, cell, cell + "~", fresh_after),
+            ).fetchone()
+        return row[0] if row else None
+
+    def store(self, query: str, result: str, coordinates: list):
+        """Cache a result together with the coordinates of the places it returned"""
+        topic_key, location_key = split_query(query)
+        geohash = None
+        if coordinates:
+            lat = sum(c[0] for c in coordinates) / len(coordinates)
+            lng = sum(c[1] for c in coordinates) / len(coordinates)
+            geohash = geohash_encode(lat, lng)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO places (query_key, topic_key, geohash, result, created_at) VALUES (?, ?, ?, ?, ?)",
+                (f"{topic_key}|{location_key}", topic_key, geohash, result, now),
+            )
+            if geohash and location_key:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO locations (location_key, geohash) VALUES (?, ?)",
+                    (location_key, geohash),
+                )
+            self._conn.execute("DELETE FROM places WHERE created_at < ?", (now - self.ttl_seconds,))
+            self._conn.commit()
+
+
+class CachedPlacesSearch:
+    """Runs Google Places searches through a PlacesCache, calling the API only on misses"""
+
+    def __init__(self, cache: PlacesCache = None, api_wrapper=None):
+        self.cache = cache or PlacesCache()
+        self._api_wrapper = api_wrapper
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def api_wrapper(self):
+        if self._api_wrapper is None:
+            from langchain_google_community.places_api import GooglePlacesAPIWrapper
+            self._api_wrapper = GooglePlacesAPIWrapper()
+        return self._api_wrapper
+
+    def _fetch(self, query: str) -> tuple:
+        """Same output as GooglePlacesAPIWrapper.run, plus the coordinates of the results"""
+        wrapper = self.api_wrapper
+        search_results = wrapper.google_map_client.places(query)["results"]
+        if not search_results:
+            return "Google Places did not find any places that match the description", []
+        if wrapper.top_k_results is not None:
+            search_results = search_results[:wrapper.top_k_results]
+        places = []
+        coordinates = []
+        for result in search_results:
+            location = result.get("geometry", {}).get("location")
+            if location:
+                coordinates.append((location["lat"], location["lng"]))
+            details = wrapper.fetch_place_details(result["place_id"])
+            if details is not None:
+                places.append(details)
+        return "\n".join([f"{i + 1}. {item}" for i, item in enumerate(places)]), coordinates
+
+    def run(self, query: str) -> str:
+        cached = self.cache.lookup(query)
+        if cached is not None:
+            self.hits += 1
+            logger.info(f"Places cache hit for '{query}'")
+            return cached
+        self.misses += 1
+        result, coordinates = self._fetch(query)
+        if coordinates:
+            self.cache.store(query, result, coordinates)
+        return result
+
+
+def get_cached_places_tool():
+    places_search = CachedPlacesSearch()
+    return Tool(
+        name="google_places",
+        func=places_search.run,
+        description="A wrapper around Google Places. "
+                    "Useful for when you need to validate or discover addresses from ambiguous text. "
+                    "Input should be a search query. Repeat and nearby queries are answered from a local cache."
+    )
@@ -0,0 +1,267 @@
+import os
+import time
+import random
+import sqlite3
+import asyncio
+import logging
+import threading
+import contextvars
+from collections import OrderedDict
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+PUSHOVER_URL = "https://api.pushover.net/1/messages.json"
+QUEUE_PATH = os.getenv("PUSHOVER_QUEUE_PATH", "pushover_queue.db")
+
+# Pushover rejects messages longer than 1024 characters
+MAX_MESSAGE_CHARS = 1024
+
+# Set by the Sidekick before running a turn so bursts from one session are merged together
+current_session = contextvars.ContextVar("notification_session", default="default")
+
+
+def _merge_messages(rows: list) -> list:
+    """
+    Join a burst of (id, message) rows into as few Pushover-sized messages as possible.
+
+    Returns (ids, text) pairs so each row can be settled by the outcome of the text it went into.
+    """
+    merged = []
+    ids, current = [], ""
+    for row_id, message in rows:
+        message = message[:MAX_MESSAGE_CHARS]
+        candidate = f"{current}\n\n{message}" if current else message
+        if len(candidate) > MAX_MESSAGE_CHARS:
+            merged.append((ids, current))
+            ids, current = [row_id], message
+        else:
+            ids, current = ids + [row_id], candidate
+    if current:
+        merged.append((ids, current))
+    return merged
+
+
+class PushoverNotifier:
+    """
+    Sends Pushover notifications from a background thread.
+
+    enqueue() writes the message to a small SQLite queue and returns straight away.
+    A worker thread with its own event loop and a persistent aiohttp session waits
+    coalesce_seconds for more messages from the same session, merges them into one
+    notification, and sends it. 429 responses and the X-Limit-App-* headers pause
+    sending until the quota resets; network errors and 5xx responses are retried
+    with exponential backoff, up to max_attempts times; a message that still fails
+    is marked failed in the queue so it cannot hold up the ones behind it.
+    Anything not yet delivered is still in the queue
+    after a restart and gets sent once the notifier starts again.
+    """
+
+    def __init__(self, token: str, user: str, url: str = PUSHOVER_URL, db_path: str = QUEUE_PATH,
+                 coalesce_seconds: float = 2.0, min_interval: float = 1.0, max_backoff: float = 300.0,
+                 max_attempts: int = 8):
+        self.token = token
+        self.user = user
+        self.url = url
+        self.coalesce_seconds = coalesce_seconds
+        self.min_interval = min_interval
+        self.max_backoff = max_backoff
+        self.max_attempts = max_attempts
+        self._db_lock = threading.Lock()
+        # Tool calls enqueue from several threads; only one of them may start the worker
+        self._start_lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS pending (
+                id INTEGER PRIMARY KEY,
+                session TEXT NOT NULL,
+                message TEXT NOT NULL,
+                created REAL NOT NULL,
+                failed INTEGER NOT NULL DEFAULT 0
+            )"""
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(pending)")}
+        if "failed" not in columns:
+            self._conn.execute("ALTER TABLE pending ADD COLUMN failed INTEGER NOT NULL DEFAULT 0")
+        self._conn.commit()
+        self._loop = None
+        self._thread = None
+        self._wakeup = None
+        self._stopping = False
+        self._paused_until = 0.0
+        self._last_sent = 0.0
+
+    def start(self):
+        with self._start_lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stopping = False
+            ready = threading.Event()
+            self._thread = threading.Thread(target=self._run, args=(ready,), name="pushover-notifier", daemon=True)
+            self._thread.start()
+            ready.wait()
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the worker after it has tried to flush what is queued"""
+        with self._start_lock:
+            if not self._thread:
+                return
+            self._stopping = True
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+            self._thread.join(timeout)
+            self._thread = None
+
+    def enqueue(self, text: str, session: str = None) -> int:
+        """Queue a notification and return the number of messages waiting to be sent"""
+        session = session or current_session.get()
+        with self._db_lock:
+            self._conn.execute(
+                "INSERT INTO pending (session, message, created) VALUES (?, ?, ?)",
+                (session, text, time.time()),
+            )
+            self._conn.commit()
+        self.start()
+        self._loop.call_soon_threadsafe(self._wakeup.set)
+        return self.pending_count()
+
+    def pending_count(self) -> int:
+        with self._db_lock:
+            return self._conn.execute("SELECT COUNT(*) FROM pending WHERE failed = 0").fetchone()[0]
+
+    def failed_count(self) -> int:
+        with self._db_lock:
+            return self._conn.execute("SELECT COUNT(*) FROM pending WHERE failed = 1").fetchone()[0]
+
+    def _run(self, ready: threading.Event):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._wakeup = asyncio.Event()
+        # Deliver whatever survived the last shutdown
+        self._wakeup.set()
+        ready.set()
+        try:
+            self._loop.run_until_complete(self._worker())
+        finally:
+            self._loop.close()
+
+    def _take_batches(self) -> OrderedDict:
+        with self._db_lock:
+            rows = self._conn.execute("SELECT id, session, message FROM pending WHERE failed = 0 ORDER BY id").fetchall()
+        batches = OrderedDict()
+        for row_id, session, message in rows:
+            batches.setdefault(session, []).append((row_id, message))
+        return batches
+
+    def _delete(self, ids: list):
+        with self._db_lock:
+            self._conn.executemany("DELETE FROM pending WHERE id = ?", [(i,) for i in ids])
+            self._conn.commit()
+
+    def _mark_failed(self, ids: list):
+        with self._db_lock:
+            self._conn.executemany("UPDATE pending SET failed = 1 WHERE id = ?", [(i,) for i in ids])
+            self._conn.commit()
+
+    async def _worker(self):
+        connector = aiohttp.TCPConnector(limit=2, keepalive_timeout=60)
+        async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=30)) as session:
+            while True:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                if not self._stopping:
+                    # Give the rest of a burst a chance to arrive before sending
+                    await asyncio.sleep(self.coalesce_seconds)
+                for rows in self._take_batches().values():
+                    for ids, text in _merge_messages(rows):
+                        delivered = await self._deliver(session, text)
+                        if delivered is None:
+                            break
+                        if delivered:
+                            self._delete(ids)
+                        else:
+                            self._mark_failed(ids)
+                    else:
+                        continue
+                    # Stopping; keep the rest queued for the next start
+                    break
+                if self._stopping:
+                    return
+
+    async def _deliver(self, session: aiohttp.ClientSession, text: str):
+        """
+        Send one message, retrying until it is accepted, permanently rejected, or we are stopping.
+
+        Returns True once the message is settled (sent or rejected), False after
+        max_attempts server or network errors, and None if we stopped first.
+        """
+        attempt = 0
+        failures = 0
+        while True:
+            wait = max(self._paused_until - time.time(), self._last_sent + self.min_interval - time.time())
+            if wait > 0:
+                if self._stopping:
+                    return None
+                await asyncio.sleep(wait)
+            try:
+                self._last_sent = time.time()
+                async with session.post(self.url, data={"token": self.token, "user": self.user, "message": text}) as response:
+                    self._update_limits(response)
+                    if response.status == 200:
+                        return True
+                    if response.status == 429:
+                        logger.warning("Pushover rate limit reached, pausing notifications")
+                        self._paused_until = max(self._paused_until, time.time() + self._backoff(attempt))
+                    elif 400 <= response.status < 500:
+                        body = await response.text()
+                        logger.error(f"Pushover rejected notification ({response.status}): {body}")
+                        return True
+                    else:
+                        failures += 1
+                        logger.warning(f"Pushover returned {response.status} (attempt {failures}/{self.max_attempts})")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                failures += 1
+                logger.warning(f"Error sending push notification (attempt {failures}/{self.max_attempts}): {e}")
+            if failures >= self.max_attempts:
+                logger.error(f"Giving up on push notification after {failures} attempts")
+                return False
+            if self._stopping:
+                return None
+            await asyncio.sleep(self._backoff(attempt))
+            attempt += 1
+
+    def _backoff(self, attempt: int) -> float:
+        return min(self.max_backoff, 2 ** attempt) * (0.5 + random.random() / 2)
+
+    def _update_limits(self, response: aiohttp.ClientResponse):
+        remaining = response.headers.get("X-Limit-App-Remaining")
+        reset = response.headers.get("X-Limit-App-Reset")
+        if remaining is None or reset is None:
+            return
+        try:
+            exhausted = int(remaining) <= 0
+            reset_at = float(reset)
+        except ValueError:
+            logger.warning(f"Ignoring malformed Pushover limit headers: remaining={remaining!r}, reset={reset!r}")
+            return
+        if exhausted:
+            self._paused_until = max(self._paused_until, reset_at)
+
+
+_notifier = None
+_notifier_lock = threading.Lock()
+
+
+def get_notifier(token: str, user: str, url: str = PUSHOVER_URL, db_path: str = QUEUE_PATH) -> PushoverNotifier:
+    """
+    Return the process-wide notifier, creating it on first use.
+
+    A new notifier starts sending straight away if the queue still holds
+    messages from before a restart, rather than waiting for the next push.
+    """
+    global _notifier
+    with _notifier_lock:
+        if _notifier is None:
+            _notifier = PushoverNotifier(token, user, url=url, db_path=db_path)
+            if _notifier.pending_count():
+                _notifier.start()
+        return _notifier
@@ -0,0 +1,274 @@
+import os
+import re
+import sqlite3
+import hashlib
+import threading
+from langchain.agents import Tool
+
+SANDBOX_DIR = "sandbox"
+INDEX_PATH = os.getenv("SANDBOX_INDEX_PATH", "sandbox_index.db")
+
+# Files are indexed in paragraph-sized pieces so a hit points at a small byte range
+CHUNK_TARGET_BYTES = 800
+SNIPPET_CHARS = 160
+TEXT_EXTENSIONS = {".md", ".txt", ".csv", ".json", ".html", ".py", ".log"}
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_PARAGRAPH_RE = re.compile(rb"\n[ \t]*\n")
+_HANGUL_RE = re.compile(r"[가-힣]")
+# Particles a query word may end in, longest first so "에서" is tried before "에"
+_PARTICLES = (
+    "에서는", "에게서", "으로는", "에서", "에게", "한테", "께서", "으로", "부터", "까지", "처럼", "보다",
+    "이나", "하고", "은", "는", "이", "가", "을", "를", "의", "에", "도", "로", "와", "과", "만", "랑",
+)
+
+
+def _has_hangul(word: str) -> bool:
+    return _HANGUL_RE.search(word) is not None
+
+
+def _hangul_bigrams(word: str) -> list:
+    """Overlapping character bigrams, so "반려견" also matches "반려견은" or "강아지 반려견" """
+    if len(word) < 2:
+        return [word]
+    return [word[i:i + 2] for i in range(len(word) - 1)]
+
+
+def strip_particle(word: str) -> str:
+    """Drop a trailing particle from a Hangul word ("강남에서" -> "강남"), keeping at least two characters"""
+    for particle in _PARTICLES:
+        if word.endswith(particle) and len(word) - len(particle) >= 2:
+            return word[:-len(particle)]
+    return word
+
+
+def index_terms(text: str) -> str:
+    """
+    Turn text into the whitespace separated terms stored in the FTS table.
+
+    Korean attaches particles to words (강남의, 강남에서), so Hangul words are
+    indexed as character bigrams in addition to the word itself.
+    """
+    terms = []
+    for word in _WORD_RE.findall(text.lower()):
+        terms.append(word)
+        if _has_hangul(word):
+            terms.extend(_hangul_bigrams(word))
+    return " ".join(terms)
+
+
+def build_match_query(query: str) -> str:
+    """
+    Build an FTS5 MATCH expression where every query word has to be present.
+
+    Hangul query words lose their particle first, so "강남에서" matches
+    "강남의" and "강남은" through the bigrams of the stem.
+    """
+    clauses = []
+    for word in _WORD_RE.findall(query.lower()):
+        if _has_hangul(word):
+            word = strip_particle(word)
+            if len(word) == 1:
+                clauses.append(f'"{word}"*')
+            else:
+                clauses.append(" AND ".join(f'"{gram}"' for gram in _hangul_bigrams(word)))
+        else:
+            clauses.append(f'"{word}"*')
+    return " AND ".join(clauses)
+
+
+def _split_chunks(data: bytes):
+    """Yield (start_byte, end_byte) ranges made of whole paragraphs, about CHUNK_TARGET_BYTES each"""
+    boundaries = [m.end() for m in _PARAGRAPH_RE.finditer(data)] + [len(data)]
+    start = 0
+    end = 0
+    for boundary in boundaries:
+        if boundary - start > CHUNK_TARGET_BYTES and end > start:
+            yield start, end
+            start = end
+        end = boundary
+    if end > start:
+        yield start, end
+
+
+class SandboxIndex:
+    """SQLite FTS5 index over the sandbox directory, refreshed incrementally"""
+
+    def __init__(self, root_dir: str = SANDBOX_DIR, db_path: str = INDEX_PATH):
+        self.root_dir = root_dir
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                mtime REAL NOT NULL,
+                size INTEGER NOT NULL,
+                sha256 TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS chunks (
+                id INTEGER PRIMARY KEY,
+                path TEXT NOT NULL,
+                start_byte INTEGER NOT NULL,
+                end_byte INTEGER NOT NULL,
+                text TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS chunks_path ON chunks(path);
+            CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(terms, tokenize='unicode61');
+            """
+        )
+
+    def _walk(self):
+        for dirpath, _, filenames in os.walk(self.root_dir):
+            for filename in filenames:
+                if os.path.splitext(filename)[1].lower() in TEXT_EXTENSIONS:
+                    full_path = os.path.join(dirpath, filename)
+                    yield os.path.relpath(full_path, self.root_dir), full_path
+
+    def _remove_file(self, path: str):
+        ids = [row[0] for row in self._conn.execute("SELECT id FROM chunks WHERE path = ?", (path,))]
+        self._conn.executemany("DELETE FROM chunks_fts WHERE rowid = ?", [(i,) for i in ids])
+        self._conn.execute("DELETE FROM chunks WHERE path = ?", (path,))
+        self._conn.execute("DELETE FROM files WHERE path = ?", (path,))
+
+    def _index_file(self, path: str, data: bytes, mtime: float, digest: str):
+        self._remove_file(path)
+        for start, end in _split_chunks(data):
+            text = data[start:end].decode("utf-8", errors="replace")
+            cursor = self._conn.execute(
+                "INSERT INTO chunks (path, start_byte, end_byte, text) VALUES (?, ?, ?, ?)",
+                (path, start, end, text),
+            )
+            self._conn.execute(
+                "INSERT INTO chunks_fts (rowid, terms) VALUES (?, ?)",
+                (cursor.lastrowid, index_terms(text)),
+            )
+        self._conn.execute(
+            "INSERT INTO files (path, mtime, size, sha256) VALUES (?, ?, ?, ?)",
+            (path, mtime, len(data), digest),
+        )
+
+    def refresh(self) -> int:
+        """
+        Bring the index up to date with the sandbox.
+
+        Files whose mtime and size are unchanged are skipped without being read;
+        files that were touched but have the same content hash only get their
+        mtime updated. Returns the number of files (re)indexed or removed.
+        """
+        with self._lock:
+            known = {
+                row[0]: (row[1], row[2], row[3])
+                for row in self._conn.execute("SELECT path, mtime, size, sha256 FROM files")
+            }
+            changed = 0
+            seen = set()
+            for path, full_path in self._walk():
+                seen.add(path)
+                try:
+                    stat = os.stat(full_path)
+                except OSError:
+                    continue
+                previous = known.get(path)
+                if previous and previous[0] == stat.st_mtime and previous[1] == stat.st_size:
+                    continue
+                try:
+                    with open(full_path, "rb") as f:
+                        data = f.read()
+                except OSError:
+                    # Deleted or renamed since the walk; the next refresh drops it
+                    continue
+                digest = hashlib.sha256(data).hexdigest()
+                if previous and previous[2] == digest:
+                    self._conn.execute(
+                        "UPDATE files SET mtime = ?, size = ? WHERE path = ?",
+                        (stat.st_mtime, stat.st_size, path),
+                    )
+                    continue
+                self._index_file(path, data, stat.st_mtime, digest)
+                changed += 1
+            for path in set(known) - seen:
+                self._remove_file(path)
+                changed += 1
+            self._conn.commit()
+            return changed
+
+    def search(self, query: str, limit: int = 5) -> list:
+        """Return the best matching chunks as dicts with path, byte offsets, score and snippet"""
+        match = build_match_query(query)
+        if not match:
+            return []
+        self.refresh()
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT chunks.path, chunks.start_byte, chunks.end_byte, chunks.text, bm25(chunks_fts) AS score
+                FROM chunks_fts JOIN chunks ON chunks.id = chunks_fts.rowid
+                WHERE chunks_fts MATCH ?
+                ORDER BY score
+                LIMIT ?
+                """,
+                (match, limit),
+            ).fetchall()
+        words = [strip_particle(w) if _has_hangul(w) else w for w in _WORD_RE.findall(query.lower())]
+        return [
+            {
+                "path": path,
+                "start_byte": start,
+                "end_byte": end,
+                "score": round(-score, 3),
+                "snippet": _snippet(text, words),
+            }
+            for path, start, end, text, score in rows
+        ]
+
+    def close(self):
+        self._conn.close()
+
+
+def _snippet(text: str, words: list) -> str:
+    """Cut a window of SNIPPET_CHARS around the first query word found in the chunk"""
+    lowered = text.lower()
+    positions = [lowered.find(word) for word in words if lowered.find(word) >= 0]
+    center = min(positions) if positions else 0
+    start = max(0, center - SNIPPET_CHARS // 3)
+    end = min(len(text), start + SNIPPET_CHARS)
+    snippet = " ".join(text[start:end].split())
+    return ("…" if start > 0 else "") + snippet + ("…" if end < len(text) else "")
+
+
+_index = None
+
+
+def get_sandbox_index() -> SandboxIndex:
+    global _index
+    if _index is None:
+        _index = SandboxIndex()
+    return _index
+
+
+def search_sandbox(query: str) -> str:
+    """Search the files in the sandbox and return ranked snippets with byte offsets"""
+    try:
+        results = get_sandbox_index().search(query)
+    except sqlite3.Error as e:
+        return f"Error searching sandbox: {str(e)}"
+    if not results:
+        return f"No matches in sandbox for: {query}"
+    lines = []
+    for i, hit in enumerate(results, 1):
+        lines.append(
+            f"{i}. {hit['path']} [bytes {hit['start_byte']}-{hit['end_byte']}] (score {hit['score']}): {hit['snippet']}"
+        )
+    return "\n".join(lines)
+
+
+def get_sandbox_search_tool():
+    return Tool(
+        name="search_sandbox",
+        func=search_sandbox,
+        description="Full-text search over files previously saved in the sandbox directory (supports Korean). "
+                    "Input is a search query. Returns ranked snippets with the file name and byte offsets; "
+                    "use this before reading whole files with read_file."
+    )
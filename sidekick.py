@@ -13,6 +13,7 @@ from typing import List, Any, Optional, Dict
 from pydantic import BaseModel, Field
 from enum import Enum
 from sidekick_tools import playwright_tools, other_tools
+from push_notifier import current_session
 import uuid
 import asyncio
 from datetime import datetime
@@ -157,6 +158,7 @@ class Sidekick:
         system_message = f"""You are a helpful assistant that can use tools to complete tasks.
     You keep working on a task until either you have a question or clarification for the user, or the success criteria is met.
     You have many tools to help you, including tools to browse the internet, navigating and retrieving web pages.
+    To find reports or notes saved earlier in the sandbox, use the search_sandbox tool first and only read_file the files it points to.
     Use the Google Places API tool to find places of interest in the user's given location.
     You have a tool to run python code, but note that you would need to include a print() statement if you wanted to receive output.
     You also have a new specialist agent that can transform Korean articles into a simpler, more understandable format for A2 level learners.
@@ -478,6 +480,8 @@ Format your response according to the TutorSpecialistOutput structure with artic
 
     async def run_superstep(self, message, success_criteria, history):
         config = {"configurable": {"thread_id": self.sidekick_id}}
+        # Push notifications sent during this turn are merged per session
+        current_session.set(self.sidekick_id)
 
         state = {
             "messages": message,
@@ -2,15 +2,16 @@ from playwright.async_api import async_playwright
 from langchain_community.agent_toolkits import PlayWrightBrowserToolkit
 from dotenv import load_dotenv
 import os
-import requests
+from push_notifier import get_notifier
 from langchain.agents import Tool
 from langchain_community.agent_toolkits import FileManagementToolkit
 from langchain_community.tools.wikipedia.tool import WikipediaQueryRun
 from langchain_experimental.tools import PythonREPLTool
 from langchain_community.utilities import GoogleSerperAPIWrapper
 from langchain_community.utilities.wikipedia import WikipediaAPIWrapper
-from langchain_google_community.places_api import GooglePlacesTool
+from places_cache import get_cached_places_tool
 from pymongo import MongoClient
+from sandbox_search import get_sandbox_search_tool
 import json
 #from langchain_openai import OpenAI
 #from langchain_core.agents import initializeAgentExecutorWithOptions
@@ -71,8 +72,8 @@ async def playwright_tools():
 
 
 def push(text: str):
-    """Send a push notification to the user"""
-    requests.post(pushover_url, data = {"token": pushover_token, "user": pushover_user, "message": text})
+    """Queue a push notification to the user; it is delivered in the background"""
+    get_notifier(pushover_token, pushover_user, pushover_url).enqueue(text)
     return "success"
 
 
@@ -82,8 +83,11 @@ def get_file_tools():
 
 
 async def other_tools():
+    # Deliver notifications still queued from a previous run without waiting for a new push
+    get_notifier(pushover_token, pushover_user, pushover_url)
     push_tool = Tool(name="send_push_notification", func=push, description="Use this tool when you want to send a push notification")
     file_tools = get_file_tools()
+    sandbox_search_tool = get_sandbox_search_tool()
 
     tool_search =Tool(
         name="search",
@@ -95,7 +99,7 @@ async def other_tools():
     wiki_tool = WikipediaQueryRun(api_wrapper=wikipedia)
 
     python_repl = PythonREPLTool()
-    google_places = GooglePlacesTool()
+    google_places = get_cached_places_tool()
 
     # MongoDB tools using pymongo
     def store_user_data(data_json: str) -> str:
@@ -152,6 +156,7 @@ async def other_tools():
     )
 
     return file_tools + [
+        sandbox_search_tool,
         push_tool, 
         tool_search, 
         python_repl, 
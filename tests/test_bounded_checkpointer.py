@@ -0,0 +1,133 @@
+import time
+import asyncio
+from unittest.mock import patch
+from typing_extensions import TypedDict
+from langgraph.graph import StateGraph, START, END
+from bounded_checkpointer import BoundedMemorySaver
+
+
+class State(TypedDict):
+    text: str
+
+
+def build_graph(saver):
+    graph = StateGraph(State)
+    graph.add_node("echo", lambda state: {"text": state["text"] + "!"})
+    graph.add_edge(START, "echo")
+    graph.add_edge("echo", END)
+    return graph.compile(checkpointer=saver)
+
+
+def config(thread_id):
+    return {"configurable": {"thread_id": thread_id}}
+
+
+class TestBoundedMemorySaver:
+    """Test cases for the memory-capped checkpointer."""
+
+    def setup_method(self):
+        self.saver = None
+
+    def teardown_method(self):
+        if self.saver is not None:
+            self.saver._conn.close()
+
+    def _saver(self, tmp_path, **kwargs):
+        self.saver = BoundedMemorySaver(spill_path=str(tmp_path / "spill.db"), **kwargs)
+        return self.saver
+
+    def test_least_recently_used_threads_spill_first(self, tmp_path):
+        """Test that going over the cap spills the coldest threads, keeping recent ones in memory."""
+        saver = self._saver(tmp_path)
+        graph = build_graph(saver)
+        graph.invoke({"text": "a" * 2000}, config("a"))
+        # Room for two threads but not three
+        saver.max_bytes = saver.memory_usage()["a"] * 2.5
+
+        graph.invoke({"text": "b" * 2000}, config("b"))
+        graph.get_state(config("a"))  # a is now more recent than b
+        graph.invoke({"text": "c" * 2000}, config("c"))
+
+        assert list(saver.memory_usage()) == ["a", "c"]
+        assert set(saver.spilled_threads()) == {"b"}
+
+    def test_spilled_thread_is_loaded_back(self, tmp_path):
+        """Test that a spilled thread's state is intact after it is read again."""
+        saver = self._saver(tmp_path, max_bytes=3000)
+        graph = build_graph(saver)
+        graph.invoke({"text": "a" * 2000}, config("a"))
+        graph.invoke({"text": "b" * 2000}, config("b"))
+        assert "a" in saver.spilled_threads()
+
+        state = graph.get_state(config("a"))
+
+        assert state.values["text"] == "a" * 2000 + "!"
+        assert "a" in saver.memory_usage()
+        assert "a" not in saver.spilled_threads()
+
+    def test_async_calls_load_spilled_threads(self, tmp_path):
+        """Test that the async API used by ainvoke tracks, spills and loads back threads like the sync one."""
+        saver = self._saver(tmp_path, max_bytes=3000)
+        graph = build_graph(saver)
+
+        async def main():
+            await graph.ainvoke({"text": "a" * 2000}, config("a"))
+            await graph.ainvoke({"text": "b" * 2000}, config("b"))
+            spilled = set(saver.spilled_threads())
+            state = await graph.aget_state(config("a"))
+            history = [item async for item in saver.alist(config("b"))]
+            return spilled, state, history
+
+        spilled, state, history = asyncio.run(main())
+
+        assert spilled == {"a"}
+        assert state.values["text"] == "a" * 2000 + "!"
+        assert "a" in saver.memory_usage()
+        assert history and all(item.config["configurable"]["thread_id"] == "b" for item in history)
+
+    def test_unknown_threads_are_not_registered(self, tmp_path):
+        """Test that reading a thread never saved neither queries SQLite nor tracks it."""
+        saver = self._saver(tmp_path)
+
+        with patch.object(saver, "_conn") as conn:
+            assert saver.get_tuple(config("missing")) is None
+            conn.execute.assert_not_called()
+        assert saver.memory_usage() == {}
+
+    def test_expired_spills_are_pruned(self, tmp_path):
+        """Test that spilled threads older than the TTL are dropped on the next spill."""
+        saver = self._saver(tmp_path, max_bytes=3000, spill_ttl_seconds=60)
+        graph = build_graph(saver)
+        graph.invoke({"text": "a" * 2000}, config("a"))
+        graph.invoke({"text": "b" * 2000}, config("b"))
+        assert set(saver.spilled_threads()) == {"a"}
+
+        with patch("bounded_checkpointer.time.time", return_value=time.time() + 61):
+            graph.invoke({"text": "c" * 2000}, config("c"))
+
+        assert set(saver.spilled_threads()) == {"b"}
+        assert graph.get_state(config("a")).values == {}
+
+    def test_spill_file_is_capped(self, tmp_path):
+        """Test that the oldest spilled threads are dropped once the file is over its cap."""
+        saver = self._saver(tmp_path, max_bytes=3000)
+        graph = build_graph(saver)
+        graph.invoke({"text": "a" * 2000}, config("a"))
+        graph.invoke({"text": "b" * 2000}, config("b"))
+        saver.max_spill_bytes = sum(len(row[0]) for row in saver._conn.execute("SELECT data FROM threads")) + 10
+
+        graph.invoke({"text": "c" * 2000}, config("c"))
+
+        assert set(saver.spilled_threads()) == {"b"}
+
+    def test_delete_thread_removes_spilled_copy(self, tmp_path):
+        """Test that deleting a spilled thread removes it from disk."""
+        saver = self._saver(tmp_path, max_bytes=3000)
+        graph = build_graph(saver)
+        graph.invoke({"text": "a" * 2000}, config("a"))
+        graph.invoke({"text": "b" * 2000}, config("b"))
+
+        saver.delete_thread("a")
+
+        assert saver.spilled_threads() == {}
+        assert graph.get_state(config("a")).values == {}
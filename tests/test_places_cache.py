@@ -0,0 +1,73 @@
+import time
+from unittest.mock import Mock, patch
+from places_cache import CachedPlacesSearch, PlacesCache, geohash_encode, split_query
+
+GANGNAM = (37.4979, 127.0276)
+
+
+class TestPlacesCache:
+    """Test cases for the Google Places cache."""
+
+    def setup_method(self):
+        self.cache = None
+
+    def teardown_method(self):
+        if self.cache is not None:
+            self.cache._conn.close()
+
+    def _cache(self, tmp_path, **kwargs):
+        self.cache = PlacesCache(db_path=str(tmp_path / "places.db"), **kwargs)
+        return self.cache
+
+    def test_split_query(self):
+        """Test query normalization into topic and location keys."""
+        assert split_query("Dog-friendly restaurants in Gangnam-gu") == ("dog friendly restaurant", "gangnam")
+        assert split_query("the best restaurant near Gangnam station") == ("restaurant", "gangnam")
+
+    def test_repeat_query_is_a_hit(self, tmp_path):
+        """Test that a repeated query is answered without calling the API."""
+        api = Mock(top_k_results=None)
+        api.google_map_client.places.return_value = {
+            "results": [{"place_id": "p1", "geometry": {"location": {"lat": GANGNAM[0], "lng": GANGNAM[1]}}}]
+        }
+        api.fetch_place_details.return_value = "Cafe One"
+        search = CachedPlacesSearch(cache=self._cache(tmp_path), api_wrapper=api)
+
+        first = search.run("cafes in Gangnam")
+        second = search.run("Cafe near Gangnam station")
+
+        assert first == second == "1. Cafe One"
+        assert api.google_map_client.places.call_count == 1
+        assert (search.hits, search.misses) == (1, 1)
+
+    def test_entries_expire(self, tmp_path):
+        """Test that entries older than the TTL are misses."""
+        cache = self._cache(tmp_path, ttl_seconds=60)
+        cache.store("cafes in Gangnam", "cached", [GANGNAM])
+        now = time.time()
+
+        with patch("places_cache.time.time", return_value=now + 30):
+            assert cache.lookup("cafes in Gangnam") == "cached"
+        with patch("places_cache.time.time", return_value=now + 61):
+            assert cache.lookup("cafes in Gangnam") is None
+
+    def test_other_location_in_same_cell_is_a_hit(self, tmp_path):
+        """Test that a known location in the same geohash cell reuses results for the same topic."""
+        yeoksam = (GANGNAM[0] + 0.003, GANGNAM[1] + 0.006)
+        assert geohash_encode(*yeoksam, precision=5) == geohash_encode(*GANGNAM, precision=5)
+        cache = self._cache(tmp_path)
+        cache.store("restaurants in Yeoksam", "restaurants", [yeoksam])
+        cache.store("cafes in Gangnam", "gangnam cafes", [GANGNAM])
+
+        assert cache.lookup("cafes in Yeoksam") == "gangnam cafes"
+        assert cache.lookup("bakeries in Yeoksam") is None
+
+    def test_neighbouring_cell_is_a_miss(self, tmp_path):
+        """Test that geo reuse needs an exact cell match, even for a location a few km away."""
+        jamsil = (37.5133, 127.1001)
+        assert geohash_encode(*jamsil, precision=5) != geohash_encode(*GANGNAM, precision=5)
+        cache = self._cache(tmp_path)
+        cache.store("restaurants in Jamsil", "restaurants", [jamsil])
+        cache.store("cafes in Gangnam", "gangnam cafes", [GANGNAM])
+
+        assert cache.lookup("cafes in Jamsil") is None
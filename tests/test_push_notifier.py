@@ -0,0 +1,166 @@
+import time
+import threading
+from unittest.mock import patch
+from urllib.parse import parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import push_notifier
+from push_notifier import PushoverNotifier, get_notifier
+
+
+class FakePushover(BaseHTTPRequestHandler):
+    """Local stand-in for the Pushover API; answers with the queued responses, then 200"""
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.received.append(parse_qs(body.decode())["message"][0])
+        status, headers = self.server.responses.pop(0) if self.server.responses else (200, {})
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        pass
+
+
+class TestPushoverNotifier:
+    """Test cases for the background Pushover notifier."""
+
+    def setup_method(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FakePushover)
+        self.server.received = []
+        self.server.responses = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.notifier = None
+
+    def teardown_method(self):
+        if self.notifier is not None:
+            self.notifier.stop()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _notifier(self, tmp_path, **kwargs):
+        url = f"http://127.0.0.1:{self.server.server_address[1]}/1/messages.json"
+        kwargs = {"coalesce_seconds": 0.2, "min_interval": 0.0, "max_backoff": 0.05, **kwargs}
+        self.notifier = PushoverNotifier("token", "user", url=url, db_path=str(tmp_path / "queue.db"), **kwargs)
+        return self.notifier
+
+    def _wait_until_sent(self, timeout: float = 5.0):
+        deadline = time.time() + timeout
+        while self.notifier.pending_count() and time.time() < deadline:
+            time.sleep(0.02)
+        assert self.notifier.pending_count() == 0
+
+    def test_burst_is_coalesced_per_session(self, tmp_path):
+        """Test that messages queued together are sent as one notification per session."""
+        notifier = self._notifier(tmp_path)
+
+        notifier.enqueue("first", session="a")
+        notifier.enqueue("second", session="a")
+        notifier.enqueue("other", session="b")
+        self._wait_until_sent()
+
+        assert self.server.received == ["first\n\nsecond", "other"]
+
+    def test_server_errors_are_retried(self, tmp_path):
+        """Test that 5xx and 429 responses are retried until the message is accepted."""
+        self.server.responses = [(500, {}), (429, {})]
+        notifier = self._notifier(tmp_path)
+
+        notifier.enqueue("hello", session="a")
+        self._wait_until_sent()
+
+        assert self.server.received == ["hello", "hello", "hello"]
+
+    def test_failing_message_does_not_block_the_queue(self, tmp_path):
+        """Test that a message still failing after max_attempts is marked failed and later ones are sent."""
+        self.server.responses = [(500, {})] * 3
+        notifier = self._notifier(tmp_path, max_attempts=3)
+
+        notifier.enqueue("poisoned", session="a")
+        self._wait_until_sent()
+        notifier.enqueue("next", session="a")
+        self._wait_until_sent()
+
+        assert self.server.received == ["poisoned"] * 3 + ["next"]
+        assert notifier.failed_count() == 1
+
+    def test_rejected_message_is_dropped(self, tmp_path):
+        """Test that a 4xx other than 429 is not retried."""
+        self.server.responses = [(400, {})]
+        notifier = self._notifier(tmp_path)
+
+        notifier.enqueue("bad", session="a")
+        self._wait_until_sent()
+
+        assert self.server.received == ["bad"]
+
+    def test_exhausted_quota_pauses_until_reset(self, tmp_path):
+        """Test that X-Limit-App-Remaining: 0 holds the next message until X-Limit-App-Reset."""
+        reset = time.time() + 0.5
+        self.server.responses = [(200, {"X-Limit-App-Remaining": "0", "X-Limit-App-Reset": str(reset)})]
+        notifier = self._notifier(tmp_path, coalesce_seconds=0.0)
+
+        notifier.enqueue("first", session="a")
+        self._wait_until_sent()
+        notifier.enqueue("second", session="a")
+        self._wait_until_sent()
+
+        assert self.server.received == ["first", "second"]
+        assert time.time() >= reset
+
+    def test_malformed_limit_headers_are_ignored(self, tmp_path):
+        """Test that unparseable limit headers do not stop the sender."""
+        self.server.responses = [(200, {"X-Limit-App-Remaining": "n/a", "X-Limit-App-Reset": "soon"})]
+        notifier = self._notifier(tmp_path, coalesce_seconds=0.0)
+
+        notifier.enqueue("first", session="a")
+        self._wait_until_sent()
+        notifier.enqueue("second", session="a")
+        self._wait_until_sent()
+
+        assert self.server.received == ["first", "second"]
+
+    def test_concurrent_first_pushes_send_each_message_once(self, tmp_path):
+        """Test that enqueueing from several threads at once starts one worker and sends every message once."""
+        notifier = self._notifier(tmp_path)
+        barrier = threading.Barrier(8)
+
+        def push(i):
+            barrier.wait()
+            notifier.enqueue(f"message {i}", session=f"s{i}")
+
+        real_thread = threading.Thread
+
+        def slow_worker_thread(*args, **kwargs):
+            # Widen the gap between checking for a worker and starting one
+            if kwargs.get("name") == "pushover-notifier":
+                time.sleep(0.05)
+            return real_thread(*args, **kwargs)
+
+        threads = [threading.Thread(target=push, args=(i,)) for i in range(8)]
+        with patch("push_notifier.threading.Thread", side_effect=slow_worker_thread):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self._wait_until_sent()
+
+        assert sorted(self.server.received) == sorted(f"message {i}" for i in range(8))
+
+    def test_messages_left_from_last_run_are_sent_on_startup(self, tmp_path, monkeypatch):
+        """Test that a new notifier sends what an earlier process left queued, without a new push."""
+        url = f"http://127.0.0.1:{self.server.server_address[1]}/1/messages.json"
+        db_path = str(tmp_path / "queue.db")
+        crashed = PushoverNotifier("token", "user", url=url, db_path=db_path)
+        crashed._conn.execute("INSERT INTO pending (session, message, created) VALUES ('a', 'left over', 0)")
+        crashed._conn.commit()
+        crashed._conn.close()
+        monkeypatch.setattr(push_notifier, "_notifier", None)
+
+        self.notifier = get_notifier("token", "user", url=url, db_path=db_path)
+        self._wait_until_sent()
+
+        assert self.server.received == ["left over"]
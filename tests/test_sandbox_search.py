@@ -0,0 +1,82 @@
+import os
+import time
+from sandbox_search import SandboxIndex, build_match_query, strip_particle
+
+
+class TestSandboxSearch:
+    """Test cases for the sandbox full-text index."""
+
+    def setup_method(self):
+        self.index = None
+
+    def teardown_method(self):
+        if self.index is not None:
+            self.index.close()
+
+    def _index(self, tmp_path, files):
+        root = tmp_path / "sandbox"
+        root.mkdir()
+        for name, content in files.items():
+            (root / name).write_text(content, encoding="utf-8")
+        self.index = SandboxIndex(root_dir=str(root), db_path=str(tmp_path / "index.db"))
+        return root
+
+    def test_search_returns_byte_ranges(self, tmp_path):
+        """Test that hits point at the paragraph containing the query words."""
+        intro = "Intro paragraph.\n\n"
+        self._index(tmp_path, {"notes.md": intro + "Bitcoin forecast for 2026.\n"})
+
+        hits = self.index.search("bitcoin forecast")
+
+        assert len(hits) == 1
+        assert hits[0]["path"] == "notes.md"
+        assert hits[0]["start_byte"] == 0
+        assert "Bitcoin forecast" in hits[0]["snippet"]
+        assert self.index.search("ethereum") == []
+
+    def test_incremental_refresh(self, tmp_path):
+        """Test that only changed, new and deleted files are reindexed."""
+        root = self._index(tmp_path, {"a.md": "apples", "b.md": "bananas"})
+        assert self.index.refresh() == 2
+        assert self.index.refresh() == 0
+
+        # Touched with the same content: only the mtime is updated
+        later = time.time() + 10
+        os.utime(root / "a.md", (later, later))
+        assert self.index.refresh() == 0
+
+        (root / "b.md").write_text("cherries", encoding="utf-8")
+        (root / "c.md").write_text("dates", encoding="utf-8")
+        (root / "a.md").unlink()
+        assert self.index.refresh() == 3
+
+        assert self.index.search("apples") == []
+        assert self.index.search("bananas") == []
+        assert [hit["path"] for hit in self.index.search("cherries")] == ["b.md"]
+
+    def test_file_removed_during_refresh_is_skipped(self, tmp_path, monkeypatch):
+        """Test that a file deleted between the walk and the read does not abort the refresh."""
+        self._index(tmp_path, {"gone.md": "ghosts", "kept.md": "keepsakes"})
+        real_stat = os.stat
+
+        def stat_then_delete(path, *args, **kwargs):
+            result = real_stat(path, *args, **kwargs)
+            if str(path).endswith("gone.md"):
+                os.unlink(path)
+            return result
+
+        monkeypatch.setattr(os, "stat", stat_then_delete)
+        assert self.index.refresh() == 1
+        monkeypatch.undo()
+
+        assert self.index.search("ghosts") == []
+        assert [hit["path"] for hit in self.index.search("keepsakes")] == ["kept.md"]
+
+    def test_query_particles_are_stripped(self, tmp_path):
+        """Test that a query word with a different particle still matches."""
+        self._index(tmp_path, {"dogs.md": "강남의 반려견 동반 식당 목록"})
+
+        assert strip_particle("강남에서") == "강남"
+        assert strip_particle("개가") == "개가"
+        assert build_match_query("강남에서") == '"강남"'
+        assert [hit["path"] for hit in self.index.search("강남에서 반려견은")] == ["dogs.md"]